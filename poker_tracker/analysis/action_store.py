@@ -0,0 +1,274 @@
+from array import array
+
+import numpy as np
+
+from poker_tracker.poker_parser.pokerstars_parser import PokerStarsParser
+
+# Position names in the order of their code, the 10 players table has all of them
+POSITIONS = PokerStarsParser.position_name_list[-1]
+POSITION_CODES = {name: code for code, name in enumerate(POSITIONS)}
+# Street codes
+PREFLOP = 0
+FLOP = 1
+TURN = 2
+RIVER = 3
+STREETS = ["PREFLOP", "FLOP", "TURN", "RIVER"]
+
+
+def hand_datetime(date, hour):
+    """ Convert the date and the hour of a Hand to the ISO format used by numpy.
+
+        Args:
+            date (string): The year/month/day of the hand, such as "2019/07/04".
+            hour (string): The time of the hand, such as "9:05:03".
+
+        Returns:
+            A string such as "2019-07-04T09:05:03", "NaT" if the date is unknown.
+    """
+    if not date:
+        return "NaT"
+    return date.replace('/', '-') + 'T' + (hour or "0:00:00").zfill(8)
+
+
+class ActionStore:
+    """ A columnar store of the actions, hands and seats of parsed hands.
+
+        Each column is a NumPy array so that the statistics are computed with
+        vectorized operations on all the hands at once. The hands are numbered
+        in the store order, the positions, streets, action types and cards
+        are stored as integer codes (see POSITIONS, STREETS, ActionType and
+        Card.code), and the players as the index of their pseudo in players.
+        The actions of a hand are contiguous and in the order they happened.
+
+        The store is built from hand records (see Hand.to_record), so it can
+        be filled directly by poker_parser.bulk_import.import_records.
+
+        Attributes:
+            players (list): The pseudos of the players, indexed by player code.
+            player_codes (dict): The player code referenced by the pseudo.
+            hand_id (ndarray): int64 id of each hand.
+            game_id (ndarray): int64 tournament id of each hand, 0 for a cash game.
+            small_blind (ndarray): float64 small blind of each hand.
+            big_blind (ndarray): float64 big blind of each hand.
+            ante (ndarray): float64 ante of each hand.
+            date (ndarray): datetime64[s] date of each hand.
+            board (ndarray): int8 (hands, 5) card codes of the board, -1 if not dealt.
+            players_number (ndarray): int8 number of players of each hand.
+            action_hand (ndarray): int32 hand index of each action.
+            action_street (ndarray): int8 street code of each action.
+            action_position (ndarray): int8 position code of each action.
+            action_player (ndarray): int32 player code of each action.
+            action_type (ndarray): int8 ActionType value of each action.
+            action_amount (ndarray): float64 amount of each action.
+            seat_hand (ndarray): int32 hand index of each seat.
+            seat_position (ndarray): int8 position code of each seat.
+            seat_player (ndarray): int32 player code of each seat.
+            seat_stack (ndarray): float64 initial stack of each seat.
+            seat_cards (ndarray): int8 (seats, 2) card codes of the hole cards, -1 if unknown.
+            seat_collected (ndarray): float64 amount won in the pots by each seat.
+            seat_blind (ndarray): float64 blind posted by each seat.
+    """
+    hand_columns = ['hand_id', 'game_id', 'small_blind', 'big_blind', 'ante', 'date', 'board', 'players_number']
+    action_columns = ['action_hand', 'action_street', 'action_position', 'action_player', 'action_type',
+                      'action_amount']
+    seat_columns = ['seat_hand', 'seat_position', 'seat_player', 'seat_stack', 'seat_cards', 'seat_collected',
+                    'seat_blind']
+
+    def __init__(self):
+        self.players = []
+        self.player_codes = {}
+        self.hand_id = np.zeros(0, np.int64)
+        self.game_id = np.zeros(0, np.int64)
+        self.small_blind = np.zeros(0, np.float64)
+        self.big_blind = np.zeros(0, np.float64)
+        self.ante = np.zeros(0, np.float64)
+        self.date = np.zeros(0, 'datetime64[s]')
+        self.board = np.full((0, 5), -1, np.int8)
+        self.players_number = np.zeros(0, np.int8)
+        self.action_hand = np.zeros(0, np.int32)
+        self.action_street = np.zeros(0, np.int8)
+        self.action_position = np.zeros(0, np.int8)
+        self.action_player = np.zeros(0, np.int32)
+        self.action_type = np.zeros(0, np.int8)
+        self.action_amount = np.zeros(0, np.float64)
+        self.seat_hand = np.zeros(0, np.int32)
+        self.seat_position = np.zeros(0, np.int8)
+        self.seat_player = np.zeros(0, np.int32)
+        self.seat_stack = np.zeros(0, np.float64)
+        self.seat_cards = np.full((0, 2), -1, np.int8)
+        self.seat_collected = np.zeros(0, np.float64)
+        self.seat_blind = np.zeros(0, np.float64)
+
+    @classmethod
+    def from_records(cls, records):
+        """ Build a store from hand records.
+
+            Args:
+                records (iterable): Hand records, see Hand.to_record.
+
+            Returns:
+                An ActionStore
+        """
+        store = cls()
+        store.extend(records)
+        return store
+
+    @classmethod
+    def from_hands(cls, hands):
+        """ Build a store from Hand objects.
+        """
+        return cls.from_records(hand.to_record() for hand in hands)
+
+    def player_code(self, pseudo):
+        """ Return the code of a player, a new code is given to an unknown pseudo.
+        """
+        code = self.player_codes.get(pseudo)
+        if code is None:
+            code = self.player_codes[pseudo] = len(self.players)
+            self.players.append(pseudo)
+        return code
+
+    def extend(self, records):
+        """ Add hands at the end of the store.
+
+            The columns are filled in Python arrays and converted to NumPy
+            arrays once at the end.
+
+            Args:
+                records (iterable): Hand records, see Hand.to_record.
+        """
+        hand_index = len(self.hand_id)
+        hands = {name: array(code) for name, code in [('hand_id', 'q'), ('game_id', 'q'), ('small_blind', 'd'),
+                                                       ('big_blind', 'd'), ('ante', 'd'), ('board', 'b'),
+                                                       ('players_number', 'b')]}
+        dates = []
+        actions = {name: array(code) for name, code in [('action_hand', 'i'), ('action_street', 'b'),
+                                                         ('action_position', 'b'), ('action_player', 'i'),
+                                                         ('action_type', 'b'), ('action_amount', 'd')]}
+        seats = {name: array(code) for name, code in [('seat_hand', 'i'), ('seat_position', 'b'),
+                                                       ('seat_player', 'i'), ('seat_stack', 'd'),
+                                                       ('seat_cards', 'b'), ('seat_collected', 'd'),
+                                                       ('seat_blind', 'd')]}
+        positions = POSITION_CODES
+        for record in records:
+            (hand_id, game_id, _, date, hour, _, small_blind, big_blind, ante, seats_record,
+             board_flop, board_turn, board_river) = record[:13]
+            hands['hand_id'].append(hand_id)
+            hands['game_id'].append(game_id or 0)
+            hands['small_blind'].append(small_blind)
+            hands['big_blind'].append(big_blind)
+            hands['ante'].append(ante or 0)
+            hands['players_number'].append(len(seats_record))
+            board = list(board_flop or ()) + list(board_turn or ()) + list(board_river or ())
+            hands['board'].extend((board + [-1] * 5)[:5])
+            dates.append(hand_datetime(date, hour))
+
+            players = {}
+            collected = dict(record[17])
+            blinds = dict(record[18])
+            for position, player, stack, cards in seats_record:
+                code = players[position] = self.player_code(player)
+                seats['seat_hand'].append(hand_index)
+                seats['seat_position'].append(positions.get(position, -1))
+                seats['seat_player'].append(code)
+                seats['seat_stack'].append(stack)
+                seats['seat_cards'].extend((list(cards or ()) + [-1, -1])[:2])
+                seats['seat_collected'].append(collected.get(position, 0))
+                seats['seat_blind'].append(blinds.get(position, 0))
+
+            for street, street_actions in enumerate(record[13:17]):
+                for position, action_type, amount in street_actions:
+                    actions['action_hand'].append(hand_index)
+                    actions['action_street'].append(street)
+                    actions['action_position'].append(positions.get(position, -1))
+                    actions['action_player'].append(players.get(position, -1))
+                    actions['action_type'].append(action_type)
+                    actions['action_amount'].append(amount)
+            hand_index += 1
+
+        for columns in [hands, actions, seats]:
+            for name, values in columns.items():
+                column = getattr(self, name)
+                new = np.frombuffer(values, dtype=values.typecode).astype(column.dtype) if values else \
+                    np.zeros(0, column.dtype)
+                if column.ndim == 2:
+                    new = new.reshape(-1, column.shape[1])
+                setattr(self, name, np.concatenate([column, new]))
+        self.date = np.concatenate([self.date, np.array(dates, 'datetime64[s]')])
+
+    def select(self, mask):
+        """ Return a store with only some of the hands.
+
+            The hands keep their order and are numbered again from 0, the
+            players and their codes are the same as in this store.
+
+            Args:
+                mask (ndarray): Boolean array selecting the hands.
+
+            Returns:
+                An ActionStore
+        """
+        store = ActionStore()
+        store.players = list(self.players)
+        store.player_codes = dict(self.player_codes)
+        for name in self.hand_columns:
+            setattr(store, name, getattr(self, name)[mask])
+        hand_index = (np.cumsum(mask) - 1).astype(np.int32)  # new index of each selected hand
+        for hand_column, columns in [('action_hand', self.action_columns), ('seat_hand', self.seat_columns)]:
+            rows = mask[getattr(self, hand_column)]
+            for name in columns:
+                setattr(store, name, getattr(self, name)[rows])
+            setattr(store, hand_column, hand_index[getattr(store, hand_column)])
+        return store
+
+    def __len__(self):
+        return len(self.hand_id)
+
+    def hand_offsets(self):
+        """ Return the position of the first action of each hand.
+
+            Returns:
+                An int64 array of len(self) + 1 positions, the actions of the
+                hand i are action_*[offsets[i]:offsets[i + 1]].
+        """
+        return np.searchsorted(self.action_hand, np.arange(len(self) + 1))
+
+    def player_counts(self, mask=None, per_hand=False):
+        """ Count the actions of each player.
+
+            Args:
+                mask (ndarray): Boolean array selecting the actions, all the
+                    actions if None.
+                per_hand (bool): Count the hands with at least one selected
+                    action instead of the actions.
+
+            Returns:
+                An int64 array of the count indexed by player code.
+        """
+        players = self.action_player if mask is None else self.action_player[mask]
+        hands = self.action_hand if mask is None else self.action_hand[mask]
+        known = players >= 0
+        players = players[known]
+        if per_hand:
+            # one (hand, player) pair for each hand of each player
+            size = max(len(self.players), 1)
+            players = np.unique(hands[known].astype(np.int64) * size + players) % size
+        return np.bincount(players, minlength=len(self.players))
+
+    def save(self, path):
+        """ Write the store in a NumPy .npz file.
+        """
+        columns = {name: getattr(self, name) for name in self.hand_columns + self.action_columns + self.seat_columns}
+        np.savez(path, players=np.array(self.players, dtype=str), **columns)
+
+    @classmethod
+    def load(cls, path):
+        """ Read a store written by save.
+        """
+        store = cls()
+        with np.load(path) as data:
+            for name in cls.hand_columns + cls.action_columns + cls.seat_columns:
+                setattr(store, name, data[name])
+            store.players = data['players'].tolist()
+        store.player_codes = {pseudo: code for code, pseudo in enumerate(store.players)}
+        return store
@@ -0,0 +1,237 @@
+import sqlite3
+
+import numpy as np
+
+from poker_tracker.data.action import ActionType
+from poker_tracker.analysis.action_store import POSITIONS, PREFLOP, RIVER
+from poker_tracker.analysis.pot_engine import replay
+from poker_tracker.evaluator.equity import equity_batch, SAMPLES
+
+BOARD_CARDS = [0, 3, 4, 5]  # Number of board cards known at each street
+ID_CHUNK = 500              # Hand ids looked up by one query, the lists of ids are padded to this size
+
+
+def find_all_in_hands(store, states=None):
+    """ Find the hands where the action ended with an all-in before the river.
+
+        The hand must end with at least two players who did not fold, all
+        of them with known hole cards and at least one of them all-in, and
+        no action on the river.
+
+        Args:
+            store (ActionStore): The hands.
+            states (PotStates): The replayed hands, see pot_engine.replay.
+
+        Returns:
+            (hands, streets) int64 arrays of the hand indexes and of the street
+            of the last action of each hand.
+    """
+    if states is None:
+        states = replay(store)
+    hands_number = len(store)
+    hand = store.seat_hand
+
+    last_street = np.full(hands_number, -1, np.int64)
+    np.maximum.at(last_street, store.action_hand, store.action_street.astype(np.int64))
+
+    folded_keys = np.unique(store.action_hand[store.action_type == ActionType.FOLD.value].astype(np.int64)
+                            * len(POSITIONS) + store.action_position[store.action_type == ActionType.FOLD.value])
+    seat_keys = hand.astype(np.int64) * len(POSITIONS) + store.seat_position
+    active = ~np.isin(seat_keys, folded_keys)
+    all_in = active & states.seat_all_in
+    unknown_cards = active & (store.seat_cards.min(axis=1) < 0)
+
+    remaining = np.bincount(hand[active], minlength=hands_number)
+    selected = (remaining >= 2) & (np.bincount(hand[all_in], minlength=hands_number) > 0) & \
+        (np.bincount(hand[unknown_cards], minlength=hands_number) == 0) & \
+        (last_street >= PREFLOP) & (last_street < RIVER) & (store.board[:, 4] >= 0)
+    hands = np.flatnonzero(selected)
+    return hands, last_street[hands]
+
+
+def side_pots(contributions, active):
+    """ Split the chips of a hand in a main pot and side pots.
+
+        Args:
+            contributions (list): The chips put in the pot by each seat,
+                without the uncalled bet.
+            active (list): Whether each seat is still in the hand.
+
+        Returns:
+            A list of (amount, eligible) tuples where eligible is the list
+            of the indexes of the seats that can win the pot, the main pot
+            first.
+    """
+    levels = sorted({contribution for contribution, is_active in zip(contributions, active) if is_active})
+    pots = []
+    previous = 0
+    for level in levels:
+        amount = sum(min(contribution, level) - min(contribution, previous) for contribution in contributions)
+        eligible = [index for index, is_active in enumerate(active) if is_active and contributions[index] >= level]
+        pots.append((amount, eligible))
+        previous = level
+    # the chips of the folded players above the highest active level
+    pots[-1] = (pots[-1][0] + sum(max(contribution - previous, 0) for contribution in contributions), pots[-1][1])
+    return pots
+
+
+class AllInEv:
+    """ The all-in adjusted results stored in a SQLite file.
+
+        For each hand ended by an all-in before the river, the pots are
+        shared according to the equity of the players when the action ended
+        instead of the actual board. The EV adjusted and the actual results
+        are stored by hand and player. Every processed hand is recorded, so
+        an update only replays and computes the hands added to the store
+        since the previous one. The equities of all the new hands are
+        computed in one batch, see evaluator.equity.equity_batch.
+
+        Args:
+            path (string): The path of the SQLite file.
+
+        Attributes:
+            connection (sqlite3.Connection): The connection to the SQLite file.
+    """
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS t_ev_hand(
+                 d_hand_id INTEGER PRIMARY KEY,
+                 d_street INTEGER,
+                 d_pot REAL
+            )
+            """)
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS t_ev_result(
+                 d_hand_id INTEGER,
+                 d_player TEXT,
+                 d_position TEXT,
+                 d_equity REAL,
+                 d_net REAL,
+                 d_ev_net REAL,
+                 PRIMARY KEY (d_hand_id, d_player)
+            )
+            """)
+            self.connection.execute("CREATE INDEX IF NOT EXISTS i_ev_result_player ON t_ev_result(d_player)")
+
+    def update(self, store, workers=None, samples=SAMPLES, seed=None):
+        """ Compute the results of the hands of a store that are not processed yet.
+
+            Args:
+                store (ActionStore): The hands.
+                workers (int): The number of processes computing the
+                    equities, see equity_batch.
+                samples (int): The number of boards of each Monte Carlo simulation.
+                seed (int): The seed of the Monte Carlo simulations.
+
+            Returns:
+                The number of new all-in hands.
+        """
+        # only the new hands are replayed
+        store = store.select(~self.processed(store.hand_id))
+        if not len(store):
+            return 0
+        states = replay(store)
+        hands, streets = find_all_in_hands(store, states)
+
+        seat_offsets = np.searchsorted(store.seat_hand, np.arange(len(store) + 1))
+        folded = set(zip(store.action_hand[store.action_type == ActionType.FOLD.value].tolist(),
+                         store.action_position[store.action_type == ActionType.FOLD.value].tolist()))
+        spots = []
+        hand_pots = []
+        for hand, street in zip(hands.tolist(), streets.tolist()):
+            seats = list(range(seat_offsets[hand], seat_offsets[hand + 1]))
+            active = [(hand, int(store.seat_position[seat])) not in folded for seat in seats]
+            pots = side_pots(states.seat_invested[seats].tolist(), active)
+            board = store.board[hand, :BOARD_CARDS[street]].tolist()
+            for _, eligible in pots:
+                if len(eligible) > 1:
+                    spots.append(([store.seat_cards[seats[index]].tolist() for index in eligible], board))
+            hand_pots.append((hand, street, seats, pots))
+        results = iter(equity_batch(spots, workers=workers, samples=samples, seed=seed))
+
+        rows = []
+        hand_rows = []
+        for hand, street, seats, pots in hand_pots:
+            expected = np.zeros(len(seats))  # expected share of the pots of each seat
+            for amount, eligible in pots:
+                equities = next(results).equities if len(eligible) > 1 else [1.0]
+                for index, share in zip(eligible, equities):
+                    expected[index] += amount * share
+            pot = states.hand_pot[hand]
+            invested = states.seat_invested[seats]
+            paid = store.seat_collected[seats].sum() / pot if pot > 0 else 1.0  # part of the pot left after the rake
+            hand_id = int(store.hand_id[hand])
+            for index, seat in enumerate(seats):
+                rows.append((hand_id, store.players[store.seat_player[seat]], POSITIONS[store.seat_position[seat]],
+                             float(expected[index] / pot) if pot > 0 else 0.0,
+                             float(states.seat_net[seat]), float(expected[index] * paid - invested[index])))
+            hand_rows.append((hand_id, street, float(pot)))
+        all_in = set(store.hand_id[hands].tolist())
+        hand_rows += [(hand_id, -1, 0.0) for hand_id in store.hand_id.tolist() if hand_id not in all_in]
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO t_ev_hand VALUES (?, ?, ?)", hand_rows)
+            self.connection.executemany("INSERT OR REPLACE INTO t_ev_result VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return len(hand_pots)
+
+    def processed(self, hand_ids):
+        """ Find the hands already processed by an update.
+
+            The ids are looked up by ID_CHUNK, only the processed ids of
+            these hands are read.
+
+            Args:
+                hand_ids (ndarray): The ids of the hands.
+
+            Returns:
+                A boolean array, True for the processed hands.
+        """
+        found = []
+        query = "SELECT d_hand_id FROM t_ev_hand WHERE d_hand_id IN ({0})".format(", ".join("?" * ID_CHUNK))
+        ids = hand_ids.tolist()
+        for start in range(0, len(ids), ID_CHUNK):
+            chunk = ids[start:start + ID_CHUNK]
+            found.extend(row[0] for row in self.connection.execute(query, chunk + [None] * (ID_CHUNK - len(chunk))))
+        return np.isin(hand_ids, np.array(found, np.int64))
+
+    def hand_results(self, hand_id):
+        """ Return the results of the players of a hand.
+
+            Returns:
+                A dict of (equity, net, ev_net) referenced by the pseudo of the
+                players, empty if the hand is not an all-in hand.
+        """
+        return {player: (equity, net, ev_net) for player, equity, net, ev_net in self.connection.execute(
+            "SELECT d_player, d_equity, d_net, d_ev_net FROM t_ev_result WHERE d_hand_id = ?", (hand_id,))}
+
+    def player_results(self, pseudo=None):
+        """ Return the total results of the players in the all-in hands.
+
+            Args:
+                pseudo (string): Only this player, all the players if None.
+
+            Returns:
+                A dict of (hands, net, ev_net) referenced by the pseudo, where
+                net is the sum of the actual results and ev_net the sum of the
+                EV adjusted results.
+        """
+        query = "SELECT d_player, COUNT(*), SUM(d_net), SUM(d_ev_net) FROM t_ev_result"
+        parameters = ()
+        if pseudo is not None:
+            query += " WHERE d_player = ?"
+            parameters = (pseudo,)
+        return {player: (hands, net, ev_net)
+                for player, hands, net, ev_net in self.connection.execute(query + " GROUP BY d_player", parameters)}
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM t_ev_hand").fetchone()[0]
+
+    def close(self):
+        """ Close the SQLite file.
+        """
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,216 @@
+import numpy as np
+
+from poker_tracker.data.action import ActionType
+from poker_tracker.analysis.action_store import POSITIONS, PREFLOP, FLOP
+
+# Counters of the statistics, each one is counted by player and position
+COUNTERS = [
+    'hands',                    # hands dealt
+    'vpip',                     # hands with a call, a bet or a raise preflop
+    'pfr',                      # hands with a raise preflop
+    'three_bet_opportunities',  # hands where the player acted facing a single preflop raise
+    'three_bet',                # hands where the player re-raised a single preflop raise
+    'three_bet_faced',          # hands where the first preflop raiser acted facing a re-raise
+    'fold_to_three_bet',        # hands where the first preflop raiser folded to a re-raise
+    'cbet_opportunities',       # hands where the last preflop raiser acted first on the flop without a bet before
+    'cbet',                     # hands where the last preflop raiser bet the flop first
+    'aggressive',               # bets and raises after the flop
+    'calls',                    # calls after the flop
+    'saw_flop',                 # hands where the player did not fold before the flop
+    'showdowns',                # hands where the player saw the flop and went to showdown
+    'won_showdowns',            # hands where the player won money at showdown
+]
+# key: statistic | value: (numerator counter, denominator counter)
+STATS = {
+    'vpip': ('vpip', 'hands'),
+    'pfr': ('pfr', 'hands'),
+    'three_bet': ('three_bet', 'three_bet_opportunities'),
+    'fold_to_three_bet': ('fold_to_three_bet', 'three_bet_faced'),
+    'cbet': ('cbet', 'cbet_opportunities'),
+    'af': ('aggressive', 'calls'),
+    'wtsd': ('showdowns', 'saw_flop'),
+    'wsd': ('won_showdowns', 'showdowns'),
+}
+
+
+class PlayerStats:
+    """ The statistics counters of every player in every position.
+
+        Each counter is an int64 array (players, positions), a statistic is
+        the ratio of two counters, see STATS. The af statistic is a ratio of
+        actions, the other ones are ratios of hands.
+
+        Args:
+            players (list): The pseudos of the players, indexed by player code.
+            counts (dict): The counters referenced by name, see COUNTERS.
+
+        Attributes:
+            players (list): The pseudos of the players, indexed by player code.
+            player_codes (dict): The player code referenced by the pseudo.
+            counts (dict): The counters referenced by name, see COUNTERS.
+    """
+    def __init__(self, players, counts):
+        self.players = players
+        self.player_codes = {pseudo: code for code, pseudo in enumerate(players)}
+        self.counts = counts
+
+    def ratio(self, name, by_position=False):
+        """ Compute a statistic for all the players.
+
+            Args:
+                name (string): The name of the statistic, see STATS.
+                by_position (bool): Compute the statistic in each position.
+
+            Returns:
+                A float64 array indexed by player code, or (players, positions)
+                if by_position. The value is nan when the denominator is 0.
+        """
+        numerator, denominator = (self.counts[counter] for counter in STATS[name])
+        if not by_position:
+            numerator = numerator.sum(axis=1)
+            denominator = denominator.sum(axis=1)
+        result = np.full(numerator.shape, np.nan)
+        np.divide(numerator, denominator, out=result, where=denominator > 0)
+        return result
+
+    def player(self, pseudo, position=None):
+        """ Return the statistics of a player.
+
+            Args:
+                pseudo (string): The pseudo of the player.
+                position (string): Only the hands played in this position,
+                    all the positions if None.
+
+            Returns:
+                A dict of the statistics referenced by name, with the number of
+                hands under 'hands'.
+        """
+        code = self.player_codes[pseudo]
+        columns = slice(None) if position is None else POSITIONS.index(position)
+        return stats_from_counts({counter: int(self.counts[counter][code, columns].sum()) for counter in COUNTERS})
+
+
+def stats_from_counts(counts):
+    """ Compute the statistics from the counters of one player.
+
+        Args:
+            counts (dict): The value of the counters referenced by name, see COUNTERS.
+
+        Returns:
+            A dict of the statistics referenced by name, nan when the
+            denominator is 0, with the number of hands under 'hands'.
+    """
+    stats = {'hands': counts['hands']}
+    for name, (numerator, denominator) in STATS.items():
+        stats[name] = counts[numerator] / counts[denominator] if counts[denominator] else float('nan')
+    return stats
+
+
+def compute_stats(store):
+    """ Compute the statistics of every player of an ActionStore.
+
+        All the hands are processed at once with array operations, there is
+        no loop over the hands or the actions.
+
+        Args:
+            store (ActionStore): The hands.
+
+        Returns:
+            A PlayerStats
+    """
+    players_number = len(store.players)
+    positions_number = len(POSITIONS)
+    hands_number = len(store)
+
+    def keys(players, positions):
+        # counter index of each action or seat, -1 if the player or the position is unknown
+        return np.where((players >= 0) & (positions >= 0), players.astype(np.int64) * positions_number + positions, -1)
+
+    action_keys = keys(store.action_player, store.action_position)
+    seat_keys = keys(store.seat_player, store.seat_position)
+
+    def count(keys, mask):
+        selected = keys[mask]
+        counts = np.bincount(selected[selected >= 0], minlength=players_number * positions_number)
+        return counts.reshape(players_number, positions_number)
+
+    def count_actions(mask):
+        return count(action_keys, mask)
+
+    def count_seats(mask):
+        return count(seat_keys, mask)
+
+    # seat of each action, found in a (hand, position) table
+    seat_table = np.full(hands_number * positions_number, -1, np.int64)
+    known = store.seat_position >= 0
+    seat_table[store.seat_hand[known].astype(np.int64) * positions_number + store.seat_position[known]] = \
+        np.flatnonzero(known)
+    action_seat = np.where(store.action_position >= 0,
+                           seat_table[store.action_hand.astype(np.int64) * positions_number + store.action_position],
+                           -1)
+
+    def seats_with(mask):
+        # seats with at least one selected action
+        selected = np.zeros(len(store.seat_hand) + 1, bool)
+        selected[action_seat[mask]] = True
+        return selected[:-1]
+
+    def count_hands(mask):
+        return count_seats(seats_with(mask))
+
+    action_type = store.action_type
+    street = store.action_street
+    preflop = street == PREFLOP
+    flop = street == FLOP
+    aggressive = (action_type == ActionType.BET.value) | (action_type == ActionType.RAISE.value)
+    call = action_type == ActionType.CALL.value
+    fold = action_type == ActionType.FOLD.value
+
+    # number of bets and raises before each action in its street
+    group = store.action_hand.astype(np.int64) * 4 + street
+    starts = np.ones(len(group), bool)
+    starts[1:] = group[1:] != group[:-1]
+    first_of_group = np.maximum.accumulate(np.where(starts, np.arange(len(group)), 0))
+    before = np.cumsum(aggressive) - aggressive
+    aggressive_before = before - before[first_of_group]
+
+    # first and last preflop raisers of each hand
+    preflop_raises = np.flatnonzero(preflop & aggressive)
+    raise_hands = store.action_hand[preflop_raises]
+    opener = np.full(hands_number, -1, np.int64)
+    first_raise = np.ones(len(preflop_raises), bool)
+    first_raise[1:] = raise_hands[1:] != raise_hands[:-1]
+    opener[raise_hands[first_raise]] = store.action_player[preflop_raises[first_raise]]
+    aggressor = np.full(hands_number, -1, np.int64)
+    last_raise = np.ones(len(preflop_raises), bool)
+    last_raise[:-1] = raise_hands[1:] != raise_hands[:-1]
+    aggressor[raise_hands[last_raise]] = store.action_player[preflop_raises[last_raise]]
+
+    facing_raise = preflop & (aggressive_before == 1)
+    facing_three_bet = preflop & (aggressive_before == 2) & (store.action_player == opener[store.action_hand])
+    cbet_opportunity = flop & (aggressive_before == 0) & (store.action_player == aggressor[store.action_hand])
+
+    # seats that folded, before the flop or at any time
+    folded = seats_with(fold)
+    folded_preflop = seats_with(fold & preflop)
+    remaining = np.bincount(store.seat_hand[~folded], minlength=hands_number)
+    saw_flop = ~folded_preflop & (store.board[store.seat_hand, 0] >= 0)
+    showdown = saw_flop & ~folded & (remaining[store.seat_hand] >= 2)
+
+    counts = {
+        'hands': count_seats(np.ones(len(store.seat_hand), bool)),
+        'vpip': count_hands(preflop & (aggressive | call)),
+        'pfr': count_hands(preflop & aggressive),
+        'three_bet_opportunities': count_hands(facing_raise),
+        'three_bet': count_hands(facing_raise & aggressive),
+        'three_bet_faced': count_hands(facing_three_bet),
+        'fold_to_three_bet': count_hands(facing_three_bet & fold),
+        'cbet_opportunities': count_hands(cbet_opportunity),
+        'cbet': count_hands(cbet_opportunity & aggressive),
+        'aggressive': count_actions((street > PREFLOP) & aggressive),
+        'calls': count_actions((street > PREFLOP) & call),
+        'saw_flop': count_seats(saw_flop),
+        'showdowns': count_seats(showdown),
+        'won_showdowns': count_seats(showdown & (store.seat_collected > 0)),
+    }
+    return PlayerStats(list(store.players), counts)
@@ -0,0 +1,202 @@
+import numpy as np
+
+from poker_tracker.data.action import ActionType
+from poker_tracker.analysis.action_store import POSITIONS, PREFLOP
+
+EPSILON = 1e-6  # Tolerance of the amount comparisons
+
+
+def segment_starts(keys):
+    """ Return a boolean array marking the first element of each run of equal keys.
+    """
+    starts = np.ones(len(keys), bool)
+    starts[1:] = keys[1:] != keys[:-1]
+    return starts
+
+
+def segment_running_max(values, starts):
+    """ Compute the running maximum of values restarted at each segment start.
+
+        The values are converted to integer cents so that the segments can be
+        shifted above each other and processed with one accumulate.
+
+        Args:
+            values (ndarray): Non negative float64 amounts.
+            starts (ndarray): Boolean array marking the first value of each segment.
+
+        Returns:
+            A float64 array of the maximum of the values of the segment up to each value.
+    """
+    if len(values) == 0:
+        return np.zeros(0)
+    cents = np.rint(values * 100).astype(np.int64)
+    shift = (np.cumsum(starts) - 1) * (int(cents.max()) + 1)
+    return (np.maximum.accumulate(cents + shift) - shift) / 100
+
+
+class PotStates:
+    """ The pot, the stacks and the committed chips after each action of an ActionStore.
+
+        The states are computed for all the hands at once with array
+        operations, see replay. The action arrays are aligned with the
+        actions of the store and the seat arrays with its seats, so the
+        statistics, the all-in EV and the graphs can read them directly.
+
+        Attributes:
+            store (ActionStore): The replayed hands.
+            action_seat (ndarray): int64 seat index of each action, -1 if unknown.
+            action_to_call (ndarray): float64 amount to call before each action.
+            action_put (ndarray): float64 chips added to the pot by each action.
+            action_committed (ndarray): float64 chips of the player in the
+                street after each action, the blind included.
+            action_stack (ndarray): float64 stack of the player after each action.
+            action_pot (ndarray): float64 pot after each action, the antes and
+                the blinds included.
+            seat_ante (ndarray): float64 ante posted by each seat.
+            seat_blind (ndarray): float64 blind posted by each seat.
+            seat_returned (ndarray): float64 uncalled bet returned to each seat.
+            seat_invested (ndarray): float64 chips put in the pot by each
+                seat, the uncalled bet excluded.
+            seat_all_in (ndarray): bool, whether each seat put all its stack in the pot.
+            seat_net (ndarray): float64 net result of each seat, the amount
+                collected minus the amount invested.
+            hand_pot (ndarray): float64 final pot of each hand, the rake included.
+    """
+    def __init__(self, store):
+        self.store = store
+        self.action_seat = np.zeros(0, np.int64)
+        self.action_to_call = np.zeros(0)
+        self.action_put = np.zeros(0)
+        self.action_committed = np.zeros(0)
+        self.action_stack = np.zeros(0)
+        self.action_pot = np.zeros(0)
+        self.seat_ante = np.zeros(0)
+        self.seat_blind = np.zeros(0)
+        self.seat_returned = np.zeros(0)
+        self.seat_invested = np.zeros(0)
+        self.seat_all_in = np.zeros(0, bool)
+        self.seat_net = np.zeros(0)
+        self.hand_pot = np.zeros(0)
+
+    def hand_stacks(self, hand):
+        """ Compute the stack of every seat of a hand after each action.
+
+            Args:
+                hand (int): The index of the hand in the store.
+
+            Returns:
+                (seats, stacks) where seats is the array of the seat indexes
+                of the hand and stacks a float64 array (actions + 1, seats)
+                whose first row is the stacks once the antes and the blinds
+                are posted, and row i the stacks after the action i - 1.
+        """
+        store = self.store
+        seats = np.flatnonzero(store.seat_hand == hand)
+        actions = np.flatnonzero(store.action_hand == hand)
+        put = np.zeros((len(actions) + 1, len(seats)))
+        known = self.action_seat[actions] >= 0
+        rows = np.flatnonzero(known) + 1
+        put[rows, self.action_seat[actions][known] - seats[0]] = self.action_put[actions][known]
+        start = store.seat_stack[seats] - self.seat_ante[seats] - self.seat_blind[seats]
+        return seats, start - np.cumsum(put, axis=0)
+
+
+def replay(store):
+    """ Replay the actions of all the hands of an ActionStore.
+
+        A raise amount is the total of the player on the street, a bet or a
+        call amount is added to it. The uncalled bet of a hand is the part of
+        the highest investment that no other player matched.
+
+        Args:
+            store (ActionStore): The hands.
+
+        Returns:
+            A PotStates
+    """
+    states = PotStates(store)
+    positions_number = len(POSITIONS)
+    seats_number = len(store.seat_hand)
+    hand = store.seat_hand
+    states.seat_ante = np.minimum(store.ante[hand], store.seat_stack)
+    states.seat_blind = np.minimum(store.seat_blind, store.seat_stack - states.seat_ante)
+
+    # seat of each action, found in a (hand, position) table
+    seat_table = np.full(len(store) * positions_number, -1, np.int64)
+    known = store.seat_position >= 0
+    seat_table[hand[known].astype(np.int64) * positions_number + store.seat_position[known]] = np.flatnonzero(known)
+    action_seat = np.where(store.action_position >= 0,
+                           seat_table[store.action_hand.astype(np.int64) * positions_number + store.action_position],
+                           -1)
+    states.action_seat = action_seat
+
+    # chips of each seat in the street before and after each action, the actions
+    # are grouped by (seat, street) and a raise restarts the sum of the bets and calls.
+    # The streets of a hand are in order, so a stable sort by seat groups the streets.
+    order = np.argsort(action_seat, kind='stable')
+    order = order[action_seat[order] >= 0]
+    group = action_seat[order] * 4 + store.action_street[order]
+    amount = store.action_amount[order]
+    action_type = store.action_type[order]
+    is_raise = action_type == ActionType.RAISE.value
+    added = np.where((action_type == ActionType.BET.value) | (action_type == ActionType.CALL.value), amount, 0)
+    starts = segment_starts(group)
+    initial = np.where(group % 4 == PREFLOP, states.seat_blind[group // 4], 0)
+    indexes = np.arange(len(order))
+    segment = np.maximum.accumulate(np.where(starts | is_raise, indexes, 0))
+    total = np.cumsum(added)
+    after = np.where(is_raise[segment], amount[segment], initial[segment]) + total - total[segment] + added[segment]
+    before = np.concatenate([[0], after[:-1]])
+    before[starts] = initial[starts]
+    committed = np.zeros(len(action_seat))
+    committed_before = np.zeros(len(action_seat))
+    committed[order] = after
+    committed_before[order] = before
+    states.action_committed = committed
+    put = committed - committed_before
+    states.action_put = put
+
+    # amount to call: the highest commitment of the street before the action
+    street_starts = segment_starts(store.action_hand.astype(np.int64) * 4 + store.action_street)
+    highest = segment_running_max(committed, street_starts)
+    highest_before = np.concatenate([[0], highest[:-1]])
+    highest_before[street_starts] = 0
+    seat_offsets = np.flatnonzero(segment_starts(hand))  # the seats of a hand are contiguous
+    hand_blind = np.zeros(len(store))
+    if seats_number:
+        hand_blind[hand[seat_offsets]] = np.maximum.reduceat(states.seat_blind, seat_offsets)
+    preflop = store.action_street == PREFLOP
+    highest_before[preflop] = np.maximum(highest_before[preflop], hand_blind[store.action_hand[preflop]])
+    states.action_to_call = np.maximum(highest_before - committed_before, 0)
+
+    # pot and stack after each action
+    posted = states.seat_ante + states.seat_blind
+    hand_posted = np.bincount(hand, weights=posted, minlength=len(store))
+    offsets = store.hand_offsets()
+    cumulative = np.concatenate([[0], np.cumsum(put)])
+    states.action_pot = hand_posted[store.action_hand] + cumulative[1:] - cumulative[offsets[store.action_hand]]
+    seat_put = np.cumsum(put[order])
+    seat_starts = segment_starts(action_seat[order])
+    first = np.maximum.accumulate(np.where(seat_starts, np.arange(len(order)), 0))
+    stack = np.zeros(len(action_seat))
+    stack[order] = (store.seat_stack - posted)[action_seat[order]] - (seat_put - seat_put[first] + put[order][first])
+    states.action_stack = stack
+
+    # uncalled bet and results
+    live = states.seat_blind + np.bincount(action_seat[action_seat >= 0], weights=put[action_seat >= 0],
+                                           minlength=seats_number)
+    states.seat_all_in = (store.seat_stack > 0) & (store.seat_stack - states.seat_ante - live <= EPSILON)
+    states.seat_returned = np.zeros(seats_number)
+    if seats_number:
+        # the first seat with the highest amount gets back what the second highest did not match
+        hand_rank = np.cumsum(segment_starts(hand)) - 1
+        highest = np.maximum.reduceat(live, seat_offsets)[hand_rank]
+        top = np.minimum.reduceat(np.where(live == highest, np.arange(seats_number), seats_number), seat_offsets)
+        others = live.copy()
+        others[top] = 0
+        second = np.maximum.reduceat(others, seat_offsets)
+        states.seat_returned[top] = np.maximum(live[top] - second, 0)
+    states.seat_invested = states.seat_ante + live - states.seat_returned
+    states.seat_net = store.seat_collected - states.seat_invested
+    states.hand_pot = np.bincount(hand, weights=states.seat_invested, minlength=len(store))
+    return states
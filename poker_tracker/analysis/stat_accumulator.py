@@ -0,0 +1,234 @@
+import numpy as np
+
+from poker_tracker.data.action import ActionType
+from poker_tracker.analysis.action_store import POSITIONS, POSITION_CODES
+from poker_tracker.analysis.player_stats import COUNTERS, PlayerStats, stats_from_counts
+
+COUNTER_INDEX = {counter: index for index, counter in enumerate(COUNTERS)}
+HANDS = COUNTER_INDEX['hands']
+VPIP = COUNTER_INDEX['vpip']
+PFR = COUNTER_INDEX['pfr']
+THREE_BET_OPPORTUNITIES = COUNTER_INDEX['three_bet_opportunities']
+THREE_BET = COUNTER_INDEX['three_bet']
+THREE_BET_FACED = COUNTER_INDEX['three_bet_faced']
+FOLD_TO_THREE_BET = COUNTER_INDEX['fold_to_three_bet']
+CBET_OPPORTUNITIES = COUNTER_INDEX['cbet_opportunities']
+CBET = COUNTER_INDEX['cbet']
+AGGRESSIVE = COUNTER_INDEX['aggressive']
+CALLS = COUNTER_INDEX['calls']
+SAW_FLOP = COUNTER_INDEX['saw_flop']
+SHOWDOWNS = COUNTER_INDEX['showdowns']
+WON_SHOWDOWNS = COUNTER_INDEX['won_showdowns']
+
+
+def hand_counters(hand):
+    """ Compute the counters of each player of a hand.
+
+        The counters follow the definitions of player_stats.compute_stats,
+        the actions of the hand are read once.
+
+        Args:
+            hand (Hand): A parsed hand.
+
+        Returns:
+            A dict of (position, counters) referenced by the pseudo of the
+            players, the counters are a list of int in the COUNTERS order.
+    """
+    counters = {}
+    for position, seat in hand.seats.items():
+        if position in POSITION_CODES:
+            counters[position] = [0] * len(COUNTERS)
+            counters[position][HANDS] = 1
+    folded = set()
+    folded_preflop = set()
+
+    # preflop
+    aggressive_before = 0
+    opener = None
+    aggressor = None
+    for action in hand.action_preflop:
+        values = counters.get(action.position)
+        action_type = action.action_type
+        aggressive = action_type is ActionType.BET or action_type is ActionType.RAISE
+        if values is not None:
+            if aggressive or action_type is ActionType.CALL:
+                values[VPIP] = 1
+            if aggressive:
+                values[PFR] = 1
+            if aggressive_before == 1:
+                values[THREE_BET_OPPORTUNITIES] = 1
+                if aggressive:
+                    values[THREE_BET] = 1
+            elif aggressive_before == 2 and action.position == opener:
+                values[THREE_BET_FACED] = 1
+                if action_type is ActionType.FOLD:
+                    values[FOLD_TO_THREE_BET] = 1
+        if action_type is ActionType.FOLD:
+            folded_preflop.add(action.position)
+        if aggressive:
+            if aggressive_before == 0:
+                opener = action.position
+            aggressor = action.position
+            aggressive_before += 1
+
+    # after the flop
+    for street, actions in enumerate([hand.action_flop, hand.action_turn, hand.action_river]):
+        aggressive_before = 0
+        for action in actions:
+            values = counters.get(action.position)
+            action_type = action.action_type
+            aggressive = action_type is ActionType.BET or action_type is ActionType.RAISE
+            if values is not None:
+                if street == 0 and aggressive_before == 0 and action.position == aggressor:
+                    values[CBET_OPPORTUNITIES] = 1
+                    if aggressive:
+                        values[CBET] = 1
+                if aggressive:
+                    values[AGGRESSIVE] += 1
+                elif action_type is ActionType.CALL:
+                    values[CALLS] += 1
+            if action_type is ActionType.FOLD:
+                folded.add(action.position)
+            if aggressive:
+                aggressive_before += 1
+
+    folded |= folded_preflop
+    flop = bool(hand.board_flop) and hand.board_flop[0].code >= 0
+    remaining = sum(1 for position in hand.seats if position not in folded)
+    collected = hand.collected
+    for position, values in counters.items():
+        if flop and position not in folded_preflop:
+            values[SAW_FLOP] = 1
+            if position not in folded and remaining >= 2:
+                values[SHOWDOWNS] = 1
+                if collected.get(position, 0) > 0:
+                    values[WON_SHOWDOWNS] = 1
+    return {hand.seats[position].player: (position, values) for position, values in counters.items()}
+
+
+class PlayerAccumulator:
+    """ The statistics counters of one player, updated hand by hand.
+
+        An update only reads the new hand, and accumulators built on
+        different hands (for instance in different import processes) can be
+        merged. The counters are the ones of player_stats.compute_stats.
+
+        Args:
+            pseudo (string): The pseudo of the player.
+
+        Attributes:
+            pseudo (string): The pseudo of the player.
+            counts (dict): The counters referenced by the position, each
+                one is a list of int in the COUNTERS order.
+    """
+    def __init__(self, pseudo):
+        self.pseudo = pseudo
+        self.counts = {}
+
+    def add(self, position, values):
+        """ Add the counters of one hand played in position.
+        """
+        counts = self.counts.get(position)
+        if counts is None:
+            self.counts[position] = list(values)
+        else:
+            for index, value in enumerate(values):
+                counts[index] += value
+
+    def update(self, hand):
+        """ Add a hand to the counters, nothing is done if the player is not in the hand.
+
+            Args:
+                hand (Hand): A parsed hand.
+        """
+        if self.pseudo not in hand.pseudo_seats:
+            return
+        counters = hand_counters(hand).get(self.pseudo)
+        if counters is not None:
+            self.add(*counters)
+
+    def merge(self, other):
+        """ Add the counters of another accumulator of the same player.
+
+            Args:
+                other (PlayerAccumulator): The accumulator to add.
+
+            Returns:
+                This accumulator.
+        """
+        if other.pseudo != self.pseudo:
+            raise ValueError("Cannot merge the statistics of {0} with {1}".format(other.pseudo, self.pseudo))
+        for position, values in other.counts.items():
+            self.add(position, values)
+        return self
+
+    def snapshot(self, position=None):
+        """ Compute the current statistics of the player.
+
+            Args:
+                position (string): Only the hands played in this position,
+                    all the positions if None.
+
+            Returns:
+                A dict of the statistics referenced by name, see
+                player_stats.stats_from_counts.
+        """
+        totals = [0] * len(COUNTERS)
+        for counts_position, values in self.counts.items():
+            if position is None or counts_position == position:
+                for index, value in enumerate(values):
+                    totals[index] += value
+        return stats_from_counts(dict(zip(COUNTERS, totals)))
+
+
+class StatsAccumulator:
+    """ The PlayerAccumulator of every player met in the hands.
+
+        Each hand is read once for all its players.
+
+        Attributes:
+            players (dict): PlayerAccumulator referenced by the pseudo.
+    """
+    def __init__(self):
+        self.players = {}
+
+    def update(self, hand):
+        """ Add a hand to the counters of its players.
+
+            Args:
+                hand (Hand): A parsed hand.
+        """
+        for pseudo, (position, values) in hand_counters(hand).items():
+            accumulator = self.players.get(pseudo)
+            if accumulator is None:
+                accumulator = self.players[pseudo] = PlayerAccumulator(pseudo)
+            accumulator.add(position, values)
+
+    def merge(self, other):
+        """ Add the counters of another StatsAccumulator.
+
+            Args:
+                other (StatsAccumulator): The accumulator to add.
+
+            Returns:
+                This accumulator.
+        """
+        for pseudo, accumulator in other.players.items():
+            if pseudo in self.players:
+                self.players[pseudo].merge(accumulator)
+            else:
+                self.players[pseudo] = PlayerAccumulator(pseudo).merge(accumulator)
+        return self
+
+    def snapshot(self):
+        """ Return the current statistics of all the players.
+
+            Returns:
+                A PlayerStats, as computed by player_stats.compute_stats.
+        """
+        players = list(self.players)
+        counts = np.zeros((len(COUNTERS), len(players), len(POSITIONS)), np.int64)
+        for code, pseudo in enumerate(players):
+            for position, values in self.players[pseudo].counts.items():
+                counts[:, code, POSITION_CODES[position]] = values
+        return PlayerStats(players, {counter: counts[index] for index, counter in enumerate(COUNTERS)})
@@ -0,0 +1,79 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "..", "poker_parser_test", "HandTest.txt")
+
+import numpy as np
+
+from poker_tracker.data.action import ActionType
+from poker_tracker.data.card import Card, Value, Color
+from poker_tracker.analysis.action_store import ActionStore, POSITION_CODES, PREFLOP, FLOP, TURN, RIVER
+from poker_tracker.poker_parser.hand_reader import read_hands
+
+
+def test_action_store():
+    hands = list(read_hands(hand_history_file))
+    store = ActionStore.from_hands(hands)
+
+    assert len(store) == 9
+    assert store.hand_id[0] == 202004455940
+    assert len(store.action_hand) == sum(len(hand.action_preflop) + len(hand.action_flop) + len(hand.action_turn) +
+                                         len(hand.action_river) for hand in hands)
+    assert len(store.seat_hand) == sum(len(hand.seats) for hand in hands)
+    assert str(store.date[0]) == "2019-07-04T21:31:39"
+
+    hand = hands[0]
+    offsets = store.hand_offsets()
+    assert offsets[0] == 0 and offsets[-1] == len(store.action_hand)
+    first = slice(offsets[0], offsets[1])
+    assert list(store.action_street[first]) == [PREFLOP] * len(hand.action_preflop) + \
+        [FLOP] * len(hand.action_flop) + [TURN] * len(hand.action_turn) + [RIVER] * len(hand.action_river)
+    assert list(store.action_type[first][:len(hand.action_preflop)]) == \
+        [action.action_type.value for action in hand.action_preflop]
+    assert [store.players[code] for code in store.action_player[first][:len(hand.action_preflop)]] == \
+        [hand.seats[action.position].player for action in hand.action_preflop]
+    assert list(store.board[0][:3]) == [card.code for card in hand.board_flop]
+
+    bb = (store.seat_hand == 0) & (store.seat_position == POSITION_CODES["BB"])
+    assert store.players[store.seat_player[bb][0]] == hand.seats["BB"].player
+    assert store.seat_collected[bb][0] == hand.collected["BB"]
+    assert list(store.seat_cards[bb][0]) == [Card(Value.TWO, Color.SPADES).code, Card(Value.ACE, Color.HEARTS).code]
+
+
+def test_player_counts():
+    store = ActionStore.from_hands(read_hands(hand_history_file))
+
+    folds = store.player_counts(store.action_type == ActionType.FOLD.value)
+    assert folds.sum() == np.count_nonzero(store.action_type == ActionType.FOLD.value)
+    hands = store.player_counts(per_hand=True)
+    assert (hands <= store.player_counts()).all()
+    assert (hands <= len(store)).all()
+
+
+
+def test_select():
+    hands = list(read_hands(hand_history_file))
+    store = ActionStore.from_hands(hands)
+    mask = np.arange(len(store)) % 3 == 1
+    selected = store.select(mask)
+    expected = ActionStore.from_hands(hands[1::3])
+
+    assert len(selected) == 3
+    assert selected.players == store.players
+    for name in ActionStore.hand_columns + ActionStore.action_columns + ActionStore.seat_columns:
+        if name not in ('action_player', 'seat_player'):
+            assert (getattr(selected, name) == getattr(expected, name)).all()
+    assert [selected.players[code] for code in selected.seat_player] == \
+        [expected.players[code] for code in expected.seat_player]
+    assert len(store.select(np.zeros(len(store), bool))) == 0
+
+
+def test_save_load(tmp_path):
+    store = ActionStore.from_hands(read_hands(hand_history_file))
+    path = str(tmp_path / "store.npz")
+    store.save(path)
+
+    loaded = ActionStore.load(path)
+    assert loaded.players == store.players
+    assert (loaded.action_amount == store.action_amount).all()
+    assert (loaded.seat_cards == store.seat_cards).all()
+    assert (loaded.date == store.date).all()
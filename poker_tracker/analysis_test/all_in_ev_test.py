@@ -0,0 +1,66 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "..", "poker_parser_test", "HandTest.txt")
+
+import pytest
+
+from poker_tracker.analysis.action_store import ActionStore, PREFLOP
+from poker_tracker.analysis import all_in_ev as all_in_ev_module
+from poker_tracker.analysis.all_in_ev import AllInEv, find_all_in_hands, side_pots
+from poker_tracker.poker_parser.hand_reader import read_hands
+
+
+def test_find_all_in_hands():
+    store = ActionStore.from_hands(read_hands(hand_history_file))
+    hands, streets = find_all_in_hands(store)
+    assert store.hand_id[hands].tolist() == [202004550890, 202004570116]
+    assert streets.tolist() == [PREFLOP, PREFLOP]
+
+
+def test_side_pots():
+    pots = side_pots([100, 300, 300, 50], [True, True, True, False])
+    assert pots == [(350, [0, 1, 2]), (400, [1, 2])]
+    assert side_pots([20, 400, 400], [False, True, True]) == [(820, [1, 2])]
+
+
+def test_update():
+    store = ActionStore.from_hands(read_hands(hand_history_file))
+    first = ActionStore.from_records(hand.to_record() for hand in list(read_hands(hand_history_file))[:7])
+    with AllInEv(":memory:") as all_in_ev:
+        assert all_in_ev.update(first, workers=1, seed=0) == 1
+        assert all_in_ev.update(store, workers=1, seed=0) == 1  # only the hands added since
+        assert all_in_ev.update(store, workers=1, seed=0) == 0
+        assert len(all_in_ev) == 9
+
+        results = all_in_ev.hand_results(202004550890)
+        assert results['onucee'][1] == 420
+        assert results['leti5795'][1] == -400
+        assert results['MaGiCLeTuR'][1:] == (-20, -20)
+        # AK against A3, the pot is shared by equity
+        assert 0.6 < results['onucee'][0] / (results['onucee'][0] + results['leti5795'][0]) < 0.8
+        assert sum(result[2] for result in results.values()) == pytest.approx(0)
+
+        totals = all_in_ev.player_results()
+        assert totals['MaGiCLeTuR'][0] == 2
+        assert totals['onucee'][1] == 420 + 415
+        assert all_in_ev.player_results('onucee') == {'onucee': totals['onucee']}
+        assert all_in_ev.hand_results(202004455940) == {}
+
+
+def test_update_replays_new_hands(monkeypatch):
+    replayed = []
+    original = all_in_ev_module.replay
+
+    def replay(store):
+        replayed.append(store.hand_id.tolist())
+        return original(store)
+
+    monkeypatch.setattr(all_in_ev_module, 'replay', replay)
+    hands = list(read_hands(hand_history_file))
+    store = ActionStore.from_hands(hands)
+    with AllInEv(":memory:") as all_in_ev:
+        all_in_ev.update(ActionStore.from_hands(hands[:7]), workers=1, seed=0)
+        all_in_ev.update(store, workers=1, seed=0)
+        all_in_ev.update(store, workers=1, seed=0)
+        assert replayed == [store.hand_id[:7].tolist(), store.hand_id[7:].tolist()]
+        assert all_in_ev.processed(store.hand_id).all()
@@ -0,0 +1,60 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "..", "poker_parser_test", "HandTest.txt")
+
+import math
+
+import numpy as np
+
+from poker_tracker.analysis.action_store import ActionStore, POSITIONS
+from poker_tracker.analysis.player_stats import compute_stats, COUNTERS
+from poker_tracker.poker_parser.hand_reader import read_hands
+
+
+def test_compute_stats():
+    store = ActionStore.from_hands(list(read_hands(hand_history_file))[:5])
+    stats = compute_stats(store)
+
+    hero = stats.player("MaGiCLeTuR")
+    assert hero['hands'] == 5
+    assert hero['vpip'] == 1 / 5
+    assert hero['pfr'] == 1 / 5
+    assert hero['three_bet'] == 0
+    assert math.isnan(hero['fold_to_three_bet'])
+    assert hero['cbet'] == 1
+    assert hero['af'] == 4
+    assert hero['wtsd'] == 2 / 3
+    assert hero['wsd'] == 1 / 2
+
+    villain = stats.player("onucee")
+    assert villain['vpip'] == 3 / 5
+    assert villain['pfr'] == 1 / 5
+    assert villain['af'] == 1 / 2
+    assert villain['wtsd'] == 1
+    assert villain['wsd'] == 1 / 3
+    assert stats.player("leti5795")['three_bet'] == 0
+    assert stats.counts['three_bet_opportunities'][stats.player_codes["leti5795"]].sum() == 2
+
+    assert stats.player("MaGiCLeTuR", "BB")['hands'] == 2
+    assert stats.player("MaGiCLeTuR", "BB")['wtsd'] == 1
+
+
+def test_ratio():
+    store = ActionStore.from_hands(read_hands(hand_history_file))
+    stats = compute_stats(store)
+
+    vpip = stats.ratio('vpip')
+    assert vpip.shape == (len(stats.players),)
+    for code, pseudo in enumerate(stats.players):
+        assert vpip[code] == stats.player(pseudo)['vpip']
+    by_position = stats.ratio('vpip', by_position=True)
+    assert by_position.shape == (len(stats.players), len(POSITIONS))
+    assert np.isnan(by_position[:, POSITIONS.index("UTG")]).all()
+
+
+def test_empty_store():
+    stats = compute_stats(ActionStore())
+
+    assert stats.players == []
+    for counter in COUNTERS:
+        assert stats.counts[counter].shape == (0, len(POSITIONS))
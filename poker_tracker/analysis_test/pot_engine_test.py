@@ -0,0 +1,56 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "..", "poker_parser_test", "HandTest.txt")
+
+import numpy as np
+import pytest
+
+from poker_tracker.analysis.action_store import ActionStore
+from poker_tracker.analysis.pot_engine import replay
+from poker_tracker.poker_parser.fast_parser import FastPokerStarsParser
+from poker_tracker.poker_parser.hand_generator import HandGenerator
+from poker_tracker.poker_parser.hand_reader import parse_hand_text, read_hands
+
+
+def test_replay_all_in():
+    store = ActionStore.from_hands(read_hands(hand_history_file))
+    states = replay(store)
+    hand = store.hand_id.tolist().index(202004550890)
+    actions = np.flatnonzero(store.action_hand == hand)
+    seats = np.flatnonzero(store.seat_hand == hand)
+
+    # leti5795 calls, onucee raises all-in, MaGiCLeTuR folds, leti5795 calls all-in
+    assert states.action_put[actions].tolist() == [20, 640, 0, 380]
+    assert states.action_to_call[actions].tolist() == [20, 10, 630, 630]
+    assert states.action_committed[actions].tolist() == [20, 650, 20, 400]
+    assert states.action_stack[actions].tolist() == [380, 0, 430, 0]
+    assert states.action_pot[actions].tolist() == [50, 690, 690, 1070]
+
+    assert states.seat_blind[seats].tolist() == [0, 10, 20]
+    assert states.seat_returned[seats].tolist() == [0, 250, 0]
+    assert states.seat_invested[seats].tolist() == [400, 400, 20]
+    assert states.seat_all_in[seats].tolist() == [True, True, False]
+    assert states.seat_net[seats].tolist() == [-400, 420, -20]
+    assert states.hand_pot[hand] == 820
+
+    hand_seats, stacks = states.hand_stacks(hand)
+    assert hand_seats.tolist() == seats.tolist()
+    assert stacks.tolist() == [[400, 640, 430], [380, 640, 430], [380, 0, 430], [380, 0, 430], [0, 0, 430]]
+
+
+def test_replay_generated_hands():
+    store = ActionStore.from_records(parse_hand_text(text, FastPokerStarsParser).to_record()
+                                     for text in HandGenerator(2).hands(1000))
+    states = replay(store)
+    assert (store.ante > 0).any()
+    # no rake in the generated hands: the chips won are the chips lost
+    assert np.bincount(store.seat_hand, weights=states.seat_net) == pytest.approx(np.zeros(len(store)), abs=1e-6)
+    assert states.hand_pot == pytest.approx(np.bincount(store.seat_hand, weights=store.seat_collected))
+    assert (states.action_stack > -1e-6).all()
+    assert (states.seat_returned >= 0).all()
+
+
+def test_replay_empty_store():
+    states = replay(ActionStore())
+    assert len(states.seat_net) == 0
+    assert len(states.action_pot) == 0
@@ -0,0 +1,65 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "..", "poker_parser_test", "HandTest.txt")
+
+import pickle
+
+import pytest
+
+from poker_tracker.analysis.action_store import ActionStore
+from poker_tracker.analysis.player_stats import compute_stats, COUNTERS
+from poker_tracker.analysis.stat_accumulator import PlayerAccumulator, StatsAccumulator
+from poker_tracker.poker_parser.fast_parser import FastPokerStarsParser
+from poker_tracker.poker_parser.hand_generator import HandGenerator
+from poker_tracker.poker_parser.hand_reader import parse_hand_text, read_hands
+
+
+def generated_hands(count):
+    return [parse_hand_text(text, FastPokerStarsParser) for text in HandGenerator(4, max_players=6).hands(count)]
+
+
+def assert_same_stats(stats, expected):
+    assert sorted(stats.players) == sorted(expected.players)
+    for pseudo in expected.players:
+        code, expected_code = stats.player_codes[pseudo], expected.player_codes[pseudo]
+        for counter in COUNTERS:
+            assert (stats.counts[counter][code] == expected.counts[counter][expected_code]).all()
+
+
+def test_same_stats_as_compute_stats():
+    hands = generated_hands(400)
+    accumulator = StatsAccumulator()
+    for hand in hands:
+        accumulator.update(hand)
+
+    assert_same_stats(accumulator.snapshot(), compute_stats(ActionStore.from_hands(hands)))
+
+
+def test_merge():
+    hands = generated_hands(300)
+    whole = StatsAccumulator()
+    parts = [StatsAccumulator(), StatsAccumulator(), StatsAccumulator()]
+    for index, hand in enumerate(hands):
+        whole.update(hand)
+        parts[index % 3].update(hand)
+
+    merged = StatsAccumulator()
+    for part in parts:
+        merged.merge(pickle.loads(pickle.dumps(part)))
+    assert_same_stats(merged.snapshot(), whole.snapshot())
+
+
+def test_player_accumulator():
+    hands = list(read_hands(hand_history_file))
+    hero = PlayerAccumulator("MaGiCLeTuR")
+    first, second = PlayerAccumulator("MaGiCLeTuR"), PlayerAccumulator("MaGiCLeTuR")
+    for index, hand in enumerate(hands):
+        hero.update(hand)
+        (first if index < 4 else second).update(hand)
+
+    expected = compute_stats(ActionStore.from_hands(hands))
+    assert str(hero.snapshot()) == str(expected.player("MaGiCLeTuR"))
+    assert str(hero.snapshot("BB")) == str(expected.player("MaGiCLeTuR", "BB"))
+    assert str(first.merge(second).snapshot()) == str(hero.snapshot())
+    with pytest.raises(ValueError):
+        hero.merge(PlayerAccumulator("onucee"))
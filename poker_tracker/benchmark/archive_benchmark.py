@@ -0,0 +1,66 @@
+import argparse
+import os
+import tempfile
+import time
+
+from poker_tracker.analysis.player_stats import compute_stats
+from poker_tracker.data_base.hand_archive import HandArchive, write_archive
+from poker_tracker.poker_parser.bulk_import import import_records
+from poker_tracker.poker_parser.hand_generator import write_history
+
+
+def run_benchmark(count, directory, seed=0):
+    """ Compare a hand history file and the archive of its hands.
+
+        Args:
+            count (int): The number of generated hands.
+            directory (string): The directory of the files.
+            seed (int): The seed of the hand generator.
+
+        Returns:
+            A dict of the measures: text_size and archive_size in bytes,
+            parse, write, open and stats durations in seconds.
+    """
+    text_path = os.path.join(directory, 'history.txt')
+    archive_path = os.path.join(directory, 'history.pta')
+    results = {'text_size': write_history(text_path, count, seed)}
+
+    start = time.perf_counter()
+    records = list(import_records([text_path], workers=1))
+    results['parse'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results['archive_size'] = write_archive(archive_path, records)
+    results['write'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    archive = HandArchive(archive_path)
+    store = archive.to_action_store()
+    results['open'] = time.perf_counter() - start
+    start = time.perf_counter()
+    compute_stats(store)
+    results['stats'] = time.perf_counter() - start
+    del store
+    archive.close()
+    return results
+
+
+def main(argv=None):
+    """ Command line entry point of the archive benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Measure the size and the load time of a hand archive.")
+    parser.add_argument('-n', '--hands', type=int, default=100000, help="number of generated hands")
+    parser.add_argument('-s', '--seed', type=int, default=0, help="seed of the hand generator")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run_benchmark(args.hands, directory, args.seed)
+    print("text: {0:.1f} MB, parsed in {1:.2f} s".format(results['text_size'] / 1e6, results['parse']))
+    print("archive: {0:.1f} MB ({1:.0%} of the text), written in {2:.2f} s".format(
+        results['archive_size'] / 1e6, results['archive_size'] / results['text_size'], results['write']))
+    print("archive opened as an ActionStore in {0:.2f} ms, statistics computed in {1:.2f} s".format(
+        results['open'] * 1000, results['stats']))
+
+
+if __name__ == '__main__':
+    main()
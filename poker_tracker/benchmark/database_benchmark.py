@@ -0,0 +1,47 @@
+import argparse
+import os
+import tempfile
+import time
+
+from poker_tracker.data_base.hand_store import HandStore
+from poker_tracker.poker_parser.fast_parser import FastPokerStarsParser
+from poker_tracker.poker_parser.hand_generator import HandGenerator
+from poker_tracker.poker_parser.hand_reader import parse_hand_text
+
+
+def generate_records(count, times=1, seed=0):
+    """ Build hand records of generated hands, the copies get new hand ids.
+
+        Args:
+            count (int): The number of generated hands.
+            times (int): The number of copies of the generated hands.
+            seed (int): The seed of the hand generator.
+
+        Returns:
+            A list of times * count hand records.
+    """
+    records = [parse_hand_text(text, FastPokerStarsParser).to_record() for text in HandGenerator(seed).hands(count)]
+    return [(record[0] * times + copy,) + record[1:] for copy in range(times) for record in records]
+
+
+def main(argv=None):
+    """ Command line entry point of the database benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Measure the time to write hands in the database.")
+    parser.add_argument('-n', '--hands', type=int, default=20000, help="number of generated hands")
+    parser.add_argument('-t', '--times', type=int, default=5, help="number of copies of the generated hands")
+    parser.add_argument('-s', '--seed', type=int, default=0, help="seed of the hand generator")
+    args = parser.parse_args(argv)
+
+    records = generate_records(args.hands, args.times, args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        with HandStore(os.path.join(directory, 'benchmark.db')) as store:
+            start = time.perf_counter()
+            with store.bulk_load():
+                store.insert_records(records)
+            duration = time.perf_counter() - start
+    print("{0} hands written in {1:.2f} s ({2:.0f} hands/s)".format(len(records), duration, len(records) / duration))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+import argparse
+import time
+
+import numpy as np
+
+from poker_tracker.evaluator.hand_evaluator import tables, evaluate_batch
+
+
+def main(argv=None):
+    """ Command line entry point of the evaluator benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Measure the speed of the batch hand evaluator.")
+    parser.add_argument('-n', '--hands', type=int, default=1000000, help="number of random hands")
+    parser.add_argument('-c', '--cards', type=int, default=7, help="number of cards of each hand")
+    parser.add_argument('-s', '--seed', type=int, default=0, help="seed of the random hands")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    tables()
+    print("tables built in {0:.2f} s".format(time.perf_counter() - start))
+    generator = np.random.default_rng(args.seed)
+    codes = np.argsort(generator.random((args.hands, 52)), axis=1)[:, :args.cards].astype(np.int8)
+    start = time.perf_counter()
+    evaluate_batch(codes)
+    duration = time.perf_counter() - start
+    print("{0} hands of {1} cards evaluated in {2:.2f} s ({3:.0f} hands/s)".format(
+        args.hands, args.cards, duration, args.hands / duration))
+
+
+if __name__ == '__main__':
+    main()
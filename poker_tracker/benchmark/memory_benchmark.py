@@ -0,0 +1,116 @@
+import argparse
+import gc
+import tracemalloc
+
+from poker_tracker.data.hand import Hand
+from poker_tracker.poker_parser.fast_parser import FastPokerStarsParser
+from poker_tracker.poker_parser.hand_generator import HandGenerator
+from poker_tracker.poker_parser.hand_reader import parse_hand_text
+
+
+class DictObject:
+    """ An object storing its attributes in a __dict__, as the data classes did before __slots__.
+
+        Args:
+            source (object): The object whose slots are copied.
+    """
+    def __init__(self, source):
+        for name in source.__slots__:
+            setattr(self, name, getattr(source, name))
+
+
+class DictCard(DictObject):
+    pass
+
+
+class DictAction(DictObject):
+    pass
+
+
+class DictSeatInfo(DictObject):
+    def __init__(self, source):
+        super().__init__(source)
+        self.cards = to_dict_cards(source.cards)
+
+
+class DictHand(DictObject):
+    def __init__(self, source):
+        super().__init__(source)
+        self.seats = {position: DictSeatInfo(seat) for position, seat in source.seats.items()}
+        self.pseudo_seats = dict(source.pseudo_seats)
+        self.board_flop = to_dict_cards(source.board_flop)
+        self.board_turn = to_dict_cards(source.board_turn)
+        self.board_river = to_dict_cards(source.board_river)
+        self.action_preflop = [DictAction(action) for action in source.action_preflop]
+        self.action_flop = [DictAction(action) for action in source.action_flop]
+        self.action_turn = [DictAction(action) for action in source.action_turn]
+        self.action_river = [DictAction(action) for action in source.action_river]
+
+
+def to_dict_cards(cards):
+    """ Copy the shared cards into one DictCard per card, as each hand had its own cards.
+    """
+    if cards is None:
+        return None
+    return [DictCard(card) for card in cards]
+
+
+def measure(records, make_hand):
+    """ Measure the memory used by the hands of records.
+
+        Args:
+            records (list): Hand records, see Hand.to_record.
+            make_hand (callable): Create the hand object of a record.
+
+        Returns:
+            The number of bytes allocated per hand.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        hands = [make_hand(record) for record in records]
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    del hands
+    return size / max(len(records), 1)
+
+
+def run_benchmark(count, seed=0):
+    """ Measure the memory of the generated hands with and without __slots__.
+
+        The strings and numbers are shared with the records in both cases,
+        so only the memory of the objects, lists and dicts is measured.
+
+        Args:
+            count (int): The number of generated hands.
+            seed (int): The seed of the hand generator.
+
+        Returns:
+            A dict of the bytes per hand referenced by 'dict' and 'slots'.
+    """
+    records = [parse_hand_text(text, FastPokerStarsParser).to_record() for text in HandGenerator(seed).hands(count)]
+    return {
+        'dict': measure(records, lambda record: DictHand(Hand.from_record(record))),
+        'slots': measure(records, Hand.from_record),
+    }
+
+
+def main(argv=None):
+    """ Command line entry point of the memory benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Measure the memory used by the parsed hands.")
+    parser.add_argument('-n', '--hands', type=int, default=10000, help="number of generated hands")
+    parser.add_argument('-s', '--seed', type=int, default=0, help="seed of the hand generator")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.hands, args.seed)
+    print("{0} hands".format(args.hands))
+    print("dict  {0:>8.0f} bytes/hand".format(results['dict']))
+    print("slots {0:>8.0f} bytes/hand ({1:.0f} %)".format(results['slots'], results['slots'] / results['dict'] * 100))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+import argparse
+import json
+import sys
+import time
+
+from poker_tracker.poker_parser.pokerstars_parser import PokerStarsParser
+from poker_tracker.poker_parser.fast_parser import FastPokerStarsParser
+from poker_tracker.poker_parser.hand_generator import HandGenerator
+from poker_tracker.poker_parser.hand_reader import iter_raw_hands, decode_hand
+
+# Methods of PokerStarsParser called by parse_hand and load, in this order
+STAGES = ['parse_part', 'parse_header', 'parse_setup', 'parse_posts', 'parse_preflop', 'parse_flop', 'parse_turn',
+          'parse_river', 'parse_showdown', 'parse_collected', 'conclude_hand', 'load']
+PARSERS = {'pokerstars': PokerStarsParser, 'fast': FastPokerStarsParser}
+TOLERANCE = 0.2  # Slow down accepted before a result is a regression
+
+
+def generate_hands(count, seed=0):
+    """ Generate the hands of the benchmark, see HandGenerator.
+
+        Returns:
+            A list of hands in PokerStars format.
+    """
+    return list(HandGenerator(seed).hands(count))
+
+
+def read_history(path):
+    """ Read the hands of a hand history file.
+
+        Returns:
+            A list of hands in PokerStars format.
+    """
+    return [decode_hand(raw_hand) for _, raw_hand in iter_raw_hands(path)]
+
+
+def measure_throughput(hands, parser_class, repeat=3):
+    """ Measure the time to parse and load hands.
+
+        Args:
+            hands (list): The hands in PokerStars format.
+            parser_class (type): The parser to measure.
+            repeat (int): The number of measures, the fastest one is kept.
+
+        Returns:
+            A dict with the time in seconds, the hands/s and the bytes/s.
+    """
+    size = sum(len(hand.encode('utf-8')) for hand in hands)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for hand in hands:
+            parser = parser_class(hand)
+            parser.parse_hand()
+            parser.load()
+        best = min(best, time.perf_counter() - start)
+    best = max(best, 1e-9)
+    return {'seconds': best, 'hands_per_second': len(hands) / best, 'bytes_per_second': size / best}
+
+
+def measure_stages(hands, parser_class=PokerStarsParser):
+    """ Measure the time spent in each stage of the parser.
+
+        The stages are called one by one as parse_hand and load do, so the
+        parser must not override them in a single pass (FastPokerStarsParser).
+
+        Args:
+            hands (list): The hands in PokerStars format.
+            parser_class (type): The parser to measure.
+
+        Returns:
+            A dict of the total time in seconds referenced by the stage name.
+    """
+    timer = time.perf_counter
+    stages = dict.fromkeys(STAGES, 0.0)
+    for hand in hands:
+        parser = parser_class(hand)
+        for stage in STAGES:
+            method = getattr(parser, stage)
+            start = timer()
+            method()
+            stages[stage] += timer() - start
+    return stages
+
+
+def run_benchmark(hands, repeat=3):
+    """ Run all the measures on hands.
+
+        Args:
+            hands (list): The hands in PokerStars format.
+            repeat (int): The number of throughput measures of each parser.
+
+        Returns:
+            A dict with the number of hands and bytes, the throughput of each
+            parser and the time of each stage of PokerStarsParser.
+    """
+    return {
+        'hands': len(hands),
+        'bytes': sum(len(hand.encode('utf-8')) for hand in hands),
+        'parsers': {name: measure_throughput(hands, parser_class, repeat)
+                    for name, parser_class in PARSERS.items()},
+        'stages': measure_stages(hands),
+    }
+
+
+def find_regressions(results, baseline, tolerance=TOLERANCE):
+    """ Compare results with the results of a previous run.
+
+        Args:
+            results (dict): The results of run_benchmark.
+            baseline (dict): The results of a previous run.
+            tolerance (float): The relative slow down accepted, lower than 1.
+
+        Returns:
+            The list of the regressions messages, empty if there is none.
+    """
+    regressions = []
+    for name, measure in results['parsers'].items():
+        if name not in baseline.get('parsers', {}):
+            continue
+        expected = baseline['parsers'][name]['hands_per_second']
+        if measure['hands_per_second'] < expected * (1 - tolerance):
+            regressions.append("{0}: {1:.0f} hands/s instead of {2:.0f}".format(
+                name, measure['hands_per_second'], expected))
+    for stage, seconds in results['stages'].items():
+        expected = baseline.get('stages', {}).get(stage)
+        if expected is None:
+            continue
+        # compare the time per hand, the runs may not have the same number of hands
+        per_hand = seconds / results['hands']
+        expected_per_hand = expected / baseline['hands']
+        if per_hand > expected_per_hand / (1 - tolerance):
+            regressions.append("{0}: {1:.1f} us/hand instead of {2:.1f}".format(
+                stage, per_hand * 1e6, expected_per_hand * 1e6))
+    return regressions
+
+
+def format_results(results):
+    """ Return the report of a run as text.
+    """
+    lines = ["{0} hands, {1:.1f} MB".format(results['hands'], results['bytes'] / 1e6), ""]
+    for name, measure in results['parsers'].items():
+        lines.append("{0:<12} {1:>10.0f} hands/s {2:>8.2f} MB/s".format(
+            name, measure['hands_per_second'], measure['bytes_per_second'] / 1e6))
+    lines.append("")
+    total = sum(results['stages'].values()) or 1e-9
+    for stage, seconds in results['stages'].items():
+        lines.append("{0:<16} {1:>8.1f} us/hand {2:>6.1f} %".format(
+            stage, seconds / max(results['hands'], 1) * 1e6, seconds / total * 100))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """ Command line entry point of the benchmark.
+
+        Returns:
+            The exit code, 1 if a regression is found.
+    """
+    parser = argparse.ArgumentParser(description="Measure the speed of the hand history parsers.")
+    parser.add_argument('-n', '--hands', type=int, default=10000, help="number of generated hands")
+    parser.add_argument('-s', '--seed', type=int, default=0, help="seed of the hand generator")
+    parser.add_argument('-f', '--file', help="benchmark the hands of this file instead of generated hands")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="number of measures of each parser")
+    parser.add_argument('--save', help="write the results in this JSON file")
+    parser.add_argument('--baseline', help="compare the results with this JSON file")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help="relative slow down accepted")
+    args = parser.parse_args(argv)
+
+    hands = read_history(args.file) if args.file else generate_hands(args.hands, args.seed)
+    results = run_benchmark(hands, args.repeat)
+    print(format_results(results))
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = find_regressions(results, json.load(file), args.tolerance)
+        if regressions:
+            print("\nRegressions:\n" + "\n".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
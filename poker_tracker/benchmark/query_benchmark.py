@@ -0,0 +1,150 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from poker_tracker.analysis.player_stats import COUNTERS
+from poker_tracker.data_base.hand_store import HandStore
+from poker_tracker.data_base.queries import HandQueries, QUERIES
+
+STAKES = (0.02, 0.05, 0.1, 0.25, 0.5, 1.0)  # Big blinds of the synthetic hands
+SEATS = 6                                   # Players of a synthetic hand
+HANDS_BY_DAY = 5000                         # Synthetic hands played each day
+
+
+def fill_synthetic(store, hands, players):
+    """ Write synthetic hands, generated by SQLite, in a HandStore.
+
+        Only the columns read by the queries are realistic: a hand has SEATS
+        players picked at random, a stake and a date. The rows are generated
+        by recursive queries instead of the hand generator so that millions
+        of hands are written in seconds.
+
+        Args:
+            store (HandStore): The store, it must be empty.
+            hands (int): The number of hands.
+            players (int): The number of players.
+    """
+    database = store.database
+    stakes = " UNION ALL ".join("SELECT {0}, {1}".format(index, stake) for index, stake in enumerate(STAKES))
+    with store.bulk_load(), database.transaction():
+        database.execute("""
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+            INSERT INTO t_player SELECT i, 'player' || i FROM n""", (players,))
+        database.execute("""
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?),
+                 stakes(k, big_blind) AS ({0})
+            INSERT INTO t_hand(d_id, d_game_id, d_hero_id, d_date, d_hour, d_dealer_id, d_small_blind,
+                               d_big_blind, d_ante, d_players_number)
+            SELECT i, i / 100, NULL, replace(date('2020-01-01', '+' || (i / ?) || ' days'), '-', '/'),
+                   '12:00:00', NULL, big_blind / 2, big_blind, 0, ?
+            FROM n JOIN stakes ON k = i % ?""".format(stakes), (hands, HANDS_BY_DAY, SEATS, len(STAKES)))
+        # the flags come from a hash of the seat, a random() of a subquery would be drawn again at each use
+        database.execute("""
+            WITH RECURSIVE seats(k) AS (SELECT 0 UNION ALL SELECT k + 1 FROM seats WHERE k < ? - 1),
+                 rows(d_id, d_big_blind, d_date, k, draw) AS (
+                     SELECT d_id, d_big_blind, d_date, k, (d_id * 2654435761 + k * 40503) % 1000003 % 20
+                     FROM t_hand, seats)
+            INSERT INTO t_seat(d_hand_id, d_position, d_seat, d_player_id, d_stack, d_blind, d_collected,
+                               d_big_blind, d_date, d_vpip, d_pfr)
+            SELECT d_id, k, k, abs(random()) % ? + 1, 100 * d_big_blind, 0, 0, d_big_blind, d_date, draw < 5,
+                   draw < 3
+            FROM rows ORDER BY d_id, k""", (SEATS, players))
+        # only the hands, vpip and pfr counters are filled
+        database.execute("""
+            INSERT INTO t_player_stats
+            SELECT d_player_id, d_position, COUNT(*), SUM(d_vpip), SUM(d_pfr){0}
+            FROM t_seat GROUP BY d_player_id, d_position""".format(", 0" * (len(COUNTERS) - 3)))
+    database.execute("ANALYZE")
+
+
+def full_scans(queries):
+    """ Return the steps of the query plans that read a whole table.
+
+        Args:
+            queries (HandQueries): The queries.
+
+        Returns:
+            A list of (query name, plan step) tuples, empty if every table is
+            read through an index.
+    """
+    return [(name, step) for name in QUERIES for step in queries.explain(name) if step.startswith('SCAN')]
+
+
+def measure(function, arguments, repeat=1):
+    """ Measure the latency of calls of a function.
+
+        Returns:
+            A float64 array of the durations of the calls in milliseconds.
+    """
+    durations = []
+    for argument in arguments:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function(*argument)
+        durations.append((time.perf_counter() - start) * 1000 / repeat)
+    return np.array(durations)
+
+
+def run_benchmark(queries, players, lookups=1000, seed=0):
+    """ Measure the latency of the HUD and of the hand lookups.
+
+        Args:
+            queries (HandQueries): The queries of a store filled by fill_synthetic.
+            players (int): The number of players of the store.
+            lookups (int): The number of lookups of each query.
+            seed (int): The seed of the random lookups.
+
+        Returns:
+            A dict of the latencies in milliseconds referenced by query name.
+    """
+    rng = random.Random(seed)
+    hands = queries.database.execute("SELECT MAX(d_id) FROM t_hand").fetchone()[0] or 1
+    tables = [(['player{0}'.format(rng.randint(1, players)) for _ in range(SEATS)], rng.choice(STAKES))
+              for _ in range(lookups)]
+    hand_ids = [(rng.randint(1, hands),) for _ in range(lookups)]
+    return {
+        'player_stats': measure(queries.player_stats, [(pseudos[0],) for pseudos, _ in tables]),
+        'players_stats': measure(queries.players_stats, tables),
+        'player_hands': measure(queries.player_hands, [(pseudos[0], stake) for pseudos, stake in tables]),
+        'hand': measure(queries.hand, hand_ids),
+        'hand_seats': measure(queries.hand_seats, hand_ids),
+    }
+
+
+def main(argv=None):
+    """ Command line entry point of the query benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Measure the latency of the HUD queries on synthetic hands.")
+    parser.add_argument('-n', '--hands', type=int, default=1000000, help="number of synthetic hands")
+    parser.add_argument('-p', '--players', type=int, default=50000, help="number of players")
+    parser.add_argument('-l', '--lookups', type=int, default=1000, help="number of lookups of each query")
+    parser.add_argument('-d', '--database', default=None,
+                        help="database file, filled if it does not exist (default: a temporary file)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.database or os.path.join(directory, 'benchmark.db')
+        exists = os.path.exists(path)
+        store = HandStore(path)
+        if not exists:
+            start = time.perf_counter()
+            fill_synthetic(store, args.hands, args.players)
+            print("{0} hands written in {1:.2f} s".format(args.hands, time.perf_counter() - start))
+        queries = HandQueries(store.database)
+        for name in QUERIES:
+            print("{0}: {1}".format(name, " | ".join(queries.explain(name))))
+        scans = full_scans(queries)
+        if scans:
+            print("full scans: {0}".format(scans))
+        for name, durations in run_benchmark(queries, args.players, args.lookups).items():
+            print("{0:<14} p50 {1:.3f} ms  p99 {2:.3f} ms  max {3:.3f} ms".format(
+                name, np.percentile(durations, 50), np.percentile(durations, 99), durations.max()))
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import time
+
+import numpy as np
+
+from poker_tracker.analysis.action_store import ActionStore
+from poker_tracker.analysis.player_stats import compute_stats
+from poker_tracker.analysis.pot_engine import replay
+from poker_tracker.poker_parser.fast_parser import FastPokerStarsParser
+from poker_tracker.poker_parser.hand_generator import HandGenerator
+from poker_tracker.poker_parser.hand_reader import parse_hand_text
+
+
+def generate_store(count, seed=0):
+    """ Build an ActionStore of generated hands.
+    """
+    return ActionStore.from_records(parse_hand_text(text, FastPokerStarsParser).to_record()
+                                    for text in HandGenerator(seed).hands(count))
+
+
+def tile_store(store, times):
+    """ Repeat the hands of a store to build a bigger store quickly.
+
+        Args:
+            store (ActionStore): The hands to repeat.
+            times (int): The number of copies.
+
+        Returns:
+            An ActionStore with times * len(store) hands and the same players.
+    """
+    tiled = ActionStore()
+    tiled.players = store.players
+    tiled.player_codes = store.player_codes
+    shift = np.arange(times, dtype=np.int64) * len(store)  # hand index of the first hand of each copy
+    for name in ActionStore.hand_columns + ActionStore.action_columns + ActionStore.seat_columns:
+        column = getattr(store, name)
+        value = np.concatenate([column] * times)
+        if name in ('action_hand', 'seat_hand'):
+            value = value + np.repeat(shift, len(column)).astype(value.dtype)
+        setattr(tiled, name, value)
+    return tiled
+
+
+def main(argv=None):
+    """ Command line entry point of the statistics benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Measure the time to compute the statistics of all the players.")
+    parser.add_argument('-n', '--hands', type=int, default=20000, help="number of generated hands")
+    parser.add_argument('-t', '--times', type=int, default=1, help="number of copies of the generated hands")
+    parser.add_argument('-s', '--seed', type=int, default=0, help="seed of the hand generator")
+    args = parser.parse_args(argv)
+
+    store = tile_store(generate_store(args.hands, args.seed), args.times)
+    start = time.perf_counter()
+    stats = compute_stats(store)
+    duration = time.perf_counter() - start
+    print("{0} hands, {1} actions, {2} players: statistics computed in {3:.2f} s".format(
+        len(store), len(store.action_hand), len(stats.players), duration))
+    start = time.perf_counter()
+    replay(store)
+    print("pots and stacks replayed in {0:.2f} s".format(time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
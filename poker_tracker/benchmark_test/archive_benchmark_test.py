@@ -0,0 +1,7 @@
+from poker_tracker.benchmark.archive_benchmark import run_benchmark
+
+
+def test_run_benchmark(tmp_path):
+    results = run_benchmark(50, str(tmp_path))
+    assert 0 < results['archive_size'] < results['text_size']
+    assert results['open'] >= 0 and results['stats'] >= 0
@@ -0,0 +1,7 @@
+from poker_tracker.benchmark.memory_benchmark import run_benchmark
+
+
+def test_run_benchmark():
+    results = run_benchmark(50)
+
+    assert 0 < results['slots'] < results['dict']
@@ -0,0 +1,40 @@
+import json
+
+from poker_tracker.benchmark.parser_benchmark import STAGES, generate_hands, run_benchmark, find_regressions, main
+from poker_tracker.poker_parser.pokerstars_parser import PokerStarsParser
+
+
+def test_run_benchmark():
+    hands = generate_hands(20)
+    results = run_benchmark(hands, repeat=1)
+
+    assert results['hands'] == 20
+    assert results['bytes'] == sum(len(hand.encode('utf-8')) for hand in hands)
+    assert set(results['parsers']) == {'pokerstars', 'fast'}
+    assert list(results['stages']) == STAGES
+    assert find_regressions(results, results) == []
+
+    slower = json.loads(json.dumps(results))
+    slower['parsers']['fast']['hands_per_second'] *= 2
+    slower['stages']['parse_setup'] /= 2
+    assert len(find_regressions(results, slower)) == 2
+
+
+def test_stages_parse_the_hand():
+    for hand in generate_hands(20):
+        parser = PokerStarsParser(hand)
+        for stage in STAGES[:-1]:
+            getattr(parser, stage)()
+        expected = PokerStarsParser(hand)
+        expected.parse_hand()
+
+        assert parser.blinds == expected.blinds
+        assert parser.ante == expected.ante
+        assert parser.load().to_record() == expected.load().to_record()
+
+
+def test_main(tmp_path, capsys):
+    path = str(tmp_path / "results.json")
+    assert main(['-n', '10', '-r', '1', '--save', path]) == 0
+    assert "hands/s" in capsys.readouterr().out
+    assert main(['-n', '10', '-r', '1', '--baseline', path, '--tolerance', '0.99']) == 0
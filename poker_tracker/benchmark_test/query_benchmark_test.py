@@ -0,0 +1,17 @@
+from poker_tracker.benchmark.query_benchmark import fill_synthetic, full_scans, run_benchmark
+from poker_tracker.data_base.hand_store import HandStore
+from poker_tracker.data_base.queries import HandQueries
+
+
+def test_run_benchmark():
+    store = HandStore(":memory:")
+    fill_synthetic(store, 500, 20)
+    assert len(store) == 500
+    queries = HandQueries(store.database)
+    assert full_scans(queries) == []
+    results = run_benchmark(queries, 20, lookups=5)
+    assert all(len(durations) == 5 for durations in results.values())
+    stats = queries.players_stats(['player1', 'player2'], 0.02)
+    assert 0 <= stats['player1']['pfr'] <= stats['player1']['vpip'] <= 1
+    assert queries.player_stats('player1')['hands'] == store.database.execute(
+        "SELECT COUNT(*) FROM t_seat WHERE d_player_id = 1").fetchone()[0]
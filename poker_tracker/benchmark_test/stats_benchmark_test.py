@@ -0,0 +1,14 @@
+from poker_tracker.analysis.player_stats import compute_stats
+from poker_tracker.benchmark.stats_benchmark import generate_store, tile_store
+
+
+def test_tile_store():
+    store = generate_store(20)
+    tiled = tile_store(store, 3)
+
+    assert len(tiled) == 60
+    assert tiled.action_hand[-1] == 59
+    stats = compute_stats(store)
+    tiled_stats = compute_stats(tiled)
+    for counter, counts in stats.counts.items():
+        assert (tiled_stats.counts[counter] == 3 * counts).all()
@@ -32,6 +32,8 @@ class Action:
                 player.
             amount (int): The amount of chips involved with the action.
     """
+    __slots__ = ('action_type', 'amount', 'position')
+
     def __init__(self, position="", action_type=ActionType.UNDEFINED, amount=0):
         self.action_type = action_type
         self.amount = amount
@@ -30,6 +30,10 @@ class Value(Enum):
     ACE = 13
 
 
+VALUE_CHARS = "23456789TJQKA"  # PokerStars character of each value, in the order of the Value enum
+COLOR_CHARS = "hcsd"           # PokerStars character of each color, in the order of the Color enum
+
+
 class Card:
     """ This class set the basic structure of a card in poker.
     
@@ -39,24 +43,86 @@ class Card:
         UNDEFINED}. The color is set with one of the following :
         {HEARTS, CLUBS, SPADES, DIAMONDS, UNDEFINED}
 
+        The cards are shared instances : Card(value, color) always returns
+        the same object for the same value and color, so the cards are
+        compared and hashed by identity and must not be modified. Each card
+        also has an integer code from 0 to 51 (rank * 4 + suit) for the
+        computations on many cards.
+
         Args:
             value (Value): the value of the card
             color (Color): the color of the card
         
         Returns:
             value (Value): the value of the card
-            color (Color): the color of the card    
+            color (Color): the color of the card
+            rank (int): the value from 0 (TWO) to 12 (ACE), -1 if undefined
+            suit (int): the color from 0 (HEARTS) to 3 (DIAMONDS), -1 if undefined
+            code (int): rank * 4 + suit, -1 if the value or the color is undefined
+            mask (int): 1 << code, 0 if the card is undefined
     """
-    def __init__(self, value=Value.UNDEFINED, color=Color.UNDEFINED):
-        self.value = value
-        self.color = color
+    __slots__ = ('value', 'color', 'rank', 'suit', 'code', 'mask')
+    _cards = {}  # key: (value, color) | value: Card
 
-    def __eq__(self, other):
-        if self.value == other.value and self.color == other.color:
-            return True
+    def __new__(cls, value=Value.UNDEFINED, color=Color.UNDEFINED):
+        return cls._cards[value, color]
+
+    @classmethod
+    def _create(cls, value, color):
+        card = object.__new__(cls)
+        card.value = value
+        card.color = color
+        if value is Value.UNDEFINED or color is Color.UNDEFINED:
+            card.rank = card.suit = card.code = -1
+            card.mask = 0
         else:
-            return False
+            card.rank = value.value - 1
+            card.suit = color.value - 1
+            card.code = card.rank * 4 + card.suit
+            card.mask = 1 << card.code
+        cls._cards[value, color] = card
+
+    @staticmethod
+    def from_code(code):
+        """ Return the card of a code, see Card.code.
+        """
+        return CARDS[code] if code >= 0 else UNDEFINED_CARD
+
+    @staticmethod
+    def from_text(text):
+        """ Return the card of a PokerStars text such as "Ah".
+
+            An unknown character gives an UNDEFINED value or color.
+        """
+        card = TEXT_CARDS.get(text)
+        if card is None:
+            value = VALUE_CHARS.find(text[0:1]) + 1 if text[0:1] else 0
+            color = COLOR_CHARS.find(text[1:2]) + 1 if text[1:2] else 0
+            card = Card(Value(value), Color(color))
+        return card
+
+    def __reduce__(self):
+        return Card, (self.value, self.color)
 
     def __str__(self):
         printed = '<' + self.value.__str__() + '>' + '<' + self.color.__str__() + '>'
         return printed
+
+
+for _value in Value:
+    for _color in Color:
+        Card._create(_value, _color)
+del _value, _color
+
+CARDS = [Card(Value(code // 4 + 1), Color(code % 4 + 1)) for code in range(52)]  # The cards ordered by code
+UNDEFINED_CARD = Card()
+TEXT_CARDS = {VALUE_CHARS[card.rank] + COLOR_CHARS[card.suit]: card for card in CARDS}  # key: PokerStars text
+
+
+def cards_mask(cards):
+    """ Return the bitmask of a list of cards, see Card.mask.
+    """
+    mask = 0
+    for card in cards:
+        mask |= card.mask
+    return mask
@@ -1,3 +1,9 @@
+from poker_tracker.data.action import Action, ActionType
+from poker_tracker.data.card import Card
+
+RECORD_VERSION = 4  # Version of the format of Hand.to_record, changed with each new format
+
+
 class SeatInfo:
     """ This class contains the main info of the current seat.
         
@@ -6,6 +12,7 @@ class SeatInfo:
         - The Player Stack
         - The Player Cards
     """
+    __slots__ = ('player', 'stack', 'cards')
 
     def __init__(self, player=None, stack=0, cards=None):
         self.player = player
@@ -25,12 +32,14 @@ class Hand:
             game_id (int): The game_id is a reference to the game where the
                 hand was played.
             hero (string): The pseudo of the main player in the hand.
-            date (string): The month/day/year when the hand was played.
+            date (string): The year/month/day when the hand was played.
             hour (string): The time when the hand was played XX:XX:XX
             dealer (string): The position of the dealer
             small_blind(float): The small blind value.
             big_blind (float): The big blind value.
             ante (float): The ante value.
+            blinds (dict): associate the position of each player posting a
+                blind with the amount posted.
             pseudo_seats (dict): associate each player's pseudo with a seat
             seats (dict): associate each seat with a player's pseudo
             board_flop (list): list of the cards (use of the class Card) at 
@@ -55,7 +64,16 @@ class Hand:
                 the river part of the hand.
                 The first action in the list is the first action that happened
                 in the game.
+            collected (dict): associate the position of each player winning
+                a pot with the amount won.
+
+        The hands, seats and actions store their attributes in __slots__
+        instead of a __dict__ to hold millions of hands in memory.
     """
+    __slots__ = ('id', 'game_id', 'hero', 'date', 'hour', 'dealer', 'small_blind', 'big_blind', 'ante', 'blinds',
+                 'pseudo_seats', 'seats', 'board_flop', 'board_turn', 'board_river',
+                 'action_preflop', 'action_flop', 'action_turn', 'action_river', 'collected')
+
     def __init__(self):
         # Class Reference
         self.id = 0
@@ -69,6 +87,7 @@ class Hand:
         self.small_blind = 0
         self.big_blind = 0
         self.ante = 0
+        self.blinds = {}
         # TODO: check if dict of named tuple is possible here
         self.pseudo_seats = {}
         self.seats = {}
@@ -80,7 +99,87 @@ class Hand:
         self.action_flop = []
         self.action_turn = []
         self.action_river = []
+        # Result
+        self.collected = {}
+
+    def to_record(self):
+        """ Convert the hand into a compact tuple of numbers and strings.
+
+            The record is much smaller to pickle or serialize than the Hand
+            object, it is used to send hands between processes and to store
+            them.
+
+            Returns:
+                A tuple that can be converted back with Hand.from_record
+        """
+        return (
+            self.id, self.game_id, self.hero, self.date, self.hour, self.dealer,
+            self.small_blind, self.big_blind, self.ante,
+            tuple((position, seat.player, seat.stack, cards_to_record(seat.cards))
+                  for position, seat in self.seats.items()),
+            cards_to_record(self.board_flop), cards_to_record(self.board_turn), cards_to_record(self.board_river),
+            actions_to_record(self.action_preflop), actions_to_record(self.action_flop),
+            actions_to_record(self.action_turn), actions_to_record(self.action_river),
+            tuple(self.collected.items()), tuple(self.blinds.items()),
+        )
+
+    @classmethod
+    def from_record(cls, record):
+        """ Create a hand from a record made by Hand.to_record
+
+            Args:
+                record (tuple): The compact representation of the hand
+
+            Returns:
+                A Hand object
+        """
+        hand = cls()
+        (hand.id, hand.game_id, hand.hero, hand.date, hand.hour, hand.dealer,
+         hand.small_blind, hand.big_blind, hand.ante, seats,
+         board_flop, board_turn, board_river,
+         action_preflop, action_flop, action_turn, action_river, collected, blinds) = record
+        for position, player, stack, cards in seats:
+            hand.seats[position] = SeatInfo(player, stack, cards_from_record(cards))
+            hand.pseudo_seats[player] = position
+        hand.board_flop = cards_from_record(board_flop)
+        hand.board_turn = cards_from_record(board_turn)
+        hand.board_river = cards_from_record(board_river)
+        hand.action_preflop = actions_from_record(action_preflop)
+        hand.action_flop = actions_from_record(action_flop)
+        hand.action_turn = actions_from_record(action_turn)
+        hand.action_river = actions_from_record(action_river)
+        hand.collected = dict(collected)
+        hand.blinds = dict(blinds)
+        return hand
 
     def __str__(self):
         printed = '<' + "Hand Id : " + str(self.id) + '>'
         return printed
+
+
+def cards_to_record(cards):
+    """ Convert a list of cards into a tuple of card codes, see Card.code.
+    """
+    if cards is None:
+        return None
+    return tuple(card.code for card in cards)
+
+
+def cards_from_record(record):
+    """ Convert a tuple made by cards_to_record into a list of cards.
+    """
+    if record is None:
+        return None
+    return [Card.from_code(code) for code in record]
+
+
+def actions_to_record(actions):
+    """ Convert a list of actions into a tuple of (position, action type, amount).
+    """
+    return tuple((action.position, action.action_type.value, action.amount) for action in actions)
+
+
+def actions_from_record(record):
+    """ Convert a tuple made by actions_to_record into a list of actions.
+    """
+    return [Action(position, ActionType(action_type), amount) for position, action_type, amount in record]
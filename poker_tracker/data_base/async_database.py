@@ -0,0 +1,268 @@
+import logging
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+from poker_tracker.data_base.connection import Database, DEFAULT_PATH
+
+READERS = 2  # Default number of threads running the read queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCancelled(Exception):
+    """ Raised by the future of a query interrupted while it was running.
+    """
+
+
+class Job:
+    """ A function waiting to run on a database thread.
+
+        Attributes:
+            future (Future): The future receiving the result of the function.
+            function (callable): The function, called with the Database of the
+                thread and the arguments.
+            args (tuple): The other arguments of the function.
+            key: The jobs with the same key replace each other, None if the
+                job is never replaced.
+            database (Database): The database of the thread running the job,
+                None while the job is waiting.
+            cancelled (bool): Whether the job has been interrupted while running.
+    """
+    __slots__ = ('future', 'function', 'args', 'key', 'database', 'cancelled')
+
+    def __init__(self, function, args, key=None):
+        self.future = Future()
+        self.function = function
+        self.args = args
+        self.key = key
+        self.database = None
+        self.cancelled = False
+
+
+class AsyncDatabase:
+    """ Database access from threads that must not wait for SQLite, such as the UI thread.
+
+        The queries run on dedicated threads and return futures
+        (concurrent.futures.Future) at once. The writes run on one writer
+        thread, in the order they are submitted, the reads on a pool of
+        reader threads. Each thread has its own connection, with WAL
+        journaling the readers are not blocked by an import running on the
+        writer.
+
+        A query that is not needed any more is cancelled with cancel. A
+        waiting query is dropped, a running one is interrupted and its
+        future raises QueryCancelled. A query submitted with a key replaces
+        the previous query with the same key, for example the rows of a view
+        being scrolled.
+
+        If a thread cannot open the database, its waiting queries fail with
+        the error of the open and submit raises RuntimeError.
+
+        Args:
+            path (string): The path of the database file. With ":memory:" the
+                queries run on the writer thread only, since each connection
+                has its own database in memory.
+            readers (int): The number of reader threads, 0 to run the reads on
+                the writer thread.
+            options: The other arguments of Database.
+
+        Attributes:
+            path (string): The path of the database file.
+    """
+    def __init__(self, path=DEFAULT_PATH, readers=READERS, **options):
+        self.path = path
+        if path == ':memory:':
+            readers = 0
+        self._options = options
+        self._lock = threading.Lock()
+        self._keys = {}  # key: job key | value: last Job submitted with this key
+        self._jobs = {}  # key: Future of a job not done yet | value: Job
+        self._error = None  # The error of a thread that could not open the database
+        self._write_queue = queue.Queue()
+        self._read_queue = queue.Queue() if readers > 0 else self._write_queue
+        self._threads = [threading.Thread(target=self._work, args=(self._write_queue,), daemon=True,
+                                          name="database-writer")]
+        self._threads.extend(threading.Thread(target=self._work, args=(self._read_queue,), daemon=True,
+                                              name="database-reader-{0}".format(index)) for index in range(readers))
+        self._closed = False
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, function, *args, write=False, key=None):
+        """ Run a function on a database thread.
+
+            Args:
+                function (callable): The function, called with the Database of
+                    the thread followed by args. It must not keep the Database.
+                args: The other arguments of the function.
+                write (bool): Run the function on the writer thread. The writes
+                    run one at a time in the order they are submitted.
+                key: The previous job submitted with the same key is cancelled,
+                    None to keep it.
+
+            Returns:
+                A Future of the value returned by the function.
+
+            Raises:
+                RuntimeError: The database is closed or a database thread
+                    could not open the database.
+        """
+        if self._closed:
+            raise RuntimeError("The database is closed")
+        job = Job(function, args, key)
+        previous = None
+        with self._lock:
+            if self._error is not None:
+                raise RuntimeError("The database {0} could not be opened".format(self.path)) from self._error
+            self._jobs[job.future] = job
+            if key is not None:
+                previous = self._keys.get(key)
+                self._keys[key] = job
+            # put under the lock, so a thread failing to open the database fails this job too, see _fail
+            (self._write_queue if write else self._read_queue).put(job)
+        job.future.add_done_callback(self._forget)
+        if previous is not None:
+            self._cancel_job(previous)
+        return job.future
+
+    def query(self, sql, parameters=(), key=None):
+        """ Run a read query.
+
+            Returns:
+                A Future of the list of the rows.
+        """
+        return self.submit(lambda database: database.execute(sql, parameters).fetchall(), key=key)
+
+    def execute(self, sql, parameters=()):
+        """ Run a write statement in a transaction.
+
+            Returns:
+                A Future of the number of modified rows.
+        """
+        def execute(database):
+            with database.transaction():
+                return database.execute(sql, parameters).rowcount
+        return self.submit(execute, write=True)
+
+    def cancel(self, future):
+        """ Cancel a query.
+
+            Args:
+                future (Future): The future returned when the query was submitted.
+
+            Returns:
+                False if the query was already done, True otherwise.
+        """
+        with self._lock:
+            job = self._jobs.get(future)
+        if job is None:
+            return False
+        return self._cancel_job(job)
+
+    def _forget(self, future):
+        with self._lock:
+            job = self._jobs.pop(future, None)
+            if job is not None and job.key is not None and self._keys.get(job.key) is job:
+                del self._keys[job.key]
+
+    def _cancel_job(self, job):
+        if job.future.cancel():
+            return True
+        with self._lock:
+            if job.future.done():
+                return False
+            job.cancelled = True
+            if job.database is not None:
+                # interrupt is the only connection method that can be called from another thread
+                job.database.connection.interrupt()
+        return True
+
+    def _work(self, jobs):
+        """ Run the jobs of a queue until a None job is read.
+        """
+        try:
+            database = Database(self.path, **self._options)
+        except Exception as error:
+            logger.warning("The database thread of %s could not open the database", self.path, exc_info=True)
+            self._fail(jobs, error)
+            return
+        try:
+            while True:
+                job = jobs.get()
+                if job is None:
+                    break
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                with self._lock:
+                    job.database = database
+                try:
+                    result = job.function(database, *job.args)
+                except Exception as error:
+                    with self._lock:
+                        job.database = None
+                    if job.cancelled and isinstance(error, sqlite3.OperationalError):
+                        job.future.set_exception(QueryCancelled())
+                    else:
+                        job.future.set_exception(error)
+                else:
+                    with self._lock:
+                        job.database = None
+                    if job.cancelled:
+                        job.future.set_exception(QueryCancelled())
+                    else:
+                        job.future.set_result(result)
+        except Exception:
+            logger.warning("The database thread of %s stopped", self.path, exc_info=True)
+        finally:
+            database.close()
+
+    def _fail(self, jobs, error):
+        """ Fail the jobs of a queue with the error of a thread that could not open the database.
+        """
+        with self._lock:
+            self._error = error
+        stops = 0
+        while True:
+            try:
+                job = jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                stops += 1
+            elif job.future.set_running_or_notify_cancel():
+                job.future.set_exception(error)
+        # the other threads of the queue still need their stop
+        for _ in range(stops - 1):
+            jobs.put(None)
+
+    def close(self, wait=True):
+        """ Stop the database threads, the waiting queries are cancelled.
+
+            Args:
+                wait (bool): Wait for the running queries to finish.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for jobs in {id(self._write_queue): self._write_queue, id(self._read_queue): self._read_queue}.values():
+            while True:
+                try:
+                    job = jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job is not None:
+                    job.future.cancel()
+        self._write_queue.put(None)
+        for _ in self._threads[1:]:
+            self._read_queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
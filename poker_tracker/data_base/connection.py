@@ -0,0 +1,179 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+DEFAULT_PATH = 'db_tracker.db'  # Default database file, in the working directory
+SYNCHRONOUS = 'NORMAL'          # With WAL, a commit is not synced until the next checkpoint
+CACHE_SIZE = -64000             # Page cache, a negative value is in KiB (64 MiB)
+MMAP_SIZE = 256 << 20           # Bytes of the database file read through a memory map
+BUSY_TIMEOUT = 30.0             # Seconds waited for a lock held by another connection
+
+
+class Database:
+    """ A long-lived connection to the SQLite database.
+
+        The connection is opened once with WAL journaling and the tuned
+        pragmas, so the statements do not pay for an open and a sync each.
+        The writes are grouped in transactions with the transaction context
+        manager, the nested transactions are savepoints.
+
+        A connection must only be used by the thread that opened it, see
+        get_database to share one connection per thread.
+
+        Args:
+            path (string): The path of the database file, ":memory:" for a
+                database in memory.
+            synchronous (string): The synchronous pragma, OFF, NORMAL or FULL.
+            cache_size (int): The cache_size pragma, in pages or in KiB if negative.
+            mmap_size (int): The mmap_size pragma in bytes, 0 to disable it.
+            timeout (float): The seconds waited for a lock.
+
+        Attributes:
+            path (string): The path of the database file.
+            connection (sqlite3.Connection): The connection, in autocommit
+                mode outside of the transactions.
+    """
+    def __init__(self, path=DEFAULT_PATH, synchronous=SYNCHRONOUS, cache_size=CACHE_SIZE, mmap_size=MMAP_SIZE,
+                 timeout=BUSY_TIMEOUT):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._depth = 0  # number of nested transactions
+        if path != ':memory:':
+            self.pragma('journal_mode', 'WAL')
+        self.pragma('synchronous', synchronous)
+        self.pragma('cache_size', int(cache_size))
+        self.pragma('mmap_size', int(mmap_size))
+        self.pragma('temp_store', 'MEMORY')
+        self.pragma('foreign_keys', 'ON')
+
+    def pragma(self, name, value=None):
+        """ Read or set a pragma.
+
+            Args:
+                name (string): The name of the pragma, such as "synchronous".
+                value: The new value, the pragma is only read if None.
+
+            Returns:
+                The value of the pragma.
+        """
+        if value is not None:
+            self.connection.execute("PRAGMA {0} = {1}".format(name, value))
+        row = self.connection.execute("PRAGMA {0}".format(name)).fetchone()
+        return row[0] if row is not None else None
+
+    @contextmanager
+    def transaction(self, immediate=True):
+        """ Run statements in a transaction, committed at the end of the block.
+
+            The transaction is rolled back if the block raises an exception.
+            A transaction opened in another one is a savepoint, so only its
+            statements are rolled back.
+
+            Args:
+                immediate (bool): Take the write lock at the beginning of the
+                    transaction instead of the first write.
+
+            Returns:
+                A context manager giving the connection.
+        """
+        if self._depth:
+            savepoint = "s{0}".format(self._depth)
+            self.connection.execute("SAVEPOINT " + savepoint)
+            self._depth += 1
+            try:
+                yield self.connection
+            except BaseException:
+                self.connection.execute("ROLLBACK TO " + savepoint)
+                self.connection.execute("RELEASE " + savepoint)
+                raise
+            else:
+                self.connection.execute("RELEASE " + savepoint)
+            finally:
+                self._depth -= 1
+            return
+
+        self.connection.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        self._depth = 1
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        else:
+            self.connection.execute("COMMIT")
+        finally:
+            self._depth = 0
+
+    def in_transaction(self):
+        """ Return True if a transaction is open.
+        """
+        return self.connection.in_transaction
+
+    def execute(self, sql, parameters=()):
+        """ Execute a statement, see sqlite3.Connection.execute.
+        """
+        return self.connection.execute(sql, parameters)
+
+    def executemany(self, sql, rows):
+        """ Execute a statement for each row, in one transaction if none is open.
+        """
+        if self._depth:
+            return self.connection.executemany(sql, rows)
+        with self.transaction():
+            return self.connection.executemany(sql, rows)
+
+    def executescript(self, script):
+        """ Execute several statements, see sqlite3.Connection.executescript.
+        """
+        return self.connection.executescript(script)
+
+    def checkpoint(self):
+        """ Copy the WAL file into the database file and truncate it.
+        """
+        self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        """ Close the connection, the open transaction is rolled back.
+        """
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+_databases = {}  # key: (process id, thread id, path) | value: Database
+_databases_lock = threading.Lock()
+
+
+def get_database(path=None, **options):
+    """ Return the shared connection of the current thread to a database.
+
+        The connection is opened on first use and kept open, a process
+        created by fork opens its own connection.
+
+        Args:
+            path (string): The path of the database file, DEFAULT_PATH if None.
+            options: The other arguments of Database, only used when the
+                connection is opened.
+
+        Returns:
+            A Database
+    """
+    key = (os.getpid(), threading.get_ident(), os.path.abspath(path or DEFAULT_PATH))
+    with _databases_lock:
+        database = _databases.get(key)
+        if database is None:
+            database = _databases[key] = Database(path or DEFAULT_PATH, **options)
+    return database
+
+
+def close_databases():
+    """ Close the shared connections opened by the current thread of the current process.
+    """
+    with _databases_lock:
+        for key in [key for key in _databases if key[:2] == (os.getpid(), threading.get_ident())]:
+            _databases.pop(key).close()
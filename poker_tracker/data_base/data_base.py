@@ -1,133 +1,130 @@
+import logging
 import sqlite3
-from data.game import Game
 
+from poker_tracker.data.game import Game
+from poker_tracker.data_base.connection import get_database
 
-def create_table_game():
+logger = logging.getLogger(__name__)
+
+
+def create_table_game(database=None):
     """
     Create a table game in the database
+    :param database: type class Database, the shared connection to db_tracker.db if None
     :return: nothing
     """
+    database = database or get_database()
     try:
-        conn = sqlite3.connect('db_tracker.db')
-        cursor = conn.cursor()
-        cursor.execute("""CREATE TABLE IF NOT EXISTS t_game(
-             d_id INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE,
-             d_date TEXT,
-             d_buyIn INTEGER,
-             d_rake INTEGER,
-             d_prizePool INTEGER,
-             d_nbPlayer INTEGER,
-             d_format TEXT,
-             d_position INTEGER,
-             d_earnings INTEGER
-        )
-        """)
-        conn.commit()
-    except sqlite3.OperationalError:
-        print('Erreur la table existe déjà')
-    except Exception as e:
-        print("Erreur")
-        conn.rollback()
-        # raise e
-    finally:
-        conn.close()
-
-
-def insert_game_to_table_game(game):
+        with database.transaction():
+            database.execute("""CREATE TABLE IF NOT EXISTS t_game(
+                 d_id INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE,
+                 d_date TEXT,
+                 d_buyIn INTEGER,
+                 d_rake INTEGER,
+                 d_prizePool INTEGER,
+                 d_nbPlayer INTEGER,
+                 d_format TEXT,
+                 d_position INTEGER,
+                 d_earnings INTEGER
+            )
+            """)
+    except sqlite3.Error:
+        logger.warning("Unable to create the table t_game", exc_info=True)
+
+
+def insert_game_to_table_game(game, database=None):
     """
     insert a game in the game table
     :param game: type class game
+    :param database: type class Database, the shared connection to db_tracker.db if None
     :return:
     """
+    insert_games_to_table_game([game], database)
+
+
+def insert_games_to_table_game(games, database=None):
+    """
+    insert several games in the game table in one transaction
+    :param games: list of type class game
+    :param database: type class Database, the shared connection to db_tracker.db if None
+    :return:
+    """
+    database = database or get_database()
     try:
-        conn = sqlite3.connect('db_tracker.db')
-        cursor = conn.cursor()
-        cursor.execute("""INSERT INTO t_game(d_date, d_buyIn, d_rake, d_prizePool, d_nbPlayer, d_format, d_position, d_earnings) VALUES(?,?,?,?,?,?,?,?)""",
-                       (game.date,
-                        game.buy_in,
-                        game.rake,
-                        game.prizePool,
-                        game.nbPlayer,
-                        game.gameFormat,
-                        game.position,
-                        game.earning))
-        conn.commit()
-    except sqlite3.OperationalError:
-        print('Erreur fail to insert')
-    except Exception as e:
-        print("Erreur")
-        conn.rollback()
-        # raise e
-    finally:
-        conn.close()
-
-
-def delete_table_game():
+        database.executemany("""INSERT INTO t_game(d_date, d_buyIn, d_rake, d_prizePool, d_nbPlayer, d_format,
+                                d_position, d_earnings) VALUES(?,?,?,?,?,?,?,?)""",
+                             [(game.date,
+                               game.buy_in,
+                               game.rake,
+                               game.prize_pool,
+                               game.number_of_players,
+                               game.game_format,
+                               game.position,
+                               game.earning) for game in games])
+    except sqlite3.Error:
+        logger.warning("Unable to insert the games in t_game", exc_info=True)
+
+
+def delete_table_game(database=None):
     """
     delete table t_game
+    :param database: type class Database, the shared connection to db_tracker.db if None
     :return:
     """
+    database = database or get_database()
+    try:
+        with database.transaction():
+            database.execute("DROP TABLE t_game")
+    except sqlite3.Error:
+        logger.warning("Unable to delete the table t_game", exc_info=True)
+
+
+def read_table_game(database=None):
+    """
+    read the rows of the game table
+    :param database: type class Database, the shared connection to db_tracker.db if None
+    :return: list of (d_id, d_date, d_buyIn, d_rake, d_prizePool, d_nbPlayer, d_format, d_position, d_earnings)
+    """
+    database = database or get_database()
     try:
-        conn = sqlite3.connect('db_tracker.db')
-        cursor = conn.cursor()
-        cursor.execute("""
-        DROP TABLE t_game
-        """)
-        conn.commit()
-    except sqlite3.OperationalError:
-        print('Erreur delete impossible')
-    except Exception as e:
-        print("Erreur")
-        conn.rollback()
-        # raise e
-    finally:
-        conn.close()
-
-
-def print_table_game():
+        return database.execute("""
+        SELECT d_id, d_date, d_buyIn, d_rake, d_prizePool, d_nbPlayer, d_format, d_position, d_earnings
+        FROM t_game""").fetchall()
+    except sqlite3.Error:
+        logger.warning("Unable to read the table t_game", exc_info=True)
+        return []
+
+
+def print_table_game(database=None):
     """
     affiche la table game id and date
+    :param database: type class Database, the shared connection to db_tracker.db if None
     :return: nothing
     """
-    try:
-        conn = sqlite3.connect('db_tracker.db')
-        cursor = conn.cursor()
-        cursor.execute("""
-        SELECT d_id, d_date, d_buyIn, d_rake, d_prizePool, d_nbPlayer, d_format, d_position, d_earnings FROM t_game""")
-        rows = cursor.fetchall()
-        for row in rows:
-            print('{0} : {1} - {2} - {3} - {4} - {5} - {6} - {7} - {8}'.format(row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8]))
-    except sqlite3.OperationalError:
-        print('Erreur print impossible')
-    except Exception as e:
-        print("Erreur")
-        # raise e
-
-
-create_table_game()
-
-game_test = Game()
-game_test.date = "08/07/2019 22:50:25"
-game_test.buy_in = 23
-game_test.rake = 2
-game_test.prizePool = 50
-game_test.nbPlayer = 3
-game_test.gameFormat = "Hold'em No Limit"
-game_test.position = 1
-game_test.earning = 50
-
-insert_game_to_table_game(game_test)
-
-game_test.date = "08/07/2019 23:53:25"
-game_test.buy_in = 23
-game_test.rake = 2
-game_test.prizePool = 50
-game_test.nbPlayer = 3
-game_test.gameFormat = "Hold'em No Limit"
-game_test.position = 2
-game_test.earning = 0
-
-insert_game_to_table_game(game_test)
-
-print_table_game()
-delete_table_game()
+    for row in read_table_game(database):
+        print('{0} : {1} - {2} - {3} - {4} - {5} - {6} - {7} - {8}'.format(*row))
+
+
+if __name__ == '__main__':
+    create_table_game()
+
+    game_test = Game()
+    game_test.date = "08/07/2019 22:50:25"
+    game_test.buy_in = 23
+    game_test.rake = 2
+    game_test.prize_pool = 50
+    game_test.number_of_players = 3
+    game_test.game_format = "Hold'em No Limit"
+    game_test.position = 1
+    game_test.earning = 50
+
+    insert_game_to_table_game(game_test)
+
+    game_test.date = "08/07/2019 23:53:25"
+    game_test.position = 2
+    game_test.earning = 0
+
+    insert_game_to_table_game(game_test)
+
+    print_table_game()
+    delete_table_game()
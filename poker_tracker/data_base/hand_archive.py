@@ -0,0 +1,354 @@
+import mmap
+import os
+import shutil
+import tempfile
+from array import array
+
+import numpy as np
+
+from poker_tracker.analysis.action_store import ActionStore, POSITIONS, POSITION_CODES, hand_datetime
+
+MAGIC = b'PTHA'      # First bytes of an archive file
+ARCHIVE_VERSION = 1  # Version of the format, an archive of another version cannot be read
+
+# Fixed width records of the sections, the fields are ordered so that the alignment adds little padding
+HEADER_DTYPE = np.dtype([('magic', 'S4'), ('version', '<u4'), ('hands', '<i8'), ('seats', '<i8'),
+                         ('actions', '<i8'), ('players', '<i8'), ('hands_offset', '<i8'), ('seats_offset', '<i8'),
+                         ('actions_offset', '<i8'), ('names_offset', '<i8'), ('index_offset', '<i8')])
+HAND_DTYPE = np.dtype([('hand_id', '<i8'), ('game_id', '<i8'), ('date', '<M8[s]'), ('small_blind', '<f8'),
+                       ('big_blind', '<f8'), ('ante', '<f8'), ('seat_offset', '<i8'), ('action_offset', '<i8'),
+                       ('hero', '<i4'), ('dealer', '<i4'), ('board', 'i1', (5,)), ('players_number', 'i1')],
+                      align=True)
+SEAT_DTYPE = np.dtype([('stack', '<f8'), ('collected', '<f8'), ('blind', '<f8'), ('hand', '<i4'), ('player', '<i4'),
+                       ('position', 'i1'), ('cards', 'i1', (2,)), ('no_cards', 'i1')], align=True)
+ACTION_DTYPE = np.dtype([('amount', '<f8'), ('hand', '<i4'), ('player', '<i4'), ('street', 'i1'),
+                         ('position', 'i1'), ('type', 'i1')], align=True)
+ALIGNMENT = 8        # The sections start at a multiple of this number of bytes
+BATCH_SIZE = 10000   # Number of records converted to arrays at once by write_archive
+
+
+def padding(size):
+    """ Return the number of bytes added after size bytes to reach the alignment.
+    """
+    return -size % ALIGNMENT
+
+
+class HandArchiveWriter:
+    """ A streaming writer of a binary hand archive, see HandArchive.
+
+        The hand records are written as soon as they are added, the seat and
+        action records go to temporary files appended to the archive by
+        close, so the memory used does not depend on the number of hands.
+        Only the pseudos and the hand ids are kept until the end, for the
+        player table and the id index.
+
+        Args:
+            path (string): The path of the archive file, it is overwritten.
+
+        Attributes:
+            path (string): The path of the archive file.
+            players (list): The pseudos of the players, indexed by player code.
+            player_codes (dict): The player code referenced by the pseudo.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.players = []
+        self.player_codes = {}
+        self._file = open(path, 'wb')
+        self._file.write(bytes(HEADER_DTYPE.itemsize + padding(HEADER_DTYPE.itemsize)))
+        self._seats = tempfile.TemporaryFile()
+        self._actions = tempfile.TemporaryFile()
+        self._hand_ids = array('q')
+        self._seats_number = 0
+        self._actions_number = 0
+
+    def player_code(self, pseudo):
+        """ Return the code of a player, a new code is given to an unknown pseudo.
+        """
+        code = self.player_codes.get(pseudo)
+        if code is None:
+            code = self.player_codes[pseudo] = len(self.players)
+            self.players.append(pseudo)
+        return code
+
+    def write_records(self, records):
+        """ Add hands at the end of the archive.
+
+            Args:
+                records (iterable): Hand records, see Hand.to_record.
+        """
+        positions = POSITION_CODES
+        hands = []
+        seats = []
+        actions = []
+        hand_index = len(self._hand_ids)
+        for record in records:
+            (hand_id, game_id, hero, date, hour, dealer, small_blind, big_blind, ante, seats_record,
+             board_flop, board_turn, board_river) = record[:13]
+            board = list(board_flop or ()) + list(board_turn or ()) + list(board_river or ())
+            hands.append((hand_id, game_id or 0, np.datetime64(hand_datetime(date, hour), 's'), small_blind,
+                          big_blind, ante or 0, self._seats_number + len(seats),
+                          self._actions_number + len(actions), self.player_code(hero) if hero else -1,
+                          self.player_code(dealer) if dealer else -1, tuple((board + [-1] * 5)[:5]),
+                          len(seats_record)))
+            self._hand_ids.append(hand_id)
+
+            players = {}
+            collected = dict(record[17])
+            blinds = dict(record[18])
+            for position, player, stack, cards in seats_record:
+                code = players[position] = self.player_code(player)
+                seats.append((stack, collected.get(position, 0), blinds.get(position, 0), hand_index, code,
+                              positions.get(position, -1), tuple((list(cards or ()) + [-1, -1])[:2]),
+                              cards is None))
+            for street, street_actions in enumerate(record[13:17]):
+                for position, action_type, amount in street_actions:
+                    actions.append((amount, hand_index, players.get(position, -1), street,
+                                    positions.get(position, -1), action_type))
+            hand_index += 1
+
+        self._file.write(np.array(hands, HAND_DTYPE).tobytes())
+        self._seats.write(np.array(seats, SEAT_DTYPE).tobytes())
+        self._actions.write(np.array(actions, ACTION_DTYPE).tobytes())
+        self._seats_number += len(seats)
+        self._actions_number += len(actions)
+
+    def write_hands(self, hands):
+        """ Add Hand objects at the end of the archive, see write_records.
+        """
+        self.write_records(hand.to_record() for hand in hands)
+
+    def close(self):
+        """ Write the sections kept aside, the player table, the id index and the header.
+        """
+        if self._file is None:
+            return
+        header = np.zeros(1, HEADER_DTYPE)[0]
+        header['magic'] = MAGIC
+        header['version'] = ARCHIVE_VERSION
+        header['hands'] = len(self._hand_ids)
+        header['seats'] = self._seats_number
+        header['actions'] = self._actions_number
+        header['players'] = len(self.players)
+        header['hands_offset'] = HEADER_DTYPE.itemsize + padding(HEADER_DTYPE.itemsize)
+
+        def start_section():
+            position = self._file.tell()
+            self._file.write(bytes(padding(position)))
+            return position + padding(position)
+
+        for name, stream in [('seats_offset', self._seats), ('actions_offset', self._actions)]:
+            header[name] = start_section()
+            stream.seek(0)
+            shutil.copyfileobj(stream, self._file)
+            stream.close()
+
+        # the player table is the offsets of the pseudos followed by the UTF-8 pseudos
+        header['names_offset'] = start_section()
+        names = [pseudo.encode('utf-8') for pseudo in self.players]
+        offsets = np.zeros(len(names) + 1, '<i8')
+        np.cumsum([len(name) for name in names], out=offsets[1:])
+        self._file.write(offsets.tobytes())
+        self._file.write(b''.join(names))
+
+        # the index is the sorted hand ids followed by the index of each hand
+        header['index_offset'] = start_section()
+        hand_ids = np.frombuffer(self._hand_ids, np.int64) if self._hand_ids else np.zeros(0, np.int64)
+        order = np.argsort(hand_ids, kind='stable')
+        self._file.write(hand_ids[order].astype('<i8').tobytes())
+        self._file.write(order.astype('<i8').tobytes())
+
+        self._file.seek(0)
+        self._file.write(header.tobytes())
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class HandArchive:
+    """ A binary hand archive read through a memory map.
+
+        An archive holds a header, the fixed width records of the hands, of
+        the seats and of the actions (see HAND_DTYPE, SEAT_DTYPE and
+        ACTION_DTYPE), the table of the pseudos and an index of the hand ids.
+        The seats and the actions of a hand are contiguous, the offsets of
+        the first ones are in the hand record. Positions, action types and
+        cards are integer codes, as in ActionStore.
+
+        The record arrays are NumPy views of the mapped file, nothing is
+        copied or parsed when the archive is opened: the pages are read by
+        the system when they are used. to_action_store builds the columns of
+        an ActionStore from these views.
+
+        Args:
+            path (string): The path of the archive file.
+
+        Attributes:
+            path (string): The path of the archive file.
+            hands (ndarray): The HAND_DTYPE records.
+            seats (ndarray): The SEAT_DTYPE records.
+            actions (ndarray): The ACTION_DTYPE records.
+            sorted_ids (ndarray): The hand ids in increasing order.
+            id_order (ndarray): The index of the hand of each sorted id.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = np.frombuffer(self._map, HEADER_DTYPE, 1)[0].copy()  # a view would keep the map open
+        if header['magic'] != MAGIC or header['version'] != ARCHIVE_VERSION:
+            self._map.close()
+            raise ValueError("{0} is not a hand archive of version {1}".format(path, ARCHIVE_VERSION))
+        self.hands = np.frombuffer(self._map, HAND_DTYPE, int(header['hands']), int(header['hands_offset']))
+        self.seats = np.frombuffer(self._map, SEAT_DTYPE, int(header['seats']), int(header['seats_offset']))
+        self.actions = np.frombuffer(self._map, ACTION_DTYPE, int(header['actions']), int(header['actions_offset']))
+        players = int(header['players'])
+        self._name_offsets = np.frombuffer(self._map, '<i8', players + 1, int(header['names_offset']))
+        self._names_start = int(header['names_offset']) + (players + 1) * 8
+        self._players = None
+        index_offset = int(header['index_offset'])
+        self.sorted_ids = np.frombuffer(self._map, '<i8', len(self.hands), index_offset)
+        self.id_order = np.frombuffer(self._map, '<i8', len(self.hands), index_offset + len(self.hands) * 8)
+
+    @property
+    def players(self):
+        """ The pseudos of the players indexed by player code, decoded on first use.
+        """
+        if self._players is None:
+            data = self._map[self._names_start:self._names_start + int(self._name_offsets[-1])]
+            offsets = self._name_offsets.tolist()
+            self._players = [data[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+        return self._players
+
+    def __len__(self):
+        return len(self.hands)
+
+    def find(self, hand_id):
+        """ Return the index of a hand in the archive, -1 if it is missing.
+        """
+        position = int(np.searchsorted(self.sorted_ids, hand_id))
+        if position < len(self.sorted_ids) and self.sorted_ids[position] == hand_id:
+            return int(self.id_order[position])
+        return -1
+
+    def record(self, index):
+        """ Rebuild the record of a hand, see Hand.to_record.
+
+            The hour is written with two digits and the collected amounts and
+            the blinds are in the seats order.
+
+            Args:
+                index (int): The index of the hand in the archive.
+
+            Returns:
+                A hand record.
+        """
+        players = self.players
+        hand = self.hands[index]
+        date = hand['date'].item()
+        seat_offset = int(hand['seat_offset'])
+        action_offset = int(hand['action_offset'])
+        seat_end = self.hands[index + 1]['seat_offset'] if index + 1 < len(self.hands) else len(self.seats)
+        action_end = self.hands[index + 1]['action_offset'] if index + 1 < len(self.hands) else len(self.actions)
+        seats = []
+        collected = []
+        blinds = []
+        for stack, won, blind, _, player, position, cards, no_cards in self.seats[seat_offset:seat_end].tolist():
+            position = POSITIONS[position] if position >= 0 else ""
+            seats.append((position, players[player], stack, None if no_cards else tuple(cards.tolist())))
+            if won:
+                collected.append((position, won))
+            if blind:
+                blinds.append((position, blind))
+        streets = [[], [], [], []]
+        for amount, _, _, street, position, action_type in self.actions[action_offset:action_end].tolist():
+            streets[street].append((POSITIONS[position] if position >= 0 else "", action_type, amount))
+        board = [code for code in hand['board'].tolist() if code >= 0]
+        hero = int(hand['hero'])
+        dealer = int(hand['dealer'])
+        return ((int(hand['hand_id']), int(hand['game_id']), players[hero] if hero >= 0 else "",
+                 date.strftime("%Y/%m/%d") if date else "", date.strftime("%H:%M:%S") if date else "",
+                 players[dealer] if dealer >= 0 else "", float(hand['small_blind']), float(hand['big_blind']),
+                 float(hand['ante']), tuple(seats), tuple(board[:3]), tuple(board[3:4]), tuple(board[4:5]))
+                + tuple(tuple(actions) for actions in streets) + (tuple(collected), tuple(blinds)))
+
+    def records(self):
+        """ Return a generator of the records of all the hands, see record.
+        """
+        return (self.record(index) for index in range(len(self.hands)))
+
+    def to_action_store(self):
+        """ Build an ActionStore of all the hands.
+
+            The columns are views of the mapped records, nothing is copied.
+
+            Returns:
+                An ActionStore
+        """
+        store = ActionStore()
+        store.players = self.players
+        store.player_codes = {pseudo: code for code, pseudo in enumerate(store.players)}
+        hands, seats, actions = self.hands, self.seats, self.actions
+        store.hand_id = hands['hand_id']
+        store.game_id = hands['game_id']
+        store.small_blind = hands['small_blind']
+        store.big_blind = hands['big_blind']
+        store.ante = hands['ante']
+        store.date = hands['date']
+        store.board = hands['board']
+        store.players_number = hands['players_number']
+        store.action_hand = actions['hand']
+        store.action_street = actions['street']
+        store.action_position = actions['position']
+        store.action_player = actions['player']
+        store.action_type = actions['type']
+        store.action_amount = actions['amount']
+        store.seat_hand = seats['hand']
+        store.seat_position = seats['position']
+        store.seat_player = seats['player']
+        store.seat_stack = seats['stack']
+        store.seat_cards = seats['cards']
+        store.seat_collected = seats['collected']
+        store.seat_blind = seats['blind']
+        return store
+
+    def close(self):
+        """ Release the memory map, it stays open while views of the records are used.
+        """
+        self.hands = self.seats = self.actions = self.sorted_ids = self.id_order = self._name_offsets = None
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def write_archive(path, records):
+    """ Write hand records in a new archive.
+
+        Args:
+            path (string): The path of the archive file.
+            records (iterable): Hand records, see Hand.to_record.
+
+        Returns:
+            The size of the archive in bytes.
+    """
+    with HandArchiveWriter(path) as writer:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= BATCH_SIZE:
+                writer.write_records(batch)
+                batch = []
+        writer.write_records(batch)
+    return os.path.getsize(path)
@@ -0,0 +1,680 @@
+import argparse
+import hashlib
+import os
+import struct
+import time
+from contextlib import contextmanager
+from itertools import groupby, islice
+
+import numpy as np
+
+from poker_tracker.analysis.action_store import ActionStore, POSITIONS, POSITION_CODES
+from poker_tracker.analysis.player_stats import COUNTERS, compute_stats
+from poker_tracker.data.action import ActionType
+from poker_tracker.data.hand import Hand
+from poker_tracker.data_base.connection import Database
+from poker_tracker.poker_parser.bulk_import import find_history_files, import_ranges
+from poker_tracker.poker_parser.hand_reader import HAND_START
+from poker_tracker.poker_parser.hand_watcher import is_complete_hand
+
+BATCH_SIZE = 20000     # Number of hands written in one transaction
+HASH_SIZE = 64 << 10   # Bytes hashed at the beginning and at the end of an imported file
+ID_CHUNK = 500         # Hand ids looked up by one query, the lists of ids are padded to this size
+VPIP_TYPES = (ActionType.BET.value, ActionType.RAISE.value, ActionType.CALL.value)
+PFR_TYPES = (ActionType.BET.value, ActionType.RAISE.value)
+# Version of the tables, stored in PRAGMA user_version. The databases written
+# before the version was stored have the version 0, see HandStore.migrate.
+SCHEMA_VERSION = 2
+# An action packed in the action columns of t_hand: position code, action type and amount
+ACTION_STRUCT = struct.Struct('<bbd')
+
+TABLES = """
+CREATE TABLE IF NOT EXISTS t_player(
+     d_id INTEGER PRIMARY KEY,
+     d_pseudo TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS t_hand(
+     d_id INTEGER PRIMARY KEY,
+     d_game_id INTEGER,
+     d_hero_id INTEGER,
+     d_date TEXT,
+     d_hour TEXT,
+     d_dealer_id INTEGER,
+     d_small_blind REAL,
+     d_big_blind REAL,
+     d_ante REAL,
+     d_players_number INTEGER,
+     d_flop1 INTEGER,
+     d_flop2 INTEGER,
+     d_flop3 INTEGER,
+     d_turn INTEGER,
+     d_river INTEGER,
+     d_preflop_actions BLOB,
+     d_flop_actions BLOB,
+     d_turn_actions BLOB,
+     d_river_actions BLOB
+);
+CREATE TABLE IF NOT EXISTS t_seat(
+     d_hand_id INTEGER,
+     d_position INTEGER,
+     d_seat INTEGER,
+     d_player_id INTEGER,
+     d_stack REAL,
+     d_card1 INTEGER,
+     d_card2 INTEGER,
+     d_blind REAL,
+     d_collected REAL,
+     d_big_blind REAL,
+     d_date TEXT,
+     d_vpip INTEGER,
+     d_pfr INTEGER,
+     PRIMARY KEY (d_hand_id, d_position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS t_file(
+     d_path TEXT PRIMARY KEY,
+     d_size INTEGER,
+     d_mtime INTEGER,
+     d_hash TEXT,
+     d_offset INTEGER
+);
+"""
+# The counters of the statistics (see analysis.player_stats.COUNTERS) of each player in each position
+STATS_TABLE = """
+CREATE TABLE IF NOT EXISTS t_player_stats(
+     d_player_id INTEGER,
+     d_position INTEGER,
+     {0},
+     PRIMARY KEY (d_player_id, d_position)
+) WITHOUT ROWID;
+""".format(",\n     ".join("d_{0} INTEGER".format(counter) for counter in COUNTERS))
+STATS_UPSERT = """
+INSERT INTO t_player_stats VALUES ({0})
+ON CONFLICT (d_player_id, d_position) DO UPDATE SET {1}
+""".format(", ".join("?" * (len(COUNTERS) + 2)),
+           ", ".join("d_{0} = d_{0} + excluded.d_{0}".format(counter) for counter in COUNTERS))
+# Columns of t_seat copied from the hand and its preflop actions, added by the version 1
+SEAT_HAND_COLUMNS = (('d_big_blind', 'REAL'), ('d_date', 'TEXT'), ('d_vpip', 'INTEGER'), ('d_pfr', 'INTEGER'))
+# Columns of t_hand holding the board and the packed actions, added by the version 2
+BOARD_COLUMNS = ('d_flop1', 'd_flop2', 'd_flop3', 'd_turn', 'd_river')
+ACTION_COLUMNS = ('d_preflop_actions', 'd_flop_actions', 'd_turn_actions', 'd_river_actions')
+# Columns read by the migration of the tables older than the version 2
+LEGACY_COLUMNS = {
+    't_hand': {'d_id', 'd_big_blind', 'd_date'},
+    't_seat': {'d_hand_id', 'd_position', 'd_seat', 'd_player_id', 'd_stack', 'd_card1', 'd_card2', 'd_blind',
+               'd_collected'},
+    't_action': {'d_hand_id', 'd_street', 'd_order', 'd_position', 'd_type', 'd_amount'},
+    't_board': {'d_hand_id', 'd_flop1', 'd_flop2', 'd_flop3', 'd_turn', 'd_river'},
+}
+# key: index name | value: definition, the indexes are dropped during a bulk load
+INDEXES = {
+    'i_hand_game': "CREATE INDEX IF NOT EXISTS i_hand_game ON t_hand(d_game_id)",
+    'i_hand_date': "CREATE INDEX IF NOT EXISTS i_hand_date ON t_hand(d_date, d_hour)",
+    # covering index of the HUD lookups, see data_base.queries
+    'i_seat_player_stake': "CREATE INDEX IF NOT EXISTS i_seat_player_stake "
+                           "ON t_seat(d_player_id, d_big_blind, d_date, d_vpip, d_pfr)",
+}
+
+
+def file_hash(path, size):
+    """ Hash the first and the last HASH_SIZE bytes of the beginning of a file.
+
+        Args:
+            path (string): The path of the file.
+            size (int): The size of the beginning of the file, the bytes
+                appended after it do not change the hash.
+
+        Returns:
+            The hexadecimal SHA-1 digest.
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as stream:
+        digest.update(stream.read(min(size, HASH_SIZE)))
+        if size > HASH_SIZE:
+            stream.seek(max(HASH_SIZE, size - HASH_SIZE))
+            digest.update(stream.read(size - stream.tell()))
+    return digest.hexdigest()
+
+
+def last_hand_offset(path, end):
+    """ Find the position of the last hand starting before end in a file.
+
+        Args:
+            path (string): The path of the file.
+            end (int): The position where the search starts.
+
+        Returns:
+            The position of the hand, 0 if no hand is found.
+    """
+    with open(path, 'rb') as stream:
+        position = end
+        while position > 0:
+            start = max(0, position - HASH_SIZE)
+            stream.seek(start)
+            # the block overlaps the previous one so that a hand start is not cut
+            data = stream.read(min(end, position + len(HAND_START)) - start)
+            index = data.rfind(HAND_START)
+            if index != -1:
+                return start + index + 1
+            position = start
+    return 0
+
+
+def complete_end(path, size):
+    """ Find the end of the complete hands of a file.
+
+        The client may be writing the last hand of the file, so the last
+        hand is left out until it is complete, see
+        hand_watcher.is_complete_hand.
+
+        Args:
+            path (string): The path of the file.
+            size (int): The size of the file.
+
+        Returns:
+            size if the last hand is complete, else the position of the last hand.
+    """
+    start = last_hand_offset(path, size)
+    with open(path, 'rb') as stream:
+        stream.seek(start)
+        last_hand = stream.read(size - start)
+    return size if is_complete_hand(last_hand) else start
+
+
+def pack_actions(actions):
+    """ Pack the actions of a street in bytes, see ACTION_STRUCT.
+
+        Args:
+            actions (tuple): (position, action type, amount) tuples of a hand record.
+
+        Returns:
+            The actions as bytes.
+    """
+    positions = POSITION_CODES
+    pack = ACTION_STRUCT.pack
+    return b''.join([pack(positions.get(position, -1), action_type, amount)
+                     for position, action_type, amount in actions])
+
+
+def unpack_actions(data):
+    """ Read the actions of a street packed by pack_actions.
+
+        Returns:
+            A tuple of (position, action type, amount) tuples.
+    """
+    if not data:
+        return ()
+    return tuple([(POSITIONS[position], action_type, amount)
+                  for position, action_type, amount in ACTION_STRUCT.iter_unpack(data)])
+
+
+class HandStore:
+    """ The parsed hands stored in normalized SQLite tables.
+
+        A hand is a row of t_hand and its seats are rows of t_seat. The
+        board is stored in columns of t_hand and the actions of each street
+        are packed in a BLOB column of t_hand (see pack_actions), so a hand
+        is written in a few rows. The pseudos are stored once in t_player
+        and referenced by their id. The positions, the action types (see
+        ActionType) and the cards (see Card.code) are stored as integer
+        codes.
+
+        A seat row also holds the big blind and the date of its hand, and
+        whether the player voluntarily put chips in the pot (vpip) and
+        raised (pfr) preflop, so the player lookups only read one index.
+
+        The statistics counters of every player in every position are kept
+        in t_player_stats, they are added in the transaction that writes
+        the hands, so a HUD reads the statistics of a player with one
+        primary key lookup. The table is computed again from the stored
+        hands by rebuild_stats.
+
+        The hands are written from their records (see Hand.to_record) in
+        batches, each batch is one transaction with one executemany by
+        table. A hand already stored is ignored.
+
+        The imported files are recorded in t_file with their size, their
+        modification time, a hash of their beginning and end, and the
+        position of their first incomplete hand (their size if all the hands
+        are complete). A file that has not changed is skipped without being
+        read and a file that has grown is read from this position.
+
+        The version of the tables is stored in PRAGMA user_version, the
+        tables written by an older version are migrated when the database is
+        opened, see migrate.
+
+        Args:
+            database (Database): The database, or the path of the database file.
+
+        Attributes:
+            database (Database): The database.
+            player_ids (dict): The id of the players referenced by the pseudo.
+
+        Raises:
+            ValueError: The tables have been written by a newer version or
+                cannot be migrated.
+    """
+    def __init__(self, database):
+        if isinstance(database, str):
+            database = Database(database)
+        self.database = database
+        version = database.pragma('user_version')
+        if version > SCHEMA_VERSION:
+            raise ValueError("The tables of {0} have the version {1}, only the versions up to {2} can be read".format(
+                database.path, version, SCHEMA_VERSION))
+        tables = {row[0] for row in database.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if 't_hand' in tables and version < SCHEMA_VERSION:
+            self.check_legacy_tables(tables)
+        database.executescript(TABLES + STATS_TABLE)  # executescript commits, it runs outside of a transaction
+        self.player_ids = {pseudo: player_id for player_id, pseudo in database.execute(
+            "SELECT d_id, d_pseudo FROM t_player")}
+        self._loading = False
+        with database.transaction():
+            if 't_hand' in tables and version < SCHEMA_VERSION:
+                self.migrate(version, tables)
+            for definition in INDEXES.values():
+                database.execute(definition)
+            database.pragma('user_version', SCHEMA_VERSION)
+
+    def check_legacy_tables(self, tables):
+        """ Check that tables written before the version was stored can be migrated.
+
+            Raises:
+                ValueError: A table or a column is missing.
+        """
+        for table, columns in LEGACY_COLUMNS.items():
+            missing = columns - {row[1] for row in self.database.execute("PRAGMA table_info({0})".format(table))}
+            if missing:
+                raise ValueError("The tables of {0} cannot be migrated, {1} has no columns {2}".format(
+                    self.database.path, table, ", ".join(sorted(missing))))
+
+    def migrate(self, version, tables):
+        """ Update the tables written by an older version, in the current transaction.
+
+            The version 0 tables may lack the columns of t_seat copied from
+            the hand (see SEAT_HAND_COLUMNS), they are added and filled from
+            t_hand and t_action, the index they replace is dropped. Before
+            the version 2, the actions and the boards were rows of t_action
+            and t_board, they are moved to the columns of t_hand and the
+            tables are dropped. The statistics table is computed from the
+            stored hands if it is missing.
+
+            Args:
+                version (int): The version of the tables, see SCHEMA_VERSION.
+                tables (set): The names of the tables of the database before
+                    the missing ones were created.
+        """
+        database = self.database
+        seat_columns = {row[1] for row in database.execute("PRAGMA table_info(t_seat)")}
+        new_columns = [(column, kind) for column, kind in SEAT_HAND_COLUMNS if column not in seat_columns]
+        if new_columns:
+            for column, kind in new_columns:
+                database.execute("ALTER TABLE t_seat ADD COLUMN {0} {1}".format(column, kind))
+            preflop = "EXISTS (SELECT 1 FROM t_action AS a WHERE a.d_hand_id = t_seat.d_hand_id " \
+                      "AND a.d_street = 0 AND a.d_position = t_seat.d_position AND a.d_type IN ({0}))"
+            database.execute("""
+                UPDATE t_seat SET
+                    d_big_blind = (SELECT h.d_big_blind FROM t_hand AS h WHERE h.d_id = t_seat.d_hand_id),
+                    d_date = (SELECT h.d_date FROM t_hand AS h WHERE h.d_id = t_seat.d_hand_id),
+                    d_vpip = {0},
+                    d_pfr = {1}""".format(preflop.format(", ".join("?" * len(VPIP_TYPES))),
+                                            preflop.format(", ".join("?" * len(PFR_TYPES)))),
+                VPIP_TYPES + PFR_TYPES)
+        database.execute("DROP INDEX IF EXISTS i_seat_player")  # replaced by i_seat_player_stake
+        if version < 2:
+            self.pack_tables()
+        if 't_player_stats' not in tables:
+            self.rebuild_stats()
+
+    def pack_tables(self):
+        """ Move the rows of t_action and t_board of the tables older than the version 2 to t_hand.
+        """
+        database = self.database
+        hand_columns = {row[1] for row in database.execute("PRAGMA table_info(t_hand)")}
+        for column in BOARD_COLUMNS:
+            if column not in hand_columns:
+                database.execute("ALTER TABLE t_hand ADD COLUMN {0} INTEGER".format(column))
+        for column in ACTION_COLUMNS:
+            if column not in hand_columns:
+                database.execute("ALTER TABLE t_hand ADD COLUMN {0} BLOB".format(column))
+        database.execute("""
+            UPDATE t_hand SET ({0}) = (SELECT {0} FROM t_board AS b WHERE b.d_hand_id = t_hand.d_id)
+            WHERE d_id IN (SELECT d_hand_id FROM t_board)""".format(", ".join(BOARD_COLUMNS)))
+        rows = []
+        pack = ACTION_STRUCT.pack
+        for hand_id, hand_actions in groupby(database.execute(
+                "SELECT d_hand_id, d_street, d_position, d_type, d_amount FROM t_action "
+                "ORDER BY d_hand_id, d_street, d_order"), key=lambda row: row[0]):
+            streets = [[], [], [], []]
+            for _, street, position, action_type, amount in hand_actions:
+                streets[street].append(pack(position, action_type, amount))
+            rows.append(tuple(b''.join(street) for street in streets) + (hand_id,))
+        database.executemany("UPDATE t_hand SET {0} WHERE d_id = ?".format(
+            ", ".join(column + " = ?" for column in ACTION_COLUMNS)), rows)
+        database.execute("DROP TABLE t_action")
+        database.execute("DROP TABLE t_board")
+
+    def player_id(self, pseudo, new_players):
+        """ Return the id of a player, a new id is given to an unknown pseudo and added to new_players.
+        """
+        player_id = self.player_ids.get(pseudo)
+        if player_id is None:
+            player_id = self.player_ids[pseudo] = len(self.player_ids) + 1
+            new_players.append((player_id, pseudo))
+        return player_id
+
+    def insert_records(self, records, batch_size=BATCH_SIZE):
+        """ Write hands in the tables.
+
+            Args:
+                records (iterable): Hand records, see Hand.to_record.
+                batch_size (int): The number of hands written in one transaction.
+
+            Returns:
+                The number of hands written, the hands already stored are not counted.
+        """
+        count = 0
+        records = iter(records)
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                return count
+            count += self.insert_batch(batch)
+
+    def insert_hands(self, hands, batch_size=BATCH_SIZE):
+        """ Write Hand objects in the tables, see insert_records.
+        """
+        return self.insert_records((hand.to_record() for hand in hands), batch_size)
+
+    def new_records(self, records):
+        """ Remove the hands already stored and the repeated hands from a list of records.
+        """
+        records = list({record[0]: record for record in records}.values())
+        stored = set()
+        query = "SELECT d_id FROM t_hand WHERE d_id IN ({0})".format(", ".join("?" * ID_CHUNK))
+        for start in range(0, len(records), ID_CHUNK):
+            ids = [record[0] for record in records[start:start + ID_CHUNK]]
+            stored.update(row[0] for row in self.database.execute(query, ids + [None] * (ID_CHUNK - len(ids))))
+        return [record for record in records if record[0] not in stored]
+
+    def stats_rows(self, records):
+        """ Compute the rows of t_player_stats to add for hand records.
+
+            The counters are computed by analysis.player_stats.compute_stats,
+            the players must have an id.
+
+            Returns:
+                A list of (player id, position code, counters...) tuples.
+        """
+        stats = compute_stats(ActionStore.from_records(records))
+        counts = np.stack([stats.counts[counter] for counter in COUNTERS], axis=-1)
+        players, positions = np.nonzero(counts.any(axis=-1))
+        return [(self.player_ids[stats.players[player]], int(position)) + tuple(counts[player, position].tolist())
+                for player, position in zip(players.tolist(), positions.tolist())]
+
+    def insert_batch(self, records):
+        """ Write a list of hand records and their statistics in one transaction.
+
+            Returns:
+                The number of hands written.
+        """
+        records = self.new_records(records)
+        if not records:
+            return 0
+        positions = POSITION_CODES
+        player_ids = self.player_ids
+        players = []
+        hands = []
+        seats = []
+        for record in records:
+            (hand_id, game_id, hero, date, hour, dealer, small_blind, big_blind, ante, seats_record,
+             board_flop, board_turn, board_river) = record[:13]
+            board = tuple(board_flop) + tuple(board_turn) + tuple(board_river)
+            hands.append((hand_id, game_id, self.player_id(hero, players) if hero else None, date, hour,
+                          self.player_id(dealer, players) if dealer else None, small_blind, big_blind, ante,
+                          len(seats_record)) + board + (None,) * (5 - len(board))
+                         + tuple([pack_actions(actions) for actions in record[13:17]]))
+            collected = dict(record[17])
+            blinds = dict(record[18])
+            vpip = {position for position, action_type, _ in record[13] if action_type in VPIP_TYPES}
+            pfr = {position for position, action_type, _ in record[13] if action_type in PFR_TYPES}
+            for seat, (position, player, stack, cards) in enumerate(seats_record):
+                card1, card2 = cards if cards else (None, None)
+                seats.append((hand_id, positions.get(position, -1), seat,
+                              player_ids.get(player) or self.player_id(player, players), stack, card1, card2,
+                              blinds.get(position, 0), collected.get(position, 0), big_blind, date,
+                              position in vpip, position in pfr))
+
+        try:
+            stats = self.stats_rows(records)
+            with self.database.transaction() as connection:
+                connection.executemany("INSERT INTO t_player VALUES (?, ?)", players)
+                connection.executemany("INSERT INTO t_hand VALUES ({0})".format(", ".join("?" * 19)), hands)
+                connection.executemany("INSERT INTO t_seat VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", seats)
+                connection.executemany(STATS_UPSERT, stats)
+        except Exception:
+            # the new players are not stored
+            for _, pseudo in players:
+                del self.player_ids[pseudo]
+            raise
+        return len(records)
+
+    def rebuild_stats(self, batch_size=BATCH_SIZE):
+        """ Compute t_player_stats again from the stored hands.
+
+            It must be run when the counters or their definitions change,
+            the table is created again with the current counters.
+
+            Args:
+                batch_size (int): The number of hands read at once.
+        """
+        with self.database.transaction():
+            self.database.execute("DROP TABLE IF EXISTS t_player_stats")
+            self.database.execute(STATS_TABLE)
+            for records in self.read_batches(batch_size):
+                self.database.executemany(STATS_UPSERT, self.stats_rows(records))
+
+    @contextmanager
+    def bulk_load(self):
+        """ Prepare the database for writing many hands.
+
+            The secondary indexes are dropped and built again at the end of
+            the block, which is faster than updating them for each row. The
+            writes are not synced during the load.
+
+            Returns:
+                A context manager giving the HandStore.
+        """
+        if self._loading:
+            yield self
+            return
+        self._loading = True
+        synchronous = self.database.pragma('synchronous')
+        with self.database.transaction():
+            for name in INDEXES:
+                self.database.execute("DROP INDEX IF EXISTS " + name)
+        self.database.pragma('synchronous', 'OFF')
+        try:
+            yield self
+        finally:
+            self.database.pragma('synchronous', synchronous)
+            with self.database.transaction():
+                for definition in INDEXES.values():
+                    self.database.execute(definition)
+            self._loading = False
+
+    def file_ranges(self, paths):
+        """ Find the parts of hand history files that are not imported yet.
+
+            Only the complete hands are read, the offset recorded for a file is
+            the end of its complete hands (see complete_end), and the next
+            import of the file starts there.
+
+            Args:
+                paths (list): Paths of hand history files or directories.
+
+            Returns:
+                (ranges, files) where ranges is the list of the (path, start,
+                end) byte ranges to read and files the list of the t_file rows
+                to write once they are imported.
+        """
+        imported = {row[0]: row[1:] for row in self.database.execute(
+            "SELECT d_path, d_size, d_mtime, d_hash, d_offset FROM t_file")}
+        ranges = []
+        files = []
+        for path in find_history_files(paths):
+            path = os.path.abspath(path)
+            status = os.stat(path)
+            size, mtime = status.st_size, status.st_mtime_ns
+            known = imported.get(path)
+            if known is not None and known[:2] == (size, mtime):
+                continue
+            start = 0
+            if known is not None and size >= known[0] and file_hash(path, known[0]) == known[2]:
+                if size == known[0]:  # only touched
+                    files.append((path, size, mtime, known[2], known[3]))
+                    continue
+                start = known[3]
+            end = complete_end(path, size)
+            if end > start:
+                ranges.append((path, start, end))
+            files.append((path, size, mtime, file_hash(path, size), max(start, end)))
+        return ranges, files
+
+    def bulk_import(self, paths, workers=None, batch_size=BATCH_SIZE):
+        """ Parse the new hands of hand history files on a pool of processes and write them.
+
+            The files already imported are skipped and the files that have
+            grown are read from the end of their complete hands, a hand that
+            is still being written is imported once complete, see file_ranges.
+
+            Args:
+                paths (list): Paths of hand history files or directories.
+                workers (int): The number of worker processes, see
+                    poker_parser.bulk_import.import_records.
+                batch_size (int): The number of hands written in one transaction.
+
+            Returns:
+                The number of hands written.
+        """
+        ranges, files = self.file_ranges(paths)
+        count = 0
+        if ranges:
+            with self.bulk_load():
+                count = self.insert_records(import_ranges(ranges, workers, ordered=False), batch_size)
+        # the files are recorded once all their hands are stored
+        self.database.executemany("INSERT OR REPLACE INTO t_file VALUES (?, ?, ?, ?, ?)", files)
+        return count
+
+    def read_records(self, first_id, last_id):
+        """ Read hands from the tables.
+
+            Args:
+                first_id (int): The smallest id of the hands.
+                last_id (int): The biggest id of the hands.
+
+            Returns:
+                The list of the records (see Hand.to_record) of the hands
+                whose id is between first_id and last_id, in the id order.
+                The collected amounts and the blinds are in the seats order.
+        """
+        execute = self.database.execute
+        bounds = (first_id, last_id)
+        seats = groupby(execute(
+            "SELECT d_hand_id, d_position, d_pseudo, d_stack, d_card1, d_card2, d_blind, d_collected FROM t_seat "
+            "JOIN t_player ON t_player.d_id = d_player_id WHERE d_hand_id BETWEEN ? AND ? "
+            "ORDER BY d_hand_id, d_seat", bounds), key=lambda row: row[0])
+        seats_id, seat_rows = next(seats, (None, ()))
+        records = []
+        for (hand_id, game_id, hero, date, hour, dealer, small_blind, big_blind, ante, *board_actions) in execute(
+                "SELECT t_hand.d_id, d_game_id, hero.d_pseudo, d_date, d_hour, dealer.d_pseudo, d_small_blind, "
+                "d_big_blind, d_ante, {0}, {1} FROM t_hand LEFT JOIN t_player AS hero ON hero.d_id = d_hero_id "
+                "LEFT JOIN t_player AS dealer ON dealer.d_id = d_dealer_id WHERE t_hand.d_id BETWEEN ? AND ? "
+                "ORDER BY t_hand.d_id".format(", ".join(BOARD_COLUMNS), ", ".join(ACTION_COLUMNS)),
+                bounds).fetchall():
+            seats_record = []
+            collected = []
+            blinds = []
+            if seats_id == hand_id:
+                for _, position, pseudo, stack, card1, card2, blind, won in seat_rows:
+                    position = POSITIONS[position]
+                    seats_record.append((position, pseudo, stack, None if card1 is None else (card1, card2)))
+                    if won:
+                        collected.append((position, won))
+                    if blind:
+                        blinds.append((position, blind))
+                seats_id, seat_rows = next(seats, (None, ()))
+            board = [code for code in board_actions[:5] if code is not None]
+            records.append((hand_id, game_id, hero or "", date, hour, dealer or "", small_blind, big_blind, ante,
+                            tuple(seats_record), tuple(board[:3]), tuple(board[3:4]), tuple(board[4:5]))
+                           + tuple([unpack_actions(data) for data in board_actions[5:]])
+                           + (tuple(collected), tuple(blinds)))
+        return records
+
+    def read_batches(self, batch_size=BATCH_SIZE):
+        """ Read all the stored hands by batches.
+
+            Returns:
+                A generator of lists of batch_size hand records, see read_records.
+        """
+        ids = [row[0] for row in self.database.execute("SELECT d_id FROM t_hand ORDER BY d_id")]
+        for start in range(0, len(ids), batch_size):
+            yield self.read_records(ids[start], ids[min(start + batch_size, len(ids)) - 1])
+
+    def load_hand(self, hand_id):
+        """ Read a hand from the tables.
+
+            Args:
+                hand_id (int): The id of the hand.
+
+            Returns:
+                A Hand object, None if the hand is not stored.
+        """
+        records = self.read_records(hand_id, hand_id)
+        return Hand.from_record(records[0]) if records else None
+
+    def __len__(self):
+        return self.database.execute("SELECT COUNT(*) FROM t_hand").fetchone()[0]
+
+    def close(self):
+        """ Close the database.
+        """
+        self.database.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main(argv=None):
+    """ Command line entry point of the import into the database.
+
+        Args:
+            argv (list): The command line arguments, sys.argv if None.
+    """
+    parser = argparse.ArgumentParser(description="Import PokerStars hand history files into the database.")
+    parser.add_argument('paths', nargs='*', help="hand history files or directories")
+    parser.add_argument('-d', '--database', default='db_tracker.db', help="path of the database file")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="number of worker processes (default: number of CPU cores)")
+    parser.add_argument('-b', '--batch-size', type=int, default=BATCH_SIZE,
+                        help="number of hands written in one transaction")
+    parser.add_argument('--rebuild-stats', action='store_true',
+                        help="compute the statistics of the players again from the stored hands")
+    args = parser.parse_args(argv)
+
+    with HandStore(args.database) as store:
+        start = time.perf_counter()
+        count = store.bulk_import(args.paths, args.workers, args.batch_size)
+        duration = time.perf_counter() - start
+        print("{0} hands imported in {1:.2f} s ({2:.0f} hands/s)".format(count, duration,
+                                                                        count / max(duration, 1e-9)))
+        if args.rebuild_stats:
+            start = time.perf_counter()
+            store.rebuild_stats(args.batch_size)
+            print("statistics of {0} hands computed in {1:.2f} s".format(len(store), time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+from poker_tracker.analysis.action_store import POSITION_CODES
+from poker_tracker.analysis.player_stats import COUNTERS, stats_from_counts
+from poker_tracker.data_base.connection import Database
+from poker_tracker.data_base.hand_store import HandStore
+
+MAX_PLAYERS = 10  # Seats of the biggest table, the lists of pseudos are padded to this size
+
+# key: query name | value: SQL statement. The statements are constant strings
+# so that sqlite3 prepares them once and reuses them from its statement cache.
+QUERIES = {
+    # hands, vpip and pfr of up to MAX_PLAYERS pseudos at a big blind between two dates,
+    # read from the covering index i_seat_player_stake
+    'players_stats': """
+        SELECT p.d_pseudo, COUNT(*), SUM(s.d_vpip), SUM(s.d_pfr)
+        FROM t_player AS p JOIN t_seat AS s ON s.d_player_id = p.d_id
+        WHERE p.d_pseudo IN ({0}) AND s.d_big_blind = ? AND s.d_date BETWEEN ? AND ?
+        GROUP BY p.d_pseudo""".format(", ".join("?" * MAX_PLAYERS)),
+    # statistics counters of a player in a position, one row of t_player_stats
+    'player_counters': """
+        SELECT {0}
+        FROM t_player_stats
+        WHERE d_player_id = (SELECT d_id FROM t_player WHERE d_pseudo = ?) AND d_position = ?""".format(
+        ", ".join("d_" + counter for counter in COUNTERS)),
+    # statistics counters of a player in all the positions
+    'player_all_counters': """
+        SELECT {0}
+        FROM t_player_stats
+        WHERE d_player_id = (SELECT d_id FROM t_player WHERE d_pseudo = ?)""".format(
+        ", ".join("SUM(d_{0})".format(counter) for counter in COUNTERS)),
+    # last hands of a player at a big blind
+    'player_hands': """
+        SELECT s.d_hand_id
+        FROM t_player AS p JOIN t_seat AS s ON s.d_player_id = p.d_id
+        WHERE p.d_pseudo = ? AND s.d_big_blind = ?
+        ORDER BY s.d_date DESC
+        LIMIT ?""",
+    # header of a hand
+    'hand': """
+        SELECT d_id, d_game_id, d_date, d_hour, d_small_blind, d_big_blind, d_ante, d_players_number
+        FROM t_hand WHERE d_id = ?""",
+    # seats of a hand
+    'hand_seats': """
+        SELECT s.d_position, p.d_pseudo, s.d_stack, s.d_collected
+        FROM t_seat AS s JOIN t_player AS p ON p.d_id = s.d_player_id
+        WHERE s.d_hand_id = ? ORDER BY s.d_seat""",
+}
+# key: query name | value: example parameters, used to read the query plans
+EXAMPLE_PARAMETERS = {
+    'players_stats': ("",) * MAX_PLAYERS + (0.0, "", "~"),
+    'player_counters': ("", 0),
+    'player_all_counters': ("",),
+    'player_hands': ("", 0.0, 1),
+    'hand': (0,),
+    'hand_seats': (0,),
+}
+
+
+class HandQueries:
+    """ The parameterized queries of the HUD and of the hand player.
+
+        The statistics of a player are read from t_player_stats by its
+        primary key. The lookups of a player at a stake are answered by a
+        range scan of the covering index i_seat_player_stake (player, big
+        blind, date, vpip, pfr), the lookups of a hand by a search of the
+        primary keys, which all start with the hand id. The query plans can
+        be checked with explain.
+
+        Args:
+            database (Database): The database, or the path of the database
+                file. The tables are created if they do not exist.
+
+        Attributes:
+            database (Database): The database.
+    """
+    def __init__(self, database):
+        if isinstance(database, str):
+            database = Database(database)
+        HandStore(database)  # creates the tables and the indexes
+        self.database = database
+
+    def players_stats(self, pseudos, big_blind, since="", until="~"):
+        """ Read the number of hands, the vpip and the pfr of players.
+
+            Args:
+                pseudos (list): The pseudos of the players, the players of
+                    a table for the HUD.
+                big_blind (float): The stake of the hands.
+                since (string): The first date of the hands, as written in
+                    the hand history (YYYY/MM/DD).
+                until (string): The last date of the hands.
+
+            Returns:
+                A dict referenced by pseudo of dicts {'hands', 'vpip', 'pfr'},
+                the vpip and the pfr are ratios. The players without hands
+                are missing.
+        """
+        stats = {}
+        pseudos = list(pseudos)
+        for start in range(0, len(pseudos), MAX_PLAYERS):
+            chunk = pseudos[start:start + MAX_PLAYERS]
+            parameters = tuple(chunk) + (None,) * (MAX_PLAYERS - len(chunk)) + (big_blind, since, until)
+            for pseudo, hands, vpip, pfr in self.database.execute(QUERIES['players_stats'], parameters):
+                stats[pseudo] = {'hands': hands, 'vpip': vpip / hands, 'pfr': pfr / hands}
+        return stats
+
+    def player_stats(self, pseudo, position=None):
+        """ Read the statistics of a player, see analysis.player_stats.STATS.
+
+            Args:
+                pseudo (string): The pseudo of the player.
+                position (string): Only the hands played in this position,
+                    all the positions if None.
+
+            Returns:
+                A dict of the statistics referenced by name, with the number of
+                hands under 'hands', None if the player has no hands.
+        """
+        if position is None:
+            row = self.database.execute(QUERIES['player_all_counters'], (pseudo,)).fetchone()
+        else:
+            row = self.database.execute(QUERIES['player_counters'], (pseudo, POSITION_CODES[position])).fetchone()
+        if row is None or not row[0]:
+            return None
+        return stats_from_counts(dict(zip(COUNTERS, row)))
+
+    def player_hands(self, pseudo, big_blind, limit=100):
+        """ Read the ids of the last hands of a player at a stake.
+
+            Returns:
+                A list of hand ids, the most recent first.
+        """
+        return [row[0] for row in self.database.execute(QUERIES['player_hands'], (pseudo, big_blind, limit))]
+
+    def hand(self, hand_id):
+        """ Read the header of a hand.
+
+            Returns:
+                (id, game_id, date, hour, small_blind, big_blind, ante,
+                players_number), None if the hand is not stored.
+        """
+        return self.database.execute(QUERIES['hand'], (hand_id,)).fetchone()
+
+    def hand_seats(self, hand_id):
+        """ Read the seats of a hand.
+
+            Returns:
+                A list of (position code, pseudo, stack, collected) tuples in the seats order.
+        """
+        return self.database.execute(QUERIES['hand_seats'], (hand_id,)).fetchall()
+
+    def explain(self, name):
+        """ Read the plan of a query.
+
+            Args:
+                name (string): The name of the query, see QUERIES.
+
+            Returns:
+                The list of the plan steps, such as
+                "SEARCH s USING COVERING INDEX i_seat_player_stake (...)".
+        """
+        return [row[-1] for row in self.database.execute("EXPLAIN QUERY PLAN " + QUERIES[name],
+                                                         EXAMPLE_PARAMETERS[name])]
@@ -0,0 +1,102 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from poker_tracker.data_base import async_database
+from poker_tracker.data_base.async_database import AsyncDatabase, QueryCancelled
+
+# a query running until it is interrupted
+ENDLESS_QUERY = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT COUNT(*) FROM n"
+
+
+def wait_running(future):
+    deadline = time.monotonic() + 10
+    while not future.running() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    time.sleep(0.01)  # the statement is started
+
+
+def test_queries(tmp_path):
+    with AsyncDatabase(str(tmp_path / "tracker.db")) as database:
+        database.execute("CREATE TABLE t_test(d_value INTEGER)").result(timeout=10)
+        assert database.execute("INSERT INTO t_test VALUES (?)", (4,)).result(timeout=10) == 1
+        assert database.query("SELECT d_value FROM t_test").result(timeout=10) == [(4,)]
+        future = database.submit(lambda db, table: db.execute("SELECT COUNT(*) FROM " + table).fetchone()[0],
+                                 "t_test")
+        assert future.result(timeout=10) == 1
+        assert threading.current_thread().name not in database.submit(
+            lambda db: threading.current_thread().name).result(timeout=10)
+
+        with pytest.raises(Exception):
+            database.query("SELECT * FROM t_missing").result(timeout=10)
+
+
+def test_reads_during_write(tmp_path):
+    release = threading.Event()
+    with AsyncDatabase(str(tmp_path / "tracker.db")) as database:
+        database.execute("CREATE TABLE t_test(d_value INTEGER)").result(timeout=10)
+
+        def long_write(db):
+            with db.transaction():
+                db.execute("INSERT INTO t_test VALUES (1)")
+                release.wait(10)
+
+        write = database.submit(long_write, write=True)
+        # the reader threads are not blocked by the transaction of the writer
+        assert database.query("SELECT COUNT(*) FROM t_test").result(timeout=10) == [(0,)]
+        release.set()
+        write.result(timeout=10)
+        assert database.query("SELECT COUNT(*) FROM t_test").result(timeout=10) == [(1,)]
+
+
+def test_cancel(tmp_path):
+    with AsyncDatabase(str(tmp_path / "tracker.db"), readers=1) as database:
+        running = database.query(ENDLESS_QUERY)
+        waiting = database.query("SELECT 1")
+        wait_running(running)
+        assert database.cancel(waiting)
+        assert waiting.cancelled()
+        assert database.cancel(running)
+        with pytest.raises(QueryCancelled):
+            running.result(timeout=10)
+        assert database.query("SELECT 2").result(timeout=10) == [(2,)]
+
+
+def test_key_replaces_query():
+    with AsyncDatabase(":memory:") as database:
+        first = database.query(ENDLESS_QUERY, key='rows')
+        wait_running(first)
+        second = database.query("SELECT 1", key='rows')
+        with pytest.raises(QueryCancelled):
+            first.result(timeout=10)
+        assert second.result(timeout=10) == [(1,)]
+        done = database.query("SELECT 2")
+        assert done.result(timeout=10) == [(2,)]
+        assert not database.cancel(done)
+
+
+def test_open_error(tmp_path, monkeypatch):
+    opening = threading.Event()
+
+    def open_database(path, **options):
+        opening.wait(10)
+        raise sqlite3.OperationalError("unable to open database file")
+
+    monkeypatch.setattr(async_database, 'Database', open_database)
+    database = AsyncDatabase(str(tmp_path / "tracker.db"), readers=1)
+    try:
+        # the queries submitted before the open failed get its error
+        waiting = [database.query("SELECT 1"), database.execute("CREATE TABLE t_test(d_value INTEGER)")]
+        opening.set()
+        for future in waiting:
+            with pytest.raises(sqlite3.OperationalError):
+                future.result(timeout=10)
+        with pytest.raises(RuntimeError):
+            database.query("SELECT 1")
+    finally:
+        database.close()
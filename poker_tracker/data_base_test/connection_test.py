@@ -0,0 +1,60 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+
+import threading
+
+import pytest
+
+from poker_tracker.data_base.connection import Database, get_database, close_databases
+
+
+def test_pragmas(tmp_path):
+    with Database(str(tmp_path / "tracker.db"), synchronous='OFF', cache_size=-2000, mmap_size=0) as database:
+        assert database.pragma('journal_mode') == 'wal'
+        assert database.pragma('synchronous') == 0
+        assert database.pragma('cache_size') == -2000
+        assert database.pragma('mmap_size') == 0
+        assert database.pragma('foreign_keys') == 1
+
+
+def test_transaction(tmp_path):
+    path = str(tmp_path / "tracker.db")
+    with Database(path) as database:
+        database.execute("CREATE TABLE t_test(d_value INTEGER)")
+        with database.transaction():
+            database.execute("INSERT INTO t_test VALUES (1)")
+            assert database.in_transaction()
+        assert not database.in_transaction()
+
+        with pytest.raises(ValueError):
+            with database.transaction():
+                database.execute("INSERT INTO t_test VALUES (2)")
+                raise ValueError()
+
+        # a nested transaction only rolls back its statements
+        with database.transaction():
+            database.execute("INSERT INTO t_test VALUES (3)")
+            with pytest.raises(ValueError):
+                with database.transaction():
+                    database.execute("INSERT INTO t_test VALUES (4)")
+                    raise ValueError()
+        database.executemany("INSERT INTO t_test VALUES (?)", [(5,), (6,)])
+
+    # the rows are visible to another connection
+    with Database(path) as database:
+        assert [row[0] for row in database.execute("SELECT d_value FROM t_test ORDER BY d_value")] == [1, 3, 5, 6]
+
+
+def test_shared_database(tmp_path):
+    path = str(tmp_path / "tracker.db")
+    database = get_database(path)
+    assert get_database(path) is database
+    other = []
+    thread = threading.Thread(target=lambda: other.append(get_database(path)))
+    thread.start()
+    thread.join()
+    assert other[0] is not database
+
+    close_databases()
+    assert get_database(path) is not database
+    close_databases()
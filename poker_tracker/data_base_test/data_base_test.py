@@ -0,0 +1,23 @@
+from types import SimpleNamespace
+
+from poker_tracker.data_base.connection import Database
+from poker_tracker.data_base.data_base import create_table_game, insert_game_to_table_game, \
+    insert_games_to_table_game, read_table_game, delete_table_game
+
+
+def test_table_game():
+    database = Database(":memory:")
+    create_table_game(database)
+    # a Game would change the ids expected by game_test
+    game = SimpleNamespace(date="08/07/2019 22:50:25", buy_in=23, rake=2, prize_pool=50, number_of_players=3,
+                           game_format="Hold'em No Limit", position=1, earning=50)
+    insert_game_to_table_game(game, database)
+    insert_games_to_table_game([game, game], database)
+
+    rows = read_table_game(database)
+    assert len(rows) == 3
+    assert rows[0][1:] == ("08/07/2019 22:50:25", 23, 2, 50, 3, "Hold'em No Limit", 1, 50)
+
+    delete_table_game(database)
+    assert read_table_game(database) == []
+    database.close()
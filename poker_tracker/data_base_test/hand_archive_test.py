@@ -0,0 +1,57 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "..", "poker_parser_test", "HandTest.txt")
+
+import numpy as np
+import pytest
+
+from poker_tracker.analysis.action_store import ActionStore
+from poker_tracker.analysis.player_stats import COUNTERS, compute_stats
+from poker_tracker.analysis.pot_engine import replay
+from poker_tracker.benchmark.database_benchmark import generate_records
+from poker_tracker.data_base.hand_archive import HandArchive, write_archive
+from poker_tracker.poker_parser.hand_reader import read_hands
+
+
+def assert_same_record(record, loaded):
+    # the collected amounts and the blinds are read back in the seats order
+    assert loaded[:17] == record[:17]
+    assert dict(loaded[17]) == dict(record[17])
+    assert dict(loaded[18]) == dict(record[18])
+
+
+def test_round_trip(tmp_path):
+    records = [hand.to_record() for hand in read_hands(hand_history_file)] + generate_records(300)
+    path = str(tmp_path / "hands.pta")
+    assert write_archive(path, records) == os.path.getsize(path)
+    with HandArchive(path) as archive:
+        assert len(archive) == len(records)
+        for index, record in enumerate(records):
+            assert_same_record(record, archive.record(index))
+        assert archive.find(records[-1][0]) == len(records) - 1
+        assert archive.find(records[5][0]) == 5
+        assert archive.find(1) == -1
+
+
+def test_action_store(tmp_path):
+    records = generate_records(500)
+    path = str(tmp_path / "hands.pta")
+    write_archive(path, records)
+    expected_store = ActionStore.from_records(records)
+    expected = compute_stats(expected_store)
+    with HandArchive(path) as archive:
+        store = archive.to_action_store()
+        assert len(store) == len(records)
+        stats = compute_stats(store)
+        # the player codes depend on the order in which the pseudos are met
+        for pseudo, code in expected.player_codes.items():
+            other = stats.player_codes[pseudo]
+            for counter in COUNTERS:
+                assert np.array_equal(stats.counts[counter][other], expected.counts[counter][code])
+        assert np.allclose(np.sort(replay(store).seat_net), np.sort(replay(expected_store).seat_net))
+        del store, stats
+
+
+def test_not_an_archive(tmp_path):
+    with pytest.raises(ValueError):
+        HandArchive(hand_history_file)
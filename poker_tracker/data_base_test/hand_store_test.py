@@ -0,0 +1,200 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "..", "poker_parser_test", "HandTest.txt")
+# hands of HandTest.txt and generate_records(40, seed=3) written before the tables had a version
+legacy_database_file = os.path.join(script_dir, "LegacyTracker.db")
+
+import shutil
+
+import numpy as np
+import pytest
+
+from poker_tracker.analysis.action_store import ActionStore
+from poker_tracker.analysis.player_stats import COUNTERS, compute_stats
+from poker_tracker.benchmark.database_benchmark import generate_records
+from poker_tracker.data_base.connection import Database
+from poker_tracker.data_base.hand_store import HandStore, INDEXES, SCHEMA_VERSION, last_hand_offset, main
+from poker_tracker.poker_parser.hand_generator import HandGenerator
+from poker_tracker.poker_parser.hand_reader import iter_raw_hands, read_hands
+
+
+def assert_same_record(record, loaded):
+    # the collected amounts and the blinds are read back in the seats order
+    assert loaded[:17] == record[:17]
+    assert dict(loaded[17]) == dict(record[17])
+    assert dict(loaded[18]) == dict(record[18])
+
+
+def test_round_trip():
+    hands = list(read_hands(hand_history_file))
+    with HandStore(":memory:") as store:
+        assert store.insert_hands(hands, batch_size=4) == len(hands)
+        assert len(store) == len(hands)
+        for hand in hands:
+            assert_same_record(hand.to_record(), store.load_hand(hand.id).to_record())
+        assert store.load_hand(1) is None
+
+
+def test_duplicates(tmp_path):
+    records = generate_records(30, times=2)
+    path = str(tmp_path / "tracker.db")
+    with HandStore(path) as store:
+        store.insert_records(records[:40])
+        store.insert_records(records)
+        assert len(store) == 60
+        seats = store.database.execute("SELECT COUNT(*) FROM t_seat").fetchone()[0]
+        assert seats == sum(len(record[9]) for record in records)
+
+    with HandStore(path) as store:  # the player ids are read back
+        store.insert_records(generate_records(10, seed=1))
+        assert len(store) == 70
+        pseudos = store.database.execute("SELECT COUNT(DISTINCT d_pseudo) FROM t_player").fetchone()[0]
+        assert pseudos == len(store.player_ids)
+        for record in records[::7]:
+            assert_same_record(record, store.load_hand(record[0]).to_record())
+
+
+def test_bulk_load(tmp_path):
+    with HandStore(str(tmp_path / "tracker.db")) as store:
+        synchronous = store.database.pragma('synchronous')
+        with store.bulk_load():
+            assert store.database.pragma('synchronous') == 0
+            store.insert_records(generate_records(20))
+        assert store.database.pragma('synchronous') == synchronous
+        names = {row[0] for row in store.database.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert set(INDEXES) <= names
+
+
+def test_bulk_import(tmp_path):
+    history = tmp_path / "history"
+    history.mkdir()
+    shutil.copy(hand_history_file, str(history / "daily.txt"))
+    shutil.copy(hand_history_file, str(history / "weekly.txt"))  # the same hands in another file
+    with HandStore(str(tmp_path / "tracker.db")) as store:
+        assert store.bulk_import([str(history)], workers=1) == 9
+        assert len(store) == 9
+        # the unchanged files are not read again
+        assert store.file_ranges([str(history)]) == ([], [])
+        assert store.bulk_import([str(history)], workers=1) == 0
+
+        os.utime(str(history / "daily.txt"), ns=(0, 0))
+        ranges, files = store.file_ranges([str(history)])
+        assert ranges == [] and len(files) == 1
+        assert store.bulk_import([str(history)], workers=1) == 0
+        assert store.file_ranges([str(history)]) == ([], [])
+
+
+def test_bulk_import_growing_file(tmp_path):
+    hands = list(HandGenerator(2).hands(30))
+    path = tmp_path / "growing.txt"
+    path.write_text("".join(hands[:20]), encoding='utf-8')
+    with HandStore(str(tmp_path / "tracker.db")) as store:
+        assert store.bulk_import([str(path)], workers=1) == 20
+        size = os.path.getsize(str(path))
+        last_offset = list(iter_raw_hands(str(path)))[-1][0]
+        assert last_hand_offset(str(path), size) == last_offset
+
+        with open(str(path), 'a', encoding='utf-8') as stream:
+            stream.write("".join(hands[20:]))
+        ranges, _ = store.file_ranges([str(path)])
+        assert ranges == [(os.path.abspath(str(path)), size, os.path.getsize(str(path)))]
+        assert store.bulk_import([str(path)], workers=1) == 10
+        assert len(store) == 30
+
+        # a rewritten file is read again from its beginning
+        path.write_text("".join(hands[:25]), encoding='utf-8')
+        ranges, _ = store.file_ranges([str(path)])
+        assert ranges[0][1] == 0
+        assert store.bulk_import([str(path)], workers=1) == 0
+
+
+def test_bulk_import_incomplete_hand(tmp_path):
+    hands = [hand for hand in HandGenerator(4).hands(40) if "*** FLOP ***" in hand][:5]
+    cut = hands[4].index("*** FLOP ***")
+    path = tmp_path / "writing.txt"
+    path.write_text("".join(hands[:4]) + hands[4][:cut], encoding='utf-8')
+    with HandStore(str(tmp_path / "tracker.db")) as store:
+        # the hand being written is left for the next import
+        assert store.bulk_import([str(path)], workers=1) == 4
+        ranges, files = store.file_ranges([str(path)])
+        assert ranges == [] and files == []
+
+        with open(str(path), 'a', encoding='utf-8') as stream:
+            stream.write(hands[4][cut:])
+        ranges, _ = store.file_ranges([str(path)])
+        assert ranges[0][1] == len("".join(hands[:4]).encode('utf-8'))
+        assert store.bulk_import([str(path)], workers=1) == 1
+        hand_id = list(read_hands(str(path)))[4].id
+        assert len(store.load_hand(hand_id).board_flop) == 3
+
+
+def stored_counts(store, players):
+    counts = {counter: np.zeros((len(players), 10), np.int64) for counter in COUNTERS}
+    codes = {pseudo: code for code, pseudo in enumerate(players)}
+    for row in store.database.execute("SELECT p.d_pseudo, s.* FROM t_player_stats AS s "
+                                      "JOIN t_player AS p ON p.d_id = s.d_player_id"):
+        for counter, value in zip(COUNTERS, row[3:]):
+            counts[counter][codes[row[0]], row[2]] = value
+    return counts
+
+
+def test_player_stats(tmp_path):
+    records = generate_records(200, seed=4)
+    expected = compute_stats(ActionStore.from_records(records))
+    path = str(tmp_path / "tracker.db")
+    with HandStore(path) as store:
+        # the hands already stored and the repeated hands are not counted twice
+        assert store.insert_records(records[:120] + records[:10], batch_size=50) == 120
+        assert store.insert_records(records, batch_size=50) == 80
+        counts = stored_counts(store, expected.players)
+        for counter in COUNTERS:
+            assert (counts[counter] == expected.counts[counter]).all(), counter
+
+        store.database.execute("DELETE FROM t_player_stats")
+        store.rebuild_stats(batch_size=70)
+        assert stored_counts(store, expected.players)['vpip'].tolist() == expected.counts['vpip'].tolist()
+        assert [store.read_records(record[0], record[0])[0][:17] for record in records[:5]] == \
+            [record[:17] for record in records[:5]]
+
+    main(['-d', path, '--rebuild-stats'])
+    with HandStore(path) as store:
+        assert stored_counts(store, expected.players)['hands'].tolist() == expected.counts['hands'].tolist()
+
+
+def test_migrate(tmp_path):
+    path = str(tmp_path / "tracker.db")
+    shutil.copy(legacy_database_file, path)
+    records = [hand.to_record() for hand in read_hands(hand_history_file)] + generate_records(40, seed=3)
+    expected = HandStore(":memory:")
+    expected.insert_records(records)
+    seats = "SELECT d_hand_id, d_position, d_big_blind, d_date, d_vpip, d_pfr FROM t_seat ORDER BY d_hand_id, d_position"
+    players = compute_stats(ActionStore.from_records(records)).players
+    with HandStore(path) as store:
+        assert store.database.pragma('user_version') == SCHEMA_VERSION
+        names = {row[0] for row in store.database.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert set(INDEXES) <= names and 'i_seat_player' not in names
+        assert store.database.execute(seats).fetchall() == expected.database.execute(seats).fetchall()
+        counts = stored_counts(store, players)
+        for counter, values in stored_counts(expected, players).items():
+            assert (counts[counter] == values).all(), counter
+        tables = {row[0] for row in store.database.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert 't_action' not in tables and 't_board' not in tables
+        assert store.read_records(0, 1 << 62) == expected.read_records(0, 1 << 62)
+        assert_same_record(records[0], store.load_hand(records[0][0]).to_record())
+        assert store.insert_records(generate_records(10, seed=5)) == 10
+    with HandStore(path) as store:  # opened again without migration
+        assert len(store) == 59
+
+
+def test_unknown_version(tmp_path):
+    path = str(tmp_path / "tracker.db")
+    with Database(path) as database:
+        database.pragma('user_version', SCHEMA_VERSION + 1)
+    with pytest.raises(ValueError):
+        HandStore(path)
+
+    path = str(tmp_path / "other.db")
+    with Database(path) as database:
+        database.execute("CREATE TABLE t_hand(d_id INTEGER PRIMARY KEY, d_text TEXT)")
+    with pytest.raises(ValueError):
+        HandStore(path)
@@ -0,0 +1,60 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "..", "poker_parser_test", "HandTest.txt")
+
+import pytest
+
+from poker_tracker.analysis.action_store import ActionStore
+from poker_tracker.analysis.player_stats import compute_stats
+from poker_tracker.data_base.hand_store import HandStore
+from poker_tracker.data_base.queries import HandQueries, QUERIES
+from poker_tracker.poker_parser.hand_reader import read_hands
+
+
+@pytest.fixture
+def queries():
+    hands = list(read_hands(hand_history_file))
+    queries = HandQueries(":memory:")
+    HandStore(queries.database).insert_hands(hands)
+    yield queries
+    queries.database.close()
+
+
+def test_players_stats(queries):
+    hands = [hand for hand in read_hands(hand_history_file) if hand.big_blind == 20]
+    expected = compute_stats(ActionStore.from_hands(hands))
+    pseudos = ['MaGiCLeTuR', 'onucee', 'leti5795', 'unknown']
+    stats = queries.players_stats(pseudos, 20)
+    assert set(stats) == set(pseudos[:3])
+    for pseudo in pseudos[:3]:
+        player = expected.player(pseudo)
+        assert stats[pseudo]['hands'] == player['hands']
+        assert stats[pseudo]['vpip'] == pytest.approx(player['vpip'])
+        assert stats[pseudo]['pfr'] == pytest.approx(player['pfr'])
+    # more pseudos than the seats of a table
+    assert queries.players_stats(['unknown'] * 12 + ['onucee'], 20) == {'onucee': stats['onucee']}
+    assert queries.players_stats(['onucee'], 20, since="2030/01/01") == {}
+
+
+def test_player_stats(queries):
+    expected = compute_stats(ActionStore.from_hands(read_hands(hand_history_file)))
+    assert queries.player_stats('onucee') == pytest.approx(expected.player('onucee'), nan_ok=True)
+    assert queries.player_stats('onucee', 'BTN') == pytest.approx(expected.player('onucee', 'BTN'), nan_ok=True)
+    assert queries.player_stats('unknown') is None
+
+
+def test_hand_lookups(queries):
+    hand_ids = queries.player_hands('MaGiCLeTuR', 20, limit=3)
+    assert len(hand_ids) == 3
+    hand = queries.hand(hand_ids[0])
+    assert hand[0] == hand_ids[0] and hand[5] == 20
+    seats = queries.hand_seats(hand_ids[0])
+    assert len(seats) == hand[-1]
+    assert 'MaGiCLeTuR' in [seat[1] for seat in seats]
+    assert queries.hand(1) is None
+
+
+def test_query_plans(queries):
+    for name in QUERIES:
+        assert not [step for step in queries.explain(name) if step.startswith('SCAN')]
+    assert any('COVERING INDEX i_seat_player_stake' in step for step in queries.explain('players_stats'))
@@ -0,0 +1,34 @@
+import copy
+import pickle
+
+from poker_tracker.data.card import Card, Value, Color, CARDS, cards_mask
+
+
+def test_shared_cards():
+    assert Card(Value.ACE, Color.HEARTS) is Card(Value.ACE, Color.HEARTS)
+    assert Card() is Card(Value.UNDEFINED, Color.UNDEFINED)
+    assert Card(Value.ACE, Color.HEARTS) != Card(Value.ACE, Color.SPADES)
+    assert len({Card(Value.TWO, Color.CLUBS), Card(Value.TWO, Color.CLUBS)}) == 1
+    assert pickle.loads(pickle.dumps(CARDS[17])) is CARDS[17]
+    assert copy.deepcopy(CARDS[5]) is CARDS[5]
+
+
+def test_card_code():
+    assert len(set(card.code for card in CARDS)) == 52
+    assert Card(Value.TWO, Color.HEARTS).code == 0
+    assert Card(Value.ACE, Color.DIAMONDS).code == 51
+    assert Card(Value.KING, Color.SPADES).rank == 11
+    assert Card(Value.KING, Color.SPADES).suit == 2
+    assert Card(Value.ACE, Color.UNDEFINED).code == -1
+    for card in CARDS:
+        assert Card.from_code(card.code) is card
+        assert Card(card.value, card.color) is card
+    assert Card.from_code(-1) is Card()
+    assert cards_mask([CARDS[0], CARDS[3]]) == 0b1001
+
+
+def test_card_text():
+    assert Card.from_text("Ah") is Card(Value.ACE, Color.HEARTS)
+    assert Card.from_text("Tc") is Card(Value.TEN, Color.CLUBS)
+    assert Card.from_text("Ax") is Card(Value.ACE, Color.UNDEFINED)
+    assert Card.from_text("") is Card()
@@ -1,5 +1,48 @@
-from poker_tracker.data.hand import Hand
+from poker_tracker.data.action import Action, ActionType
+from poker_tracker.data.card import Card, Value, Color
+from poker_tracker.data.hand import Hand, SeatInfo
 
 
 def test_hand_constructor():
-    pass
\ No newline at end of file
+    pass
+
+
+def test_slots():
+    hand = Hand()
+    hand.seats["BB"] = SeatInfo("MaGiCLeTuR", 480, [Card(Value.TWO, Color.SPADES)])
+    hand.action_preflop = [Action("BB", ActionType.CHECK, 0)]
+
+    for value in [hand, hand.seats["BB"], hand.action_preflop[0], hand.seats["BB"].cards[0]]:
+        assert not hasattr(value, '__dict__')
+
+
+def test_hand_record():
+    hand = Hand()
+    hand.id = 202004455940
+    hand.game_id = 2642898548
+    hand.dealer = "leti5795"
+    hand.small_blind = 10
+    hand.big_blind = 20
+    hand.seats["BTN"] = SeatInfo("leti5795", 500, [Card(), Card()])
+    hand.seats["BB"] = SeatInfo("MaGiCLeTuR", 480, [Card(Value.TWO, Color.SPADES), Card(Value.ACE, Color.HEARTS)])
+    hand.pseudo_seats = {"leti5795": "BTN", "MaGiCLeTuR": "BB"}
+    hand.board_flop = [Card(Value.FIVE, Color.SPADES), Card(Value.EIGHT, Color.CLUBS), Card(Value.TEN, Color.CLUBS)]
+    hand.action_preflop = [Action("BTN", ActionType.RAISE, 40), Action("BB", ActionType.CALL, 20)]
+    hand.action_flop = [Action("BB", ActionType.CHECK, 0)]
+
+    copy = Hand.from_record(hand.to_record())
+
+    assert copy.id == hand.id
+    assert copy.game_id == hand.game_id
+    assert copy.dealer == hand.dealer
+    assert copy.big_blind == 20
+    assert copy.pseudo_seats == hand.pseudo_seats
+    assert copy.seats["BB"].player == "MaGiCLeTuR"
+    assert copy.seats["BB"].stack == 480
+    assert copy.seats["BB"].cards == hand.seats["BB"].cards
+    assert copy.seats["BTN"].cards == [Card(), Card()]
+    assert copy.board_flop == hand.board_flop
+    assert copy.board_turn == []
+    assert copy.action_preflop == hand.action_preflop
+    assert copy.action_flop == hand.action_flop
+    assert copy.to_record() == hand.to_record()
@@ -0,0 +1,218 @@
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from poker_tracker.data.action import ActionType
+from poker_tracker.evaluator.hand_evaluator import evaluate_batch
+
+EXACT_LIMIT = 100000  # Maximum number of boards enumerated, a Monte Carlo simulation is used above
+SAMPLES = 20000       # Default number of boards of a Monte Carlo simulation
+CHUNK_SIZE = 5000     # Number of boards evaluated at once
+
+EquityResult = namedtuple('EquityResult', ['equities', 'boards', 'exact'])
+
+
+def equity_codes(hands, board=(), dead=(), samples=SAMPLES, seed=None, time_budget=None, exact_limit=EXACT_LIMIT):
+    """ Compute the equity of each hand against the others.
+
+        The boards are enumerated when there are at most exact_limit
+        possible boards, otherwise random boards are drawn until samples
+        boards are evaluated or the time budget is spent. A tie gives each
+        winner an equal share of the pot.
+
+        Args:
+            hands (list): The card codes (see Card.code) of the hole cards of each player.
+            board (list): The card codes of the cards already on the board.
+            dead (list): The card codes of the other known cards, they cannot be dealt.
+            samples (int): The number of random boards of the Monte Carlo simulation.
+            seed (int): The seed of the random boards, or a numpy SeedSequence.
+            time_budget (float): Stop the simulation after this number of
+                seconds, when less than samples boards are evaluated.
+            exact_limit (int): The maximum number of boards enumerated.
+
+        Returns:
+            An EquityResult with the equity of each hand (between 0 and 1),
+            the number of boards evaluated and whether the result is exact.
+    """
+    board = list(board)
+    missing = 5 - len(board)
+    known = set(board) | set(dead)
+    for cards in hands:
+        known.update(cards)
+    deck = np.array([code for code in range(52) if code not in known], np.int64)
+    if missing < 0 or len(known) != len(board) + len(dead) + sum(len(cards) for cards in hands):
+        raise ValueError("The board has more than 5 cards or a card is used twice")
+
+    shares = np.zeros(len(hands))
+    boards = 0
+    runouts_number = comb(len(deck), missing)
+    exact = runouts_number <= exact_limit
+    if exact:
+        runouts = np.array(list(combinations(range(len(deck)), missing)), np.int64).reshape(runouts_number, missing)
+        for start in range(0, len(runouts), CHUNK_SIZE):
+            shares += chunk_shares(hands, board, deck[runouts[start:start + CHUNK_SIZE]])
+        boards = len(runouts)
+    else:
+        generator = np.random.default_rng(seed)
+        start_time = time.perf_counter()
+        while boards < samples:
+            size = min(CHUNK_SIZE, samples - boards)
+            draws = generator.random((size, len(deck))).argpartition(missing, axis=1)[:, :missing]
+            shares += chunk_shares(hands, board, deck[draws])
+            boards += size
+            if time_budget is not None and time.perf_counter() - start_time > time_budget:
+                break
+    return EquityResult(shares / max(boards, 1), boards, exact)
+
+
+def chunk_shares(hands, board, runouts):
+    """ Evaluate the hands on a group of boards.
+
+        Args:
+            hands (list): The card codes of the hole cards of each player.
+            board (list): The card codes of the cards already on the board.
+            runouts (ndarray): The card codes (boards, missing cards) completing the board.
+
+        Returns:
+            The sum over the boards of the share of the pot won by each hand.
+    """
+    common = np.concatenate([np.broadcast_to(np.array(board, np.int64), (len(runouts), len(board))), runouts],
+                            axis=1)
+    values = np.stack([evaluate_batch(np.concatenate([np.broadcast_to(np.array(cards, np.int64),
+                                                                      (len(runouts), len(cards))), common], axis=1))
+                       for cards in hands])
+    winners = values == values.max(axis=0)
+    return (winners / winners.sum(axis=0)).sum(axis=1)
+
+
+def equity(hands, board=(), dead=(), **options):
+    """ Compute the equity of each hand against the others.
+
+        Args:
+            hands (list): The hole Card of each player.
+            board (list): The Card already on the board.
+            dead (list): The other known Card.
+            options: The other arguments of equity_codes.
+
+        Returns:
+            An EquityResult, see equity_codes.
+
+        Raises:
+            ValueError: A card is undefined or used twice.
+    """
+    def codes(cards):
+        result = [card.code for card in cards]
+        if result and min(result) < 0:
+            raise ValueError("Cannot compute the equity of an undefined card")
+        return result
+
+    return equity_codes([codes(cards) for cards in hands], codes(board), codes(dead), **options)
+
+
+def equity_task(task):
+    """ Compute the equity of one spot, it runs in the worker processes.
+
+        Args:
+            task (tuple): (hands, board, options) where options are the
+                arguments of equity_codes.
+
+        Returns:
+            An EquityResult
+    """
+    hands, board, options = task
+    return equity_codes(hands, board, **options)
+
+
+def equity_batch(spots, workers=None, samples=SAMPLES, seed=None, time_budget=None, exact_limit=EXACT_LIMIT):
+    """ Compute the equities of many spots on a pool of processes.
+
+        Each spot gets its own random generator derived from seed, so the
+        results do not depend on the number of workers.
+
+        Args:
+            spots (list): (hands, board) tuples of card codes, see equity_codes.
+            workers (int): The number of worker processes, the number of CPU
+                cores if None. With 1 worker the spots are computed in the
+                current process.
+            samples (int): The number of random boards of each Monte Carlo simulation.
+            seed (int): The seed of the random boards.
+            time_budget (float): The maximum time in seconds spent on each spot.
+            exact_limit (int): The maximum number of boards enumerated.
+
+        Returns:
+            A list of EquityResult in the order of the spots.
+    """
+    spots = list(spots)
+    seeds = np.random.SeedSequence(seed).spawn(len(spots))
+    tasks = [(hands, board, {'samples': samples, 'seed': spot_seed, 'time_budget': time_budget,
+                             'exact_limit': exact_limit})
+             for (hands, board), spot_seed in zip(spots, seeds)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1:
+        return [equity_task(task) for task in tasks]
+    with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+        return pool.map(equity_task, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+
+
+def hand_spot(hand):
+    """ Find the hole cards shown by the players still in a hand.
+
+        Args:
+            hand (Hand): A parsed hand.
+
+        Returns:
+            (positions, hands, board) where hands are the card codes of the
+            hole cards of the players in positions and board the card codes
+            of the known board, None if less than two players did not fold
+            with known cards.
+    """
+    folded = {action.position
+              for actions in (hand.action_preflop, hand.action_flop, hand.action_turn, hand.action_river)
+              for action in actions if action.action_type is ActionType.FOLD}
+    positions = []
+    hands = []
+    for position, seat in hand.seats.items():
+        codes = [card.code for card in seat.cards or ()]
+        if position not in folded and len(codes) == 2 and min(codes) >= 0:
+            positions.append(position)
+            hands.append(codes)
+    if len(hands) < 2:
+        return None
+    board = [card.code for card in list(hand.board_flop) + list(hand.board_turn) + list(hand.board_river)
+             if card.code >= 0]
+    return positions, hands, board
+
+
+def hands_equities(hands, board_cards=5, **options):
+    """ Compute the equities of the players of many hands in one batch.
+
+        Args:
+            hands (iterable): The parsed Hand.
+            board_cards (int): The number of board cards known when the
+                equities are computed, 0 for preflop, 3 for the flop and
+                4 for the turn.
+            options: The other arguments of equity_batch.
+
+        Returns:
+            A dict of the equities referenced by hand id, the equities are a
+            dict referenced by position. Only the hands with at least two
+            players showing their cards are included, see hand_spot.
+    """
+    ids = []
+    positions = []
+    spots = []
+    for hand in hands:
+        spot = hand_spot(hand)
+        if spot is not None:
+            ids.append(hand.id)
+            positions.append(spot[0])
+            spots.append((spot[1], spot[2][:board_cards]))
+    results = equity_batch(spots, **options)
+    return {hand_id: dict(zip(hand_positions, result.equities.tolist()))
+            for hand_id, hand_positions, result in zip(ids, positions, results)}
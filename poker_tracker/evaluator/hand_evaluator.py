@@ -0,0 +1,222 @@
+from itertools import combinations_with_replacement
+
+import numpy as np
+
+# Categories of the poker hands, from the weakest to the strongest
+HIGH_CARD = 0
+PAIR = 1
+TWO_PAIR = 2
+THREE_OF_A_KIND = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+FOUR_OF_A_KIND = 7
+STRAIGHT_FLUSH = 8
+CATEGORY_NAMES = ["high card", "pair", "two pair", "three of a kind", "straight", "flush", "full house",
+                  "four of a kind", "straight flush"]
+CATEGORY_SHIFT = 20  # The hand value is the category followed by 5 ranks of 4 bits
+
+RANKS_NUMBER = 13
+# (5 ranks mask, rank of the highest card) of each straight from the best one, the wheel (A2345) is five high
+STRAIGHTS = [(0b11111 << (high - 4), high) for high in range(12, 3, -1)] + [(0b1000000001111, 3)]
+POWERS = np.array([5 ** rank for rank in range(RANKS_NUMBER)], np.int64)  # A rank multiset is a number in base 5
+
+
+def hand_value(category, ranks):
+    """ Encode a hand in an integer, a better hand has a greater value.
+
+        Args:
+            category (int): The category of the hand, such as PAIR.
+            ranks (list): The ranks (0 for TWO to 12 for ACE) deciding between
+                two hands of the same category, the most important first.
+
+        Returns:
+            An int
+    """
+    value = category
+    for index in range(5):
+        value = (value << 4) | (ranks[index] if index < len(ranks) else 0)
+    return value
+
+
+def straight_high(mask):
+    """ Return the rank of the highest card of the best straight of a ranks mask, -1 if there is none.
+    """
+    for straight_mask, high in STRAIGHTS:
+        if mask & straight_mask == straight_mask:
+            return high
+    return -1
+
+
+def flush_value(mask):
+    """ Compute the value of the best flush or straight flush made with the ranks of a mask of one color.
+
+        Returns:
+            The value of the hand, 0 if there are less than 5 ranks.
+    """
+    ranks = [rank for rank in range(RANKS_NUMBER - 1, -1, -1) if mask >> rank & 1]
+    if len(ranks) < 5:
+        return 0
+    high = straight_high(mask)
+    if high >= 0:
+        return hand_value(STRAIGHT_FLUSH, [high])
+    return hand_value(FLUSH, ranks[:5])
+
+
+def ranks_value(counts):
+    """ Compute the value of the best hand without flush made with a multiset of ranks.
+
+        Args:
+            counts (list): The number of cards of each rank, indexed by rank.
+
+        Returns:
+            The value of the hand.
+    """
+    # ranks ordered by number of cards, then by rank
+    groups = sorted(((count, rank) for rank, count in enumerate(counts) if count), reverse=True)
+    present = [rank for rank in range(RANKS_NUMBER - 1, -1, -1) if counts[rank]]
+    count, best = groups[0]
+    if count == 4:
+        return hand_value(FOUR_OF_A_KIND, [best, max(rank for rank in present if rank != best)])
+    if count == 3 and len(groups) > 1 and groups[1][0] >= 2:
+        return hand_value(FULL_HOUSE, [best, groups[1][1]])
+    high = straight_high(sum(1 << rank for rank in present))
+    if high >= 0:
+        return hand_value(STRAIGHT, [high])
+    if count == 3:
+        return hand_value(THREE_OF_A_KIND, [best] + [rank for rank in present if rank != best][:2])
+    if count == 2 and groups[1][0] == 2:
+        second = groups[1][1]
+        return hand_value(TWO_PAIR, [best, second, [rank for rank in present if rank not in (best, second)][0]])
+    if count == 2:
+        return hand_value(PAIR, [best] + [rank for rank in present if rank != best][:3])
+    return hand_value(HIGH_CARD, present[:5])
+
+
+def build_tables():
+    """ Compute the lookup tables of the evaluator.
+
+        Returns:
+            (flush_table, keys, values) where flush_table is the value of the
+            best flush of each 13 bits ranks mask (0 if there is no flush),
+            and values[i] is the value of the best hand without flush of the
+            ranks multiset whose base 5 number is keys[i]. There is one entry
+            for each multiset of 5, 6 or 7 ranks, keys are sorted.
+    """
+    flush_table = np.array([flush_value(mask) for mask in range(1 << RANKS_NUMBER)], np.int64)
+    table = {}
+    for cards_number in (5, 6, 7):
+        for ranks in combinations_with_replacement(range(RANKS_NUMBER), cards_number):
+            counts = [0] * RANKS_NUMBER
+            for rank in ranks:
+                counts[rank] += 1
+            if max(counts) > 4:
+                continue
+            table[sum(5 ** rank for rank in ranks)] = ranks_value(counts)
+    keys = np.array(sorted(table), np.int64)
+    values = np.array([table[key] for key in keys.tolist()], np.int64)
+    return flush_table, keys, values
+
+
+_tables = None
+
+
+def tables():
+    """ Return the lookup tables, they are computed on first use, see build_tables.
+    """
+    global _tables
+    if _tables is None:
+        flush_table, keys, values = build_tables()
+        _tables = flush_table, keys, values, dict(zip(keys.tolist(), values.tolist()))
+    return _tables
+
+
+def evaluate_codes(codes):
+    """ Compute the value of the best 5 cards hand among 5, 6 or 7 cards.
+
+        Args:
+            codes (list): The codes of the cards, see Card.code.
+
+        Returns:
+            An int, a better hand has a greater value. Two hands of the same
+            strength have the same value.
+    """
+    flush_table, _, _, rank_values = tables()
+    key = 0
+    suit_masks = [0, 0, 0, 0]
+    for code in codes:
+        rank = code >> 2
+        key += 5 ** rank
+        suit_masks[code & 3] |= 1 << rank
+    value = rank_values[key]
+    for mask in suit_masks:
+        value = max(value, flush_table[mask])
+    return int(value)
+
+
+def evaluate(cards):
+    """ Compute the value of the best 5 cards hand among 5, 6 or 7 Card.
+
+        Raises:
+            ValueError: A card is undefined.
+    """
+    codes = [card.code for card in cards]
+    if min(codes) < 0:
+        raise ValueError("Cannot evaluate an undefined card")
+    return evaluate_codes(codes)
+
+
+def evaluate_batch(codes):
+    """ Compute the values of many hands at once.
+
+        Args:
+            codes (array): An integer array (hands, cards) of card codes,
+                with 5, 6 or 7 cards in each hand.
+
+        Returns:
+            An int64 array of the value of each hand, see evaluate_codes.
+    """
+    flush_table, keys, values, _ = tables()
+    codes = np.asarray(codes, np.int64)
+    if codes.ndim != 2 or not 5 <= codes.shape[1] <= 7:
+        raise ValueError("The hands must have 5 to 7 cards")
+    ranks = codes >> 2
+    suits = codes & 3
+    result = values[np.searchsorted(keys, POWERS[ranks].sum(axis=1))]
+
+    # the flush table is only read for the hands with 5 cards of the same color
+    bits = np.left_shift(1, ranks)
+    for suit in range(4):
+        in_suit = suits == suit
+        candidates = np.flatnonzero(np.count_nonzero(in_suit, axis=1) >= 5)
+        if len(candidates):
+            masks = (bits[candidates] * in_suit[candidates]).sum(axis=1)
+            result[candidates] = np.maximum(result[candidates], flush_table[masks])
+    return result
+
+
+def category(value):
+    """ Return the category of a hand value, such as PAIR.
+    """
+    return value >> CATEGORY_SHIFT
+
+
+def describe(value):
+    """ Return the name of the category of a hand value, such as "two pair".
+    """
+    return CATEGORY_NAMES[category(value)]
+
+
+def showdown_winners(board, hands):
+    """ Find the winners of a showdown.
+
+        Args:
+            board (list): The Card of the board.
+            hands (list): The hole Card of each player.
+
+        Returns:
+            The indexes in hands of the players with the best hand.
+    """
+    values = [evaluate(list(board) + list(cards)) for cards in hands]
+    best = max(values)
+    return [index for index, value in enumerate(values) if value == best]
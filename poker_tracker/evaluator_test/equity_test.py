@@ -0,0 +1,90 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "..", "poker_parser_test", "HandTest.txt")
+
+from itertools import combinations
+
+import pytest
+
+from poker_tracker.data.card import Card, CARDS
+from poker_tracker.evaluator.equity import equity, equity_batch, hands_equities
+from poker_tracker.evaluator.hand_evaluator import evaluate
+from poker_tracker.poker_parser.hand_reader import read_hands
+
+
+def cards(text):
+    return [Card.from_text(card) for card in text.split(' ')] if text else []
+
+
+def test_exact_river():
+    result = equity([cards("Ah Kh"), cards("Ac Kc")], cards("2c 7d 9s Th Jc"))
+    assert result.exact and result.boards == 1
+    assert result.equities.tolist() == [0.5, 0.5]
+
+
+def test_exact_turn():
+    hands = [cards("Ah As"), cards("Kh Ks")]
+    board = cards("2c 7d 9s Kd")
+    result = equity(hands, board)
+    assert result.exact and result.boards == 44
+    # the river by the evaluator, one card at a time
+    used = {card.code for card in board + hands[0] + hands[1]}
+    wins = sum(evaluate(board + hands[0] + [river]) > evaluate(board + hands[1] + [river])
+               for river in CARDS if river.code not in used)
+    assert result.equities[0] == pytest.approx(wins / 44)
+
+
+def test_exact_flop():
+    hands = [cards("Ah 2h"), cards("Kc Qd")]
+    board = cards("Th 7h 2c")
+    result = equity(hands, board)
+    assert result.exact and result.boards == 990
+    used = {card.code for card in board + hands[0] + hands[1]}
+    deck = [card for card in CARDS if card.code not in used]
+    shares = 0
+    for runout in combinations(deck, 2):
+        first = evaluate(board + hands[0] + list(runout))
+        second = evaluate(board + hands[1] + list(runout))
+        shares += 1 if first > second else 0.5 if first == second else 0
+    assert result.equities[0] == pytest.approx(shares / 990)
+    assert result.equities.sum() == pytest.approx(1)
+
+
+def test_monte_carlo():
+    result = equity([cards("Ah As"), cards("Kh Ks")], samples=40000, seed=1)
+    assert not result.exact and result.boards == 40000
+    assert result.equities[0] == pytest.approx(0.82, abs=0.01)
+    assert equity([cards("Ah As"), cards("Kh Ks")], samples=40000, seed=1).equities.tolist() == \
+        result.equities.tolist()
+
+
+def test_time_budget():
+    result = equity([cards("Ah Kh"), cards("Qc Qd"), cards("7s 8s")], samples=10 ** 9, seed=0, time_budget=0.05)
+    assert 0 < result.boards < 10 ** 9
+    assert result.equities.sum() == pytest.approx(1)
+
+
+def test_invalid_cards():
+    with pytest.raises(ValueError):
+        equity([cards("Ah Kh"), cards("Ah Kc")])
+    with pytest.raises(ValueError):
+        equity([cards("Ah Kh"), [Card(), Card()]])
+
+
+def test_batch_workers():
+    spots = [([[48, 49], [44, 45]], []), ([[48, 49], [44, 45]], [8, 12, 20]), ([[0, 5], [50, 51]], [])]
+    sequential = equity_batch(spots, workers=1, samples=5000, seed=3)
+    parallel = equity_batch(spots, workers=2, samples=5000, seed=3)
+    assert [result.equities.tolist() for result in sequential] == \
+        [result.equities.tolist() for result in parallel]
+    assert sequential[1].exact and not sequential[0].exact
+
+
+def test_hands_equities():
+    hands = list(read_hands(hand_history_file))
+    river = hands_equities(hands, workers=1)
+    assert river[202004455940] == {'SB': 0.0, 'BB': 1.0}
+    assert len(river) == 4
+    preflop = hands_equities(hands, board_cards=0, workers=1, seed=0)
+    assert set(preflop) == set(river)
+    assert sum(preflop[202004455940].values()) == pytest.approx(1)
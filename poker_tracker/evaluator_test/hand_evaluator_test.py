@@ -0,0 +1,71 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "..", "poker_parser_test", "HandTest.txt")
+
+import random
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from poker_tracker.data.card import Card
+from poker_tracker.evaluator.hand_evaluator import evaluate, evaluate_codes, evaluate_batch, describe, \
+    showdown_winners
+from poker_tracker.poker_parser.hand_reader import read_hands
+
+
+def cards(text):
+    return [Card.from_text(card) for card in text.split(' ')]
+
+
+def test_categories():
+    assert describe(evaluate(cards("2s 3d 5h 9c Kd"))) == "high card"
+    assert describe(evaluate(cards("2s 2d 5h 9c Kd"))) == "pair"
+    assert describe(evaluate(cards("2s 2d 5h 5c Kd 9h"))) == "two pair"
+    assert describe(evaluate(cards("2s 2d 2h 5c Kd"))) == "three of a kind"
+    assert describe(evaluate(cards("Ah 2d 3h 4c 5d Kd Ks"))) == "straight"
+    assert describe(evaluate(cards("Ah 8h 3h 4h 9h Kd Ks"))) == "flush"
+    assert describe(evaluate(cards("2s 2d 2h Kc Kd Ks"))) == "full house"
+    assert describe(evaluate(cards("2s 2d 2h 2c Kd"))) == "four of a kind"
+    assert describe(evaluate(cards("Ah 2h 3h 4h 5h 6d 6s"))) == "straight flush"
+
+
+def test_comparisons():
+    assert evaluate(cards("Ah 2d 3h 4c 5d")) < evaluate(cards("2d 3h 4c 5d 6s"))
+    assert evaluate(cards("As Ad 5h 4c 2d")) > evaluate(cards("Ks Kd Qh Jc 9d"))
+    assert evaluate(cards("As Ad 5h 4c 3d")) > evaluate(cards("Ac Ah 5d 4s 2d"))
+    assert evaluate(cards("As Ad 5h 4c 3d")) == evaluate(cards("Ac Ah 5d 4s 3c"))
+    assert evaluate(cards("Ks Kd Kh 2c 2d 3s 3c")) == evaluate(cards("Ks Kd Kh 3s 3c"))
+    assert evaluate(cards("7h 8h 9h Th Jh Qh 2c")) == evaluate(cards("8h 9h Th Jh Qh"))
+    with pytest.raises(ValueError):
+        evaluate([Card()] * 5)
+
+
+def test_best_of_five_cards():
+    generator = random.Random(1)
+    for _ in range(200):
+        codes = generator.sample(range(52), 7)
+        expected = max(evaluate_codes(five) for five in combinations(codes, 5))
+        assert evaluate_codes(codes) == expected
+        assert evaluate_codes(codes[:6]) == max(evaluate_codes(five) for five in combinations(codes[:6], 5))
+
+
+def test_evaluate_batch():
+    generator = np.random.default_rng(2)
+    for cards_number in (5, 6, 7):
+        codes = np.argsort(generator.random((3000, 52)), axis=1)[:, :cards_number]
+        values = evaluate_batch(codes)
+        assert values.tolist() == [evaluate_codes(hand) for hand in codes.tolist()]
+        assert (evaluate_batch(codes.astype(np.int8)) == values).all()
+    with pytest.raises(ValueError):
+        evaluate_batch(np.zeros((10, 4), int))
+
+
+def test_showdown_winners():
+    hand = next(iter(read_hands(hand_history_file)))
+    board = hand.board_flop + hand.board_turn + hand.board_river
+    positions = ["SB", "BB"]
+
+    winners = showdown_winners(board, [hand.seats[position].cards for position in positions])
+    assert [positions[index] for index in winners] == list(hand.collected)
+    assert showdown_winners(cards("2c 2d 9h 9s Kc"), [cards("3c 4d"), cards("3h 4s")]) == [0, 1]
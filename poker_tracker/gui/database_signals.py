@@ -0,0 +1,70 @@
+from PySide2 import QtCore
+
+from poker_tracker.data_base.async_database import QueryCancelled
+
+
+class DatabaseSignals(QtCore.QObject):
+    """ Qt signals for the queries of an AsyncDatabase.
+
+        The widgets submit their queries with a tag and receive the result
+        in a slot connected to finished, they never wait for SQLite. The
+        future callbacks run on the database threads, the signals are
+        emitted from them and Qt queues them to the thread of the receiver,
+        so the slots run on the UI thread. The cancelled queries emit
+        nothing.
+
+        Args:
+            database (AsyncDatabase): The database running the queries.
+            parent (QObject): The Qt parent of the object.
+
+        Attributes:
+            database (AsyncDatabase): The database running the queries.
+            finished (Signal): Emitted with (tag, result) when a query succeeds.
+            failed (Signal): Emitted with (tag, exception) when a query fails.
+    """
+    finished = QtCore.Signal(object, object)
+    failed = QtCore.Signal(object, object)
+
+    def __init__(self, database, parent=None):
+        super().__init__(parent)
+        self.database = database
+
+    def submit(self, tag, function, *args, write=False, replace=False):
+        """ Run a function on a database thread, see AsyncDatabase.submit.
+
+            Args:
+                tag: The value sent with the result, such as the row of a view.
+                function (callable): The function, called with the Database of
+                    the thread followed by args.
+                args: The other arguments of the function.
+                write (bool): Run the function on the writer thread.
+                replace (bool): Cancel the previous query with the same tag,
+                    for example the rows of a view being scrolled.
+
+            Returns:
+                The Future of the query, it can be given to cancel.
+        """
+        future = self.database.submit(function, *args, write=write, key=tag if replace else None)
+        future.add_done_callback(lambda done: self._emit(tag, done))
+        return future
+
+    def query(self, tag, sql, parameters=(), replace=False):
+        """ Run a read query, finished is emitted with the list of the rows.
+        """
+        return self.submit(tag, lambda database: database.execute(sql, parameters).fetchall(), replace=replace)
+
+    def cancel(self, future):
+        """ Cancel a query that is not needed any more, see AsyncDatabase.cancel.
+        """
+        return self.database.cancel(future)
+
+    def _emit(self, tag, future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if isinstance(error, QueryCancelled):
+            return
+        if error is not None:
+            self.failed.emit(tag, error)
+        else:
+            self.finished.emit(tag, future.result())
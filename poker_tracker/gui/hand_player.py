@@ -14,6 +14,10 @@ redbackJPG = './poker_tracker/gui/card/background/redback.jpg'
 
 redbackPNG = './poker_tracker/gui/card/background/redback.png'
 
+# Displayed value and color file of the cards, indexed by card.Card.rank and card.Card.suit
+VALUE_LABELS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+COLOR_PNGS = [heartsPNG, clubsPNG, spadesPNG, diamondsPNG]
+
 
 class Table(QtWidgets.QWidget):
     """"The Table widget display the table and the players
@@ -156,7 +160,7 @@ class Card(QtWidgets.QWidget):
     def __init__(self):
         super().__init__()
         
-        self.card = card
+        self.card = card.Card()
     
         self.height = 70
         self.width = 50
@@ -170,49 +174,17 @@ class Card(QtWidgets.QWidget):
     def update_card(self):
         """ Update the value and the color of the card to be displayed.
 
-            Color enum is converted into the correct pixmap using the right .PNG file.
-            The card value is converted into a string.
+            The card color is converted into the correct pixmap using the right .PNG file.
+            The card value is converted into a string. Both are read in tables
+            indexed by the rank and the suit of the card.
         """
-        # Set the card's color
-        if (self.card.color == card.Color.SPADES) : 
-            self.color = QtGui.QPixmap(spadesPNG)
-        elif (self.card.color == card.Color.HEARTS) : 
-            self.color = QtGui.QPixmap(heartsPNG)
-        elif (self.card.color == card.Color.CLUBS) : 
-            self.color = QtGui.QPixmap(clubsPNG)
-        elif (self.card.color == card.Color.DIAMONDS) : 
-            self.color = QtGui.QPixmap(diamondsPNG)
-        else : 
+        # An undefined value or color shows the back of the card
+        if self.card.code < 0:
             self.color = None
-        # Set the card's value
-        if (self.card.value == card.Value.ACE) :
-            self.value = 'A'
-        elif (self.card.value == card.Value.TWO) :
-            self.value = '2'
-        elif (self.card.value == card.Value.THREE) :
-            self.value = '3'
-        elif (self.card.value == card.Value.FOUR) :
-            self.value = '4'
-        elif (self.card.value == card.Value.FIVE) :
-            self.value = '5'
-        elif (self.card.value == card.Value.SIX) :
-            self.value = '6'
-        elif (self.card.value == card.Value.SEVEN) :
-            self.value = '7'
-        elif (self.card.value == card.Value.EIGHT) :
-            self.value = '8'
-        elif (self.card.value == card.Value.NINE) :
-            self.value = '9'
-        elif (self.card.value == card.Value.TEN) :
-            self.value = '10'
-        elif (self.card.value == card.Value.JACK) :
-            self.value = 'J'
-        elif (self.card.value == card.Value.QUEEN) :
-            self.value = 'Q'
-        elif (self.card.value == card.Value.KING) :
-            self.value = 'K'
-        else :
             self.value = ''
+        else:
+            self.color = QtGui.QPixmap(COLOR_PNGS[self.card.suit])
+            self.value = VALUE_LABELS[self.card.rank]
         # The widget must be update in order to be shown
         self.update()
 
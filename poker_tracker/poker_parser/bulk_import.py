@@ -0,0 +1,175 @@
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+
+from poker_tracker.data.hand import Hand
+from poker_tracker.poker_parser.fast_parser import FastPokerStarsParser
+from poker_tracker.poker_parser.hand_reader import iter_raw_hands, decode_hand, parse_hand_text
+
+RANGE_SIZE = 16 << 20  # Files bigger than this size are split in byte ranges of this size
+
+logger = logging.getLogger(__name__)
+
+
+def find_history_files(paths):
+    """ List the hand history files of the given files and directories.
+
+        Args:
+            paths (list): Paths of hand history files or of directories
+                containing hand history files (.txt).
+
+        Returns:
+            The sorted list of the hand history files paths.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in os.walk(path):
+                files.extend(os.path.join(directory, name) for name in names if name.lower().endswith('.txt'))
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def split_range(path, start, end, range_size=RANGE_SIZE):
+    """ Split a byte range of a file in tasks of about range_size bytes.
+
+        Returns:
+            A list of (path, start, end) tuples, in the file order.
+    """
+    return [(path, begin, min(begin + range_size, end)) for begin in range(start, max(end, start + 1), range_size)]
+
+
+def make_tasks(files, range_size=RANGE_SIZE):
+    """ Split the files in tasks of about range_size bytes.
+
+        Args:
+            files (list): Paths of the hand history files.
+            range_size (int): The maximum size of a byte range.
+
+        Returns:
+            A list of (path, start, end) tuples, in the file order.
+    """
+    tasks = []
+    for path in files:
+        tasks.extend(split_range(path, 0, os.path.getsize(path), range_size))
+    return tasks
+
+
+def parse_task(task):
+    """ Parse the hands of a byte range of a file, it runs in the worker processes.
+
+        Hands that cannot be parsed are logged and skipped.
+
+        Args:
+            task (tuple): (path, start, end, parser_class)
+
+        Returns:
+            The list of the hands records (see Hand.to_record) in the file order.
+    """
+    path, start, end, parser_class = task
+    records = []
+    for offset, raw_hand in iter_raw_hands(path, start=start, end=end):
+        try:
+            records.append(parse_hand_text(decode_hand(raw_hand), parser_class).to_record())
+        except Exception:
+            logger.warning("Unable to parse the hand at %s:%d", path, offset, exc_info=True)
+    return records
+
+
+def import_records(paths, workers=None, ordered=True, range_size=RANGE_SIZE, parser_class=FastPokerStarsParser):
+    """ Parse hand history files on a pool of processes.
+
+        The files are split in byte ranges and each range is parsed by a
+        worker process. The workers send back compact records instead of
+        the parsers, so the main process only has to unpickle tuples.
+
+        Args:
+            paths (list): Paths of hand history files or directories.
+            workers (int): The number of worker processes, the number of CPU
+                cores if None. With 1 worker the files are parsed in the
+                current process.
+            ordered (bool): Return the hands in the files order. If False the
+                hands of a range are returned as soon as the range is parsed.
+            range_size (int): The size in bytes of the ranges sent to the workers.
+            parser_class (type): The parser used to read the hands.
+
+        Returns:
+            A generator of hand records, see Hand.to_record
+    """
+    ranges = [(path, 0, os.path.getsize(path)) for path in find_history_files(paths)]
+    return import_ranges(ranges, workers, ordered, range_size, parser_class)
+
+
+def import_ranges(ranges, workers=None, ordered=True, range_size=RANGE_SIZE, parser_class=FastPokerStarsParser):
+    """ Parse byte ranges of hand history files on a pool of processes.
+
+        The hands starting in a range are read, so a file that has grown can
+        be read from the beginning of its last imported hand.
+
+        Args:
+            ranges (list): (path, start, end) tuples, see iter_raw_hands.
+            workers (int), ordered (bool), range_size (int), parser_class (type):
+                See import_records.
+
+        Returns:
+            A generator of hand records, see Hand.to_record
+    """
+    tasks = [task + (parser_class,) for path, start, end in ranges
+             for task in split_range(path, start, end, range_size)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield from parse_task(task)
+        return
+
+    with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+        if ordered:
+            results = pool.imap(parse_task, tasks)
+        else:
+            results = pool.imap_unordered(parse_task, tasks)
+        for records in results:
+            yield from records
+
+
+def bulk_import(paths, workers=None, ordered=True, range_size=RANGE_SIZE, parser_class=FastPokerStarsParser):
+    """ Parse hand history files on a pool of processes and return the hands.
+
+        See import_records for the arguments.
+
+        Returns:
+            A generator of Hand objects
+    """
+    for record in import_records(paths, workers, ordered, range_size, parser_class):
+        yield Hand.from_record(record)
+
+
+def main(argv=None):
+    """ Command line entry point of the bulk import.
+
+        Args:
+            argv (list): The command line arguments, sys.argv if None.
+    """
+    parser = argparse.ArgumentParser(description="Import PokerStars hand history files.")
+    parser.add_argument('paths', nargs='+', help="hand history files or directories")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="number of worker processes (default: number of CPU cores)")
+    parser.add_argument('--unordered', action='store_true',
+                        help="do not keep the file order of the hands")
+    parser.add_argument('--range-size', type=int, default=RANGE_SIZE,
+                        help="size in bytes of the file ranges sent to the workers")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    count = 0
+    for _ in import_records(args.paths, args.workers, not args.unordered, args.range_size):
+        count += 1
+    duration = time.perf_counter() - start
+    print("{0} hands imported in {1:.2f} s ({2:.0f} hands/s)".format(count, duration, count / max(duration, 1e-9)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,323 @@
+import re
+
+from poker_tracker.data.action import ActionType, Action
+from poker_tracker.data.card import TEXT_CARDS, UNDEFINED_CARD
+from poker_tracker.poker_parser.pokerstars_parser import PokerStarsParser, define_card
+
+# Header patterns, compiled once for all the hands. The first line and the
+# table line are read with one pattern, the other ones are used when it fails.
+HAND_LINE_PATTERN = re.compile(r'PokerStars Hand #([0-9]+): (?:Tournament #([0-9]+), )?'
+                               r'(?:€?([0-9.]+)\+€?([0-9.]+)[^(]*)?.*?\(€?([0-9.]+)/€?([0-9.]+)( EUR)?\)'
+                               r'(?: - ([0-9]{4}/[0-9]{2}/[0-9]{2}) ([0-9]{1,2}:[0-9]{2}:[0-9]{2}))?')
+TABLE_LINE_PATTERN = re.compile(r'Table \'([0-9A-Za-z ]+)\' (?:([0-9]+)-max )?.*?Seat #([0-9]+)')
+HAND_ID_PATTERN = re.compile(r'Hand #([0-9-]+):')
+DATE_PATTERN = re.compile(r' - ([0-9]{4}/[0-9]{2}/[0-9]{2}) ([0-9]{1,2}:[0-9]{2}:[0-9]{2})')
+GAME_ID_PATTERN = re.compile(r'Tournament #([0-9]+),')
+BLIND_PATTERN = re.compile(r'\(€?([0-9-.]+)/€?([0-9-.]+)( EUR)?\)')
+BUY_IN_PATTERN = re.compile(r'€?([0-9-.]+)\+€?([0-9-.]+)( EUR)?')
+TABLE_NAME_PATTERN = re.compile(r'Table \'([0-9A-Za-z ]+)\'')
+TABLE_SIZE_PATTERN = re.compile(r'([0-9]+)-max')
+BUTTON_PATTERN = re.compile(r'Seat #([0-9]+)')
+SEAT_PATTERN = re.compile(r'Seat ([0-9]+): (.+) \(€?([0-9-.]+)')
+
+# PokerStars action verbs
+ACTION_TYPES = {
+    "checks": ActionType.CHECK,
+    "folds": ActionType.FOLD,
+    "bets": ActionType.BET,
+    "raises": ActionType.RAISE,
+    "calls": ActionType.CALL,
+}
+FOLD, CHECK, RAISE = ActionType.FOLD, ActionType.CHECK, ActionType.RAISE
+# key: section name | value: attribute receiving the actions of the section
+ACTION_SECTIONS = {
+    "HOLE CARDS": "action_preflop",
+    "FLOP": "action_flop",
+    "TURN": "action_turn",
+    "RIVER": "action_river",
+}
+POST_TYPES = ("the ante", "small blind", "big blind", "small & big blinds")  # Blinds and antes of the posts lines
+
+
+def read_card(text):
+    """ Read a card with a lookup in the table of the shared cards.
+
+        Args:
+            text (string): The representation of a card in Pokerstars format
+
+        Returns:
+            A Card object
+    """
+    card = TEXT_CARDS.get(text)
+    if card is None:
+        return define_card(text)
+    return card
+
+
+def read_cards(text):
+    """ Read a space separated list of cards.
+
+        Args:
+            text (string): The cards in Pokerstars format, for instance "5s 8c Tc"
+
+        Returns:
+            A list of Card objects
+    """
+    # the shared cards are looked up directly, read_card is only called for the unknown ones
+    return [TEXT_CARDS.get(card) or read_card(card) for card in text.split(' ')]
+
+
+def read_board(text):
+    """ Read the new cards of a section line, the last cards between brackets.
+
+        Args:
+            text (string): The end of the section line, for instance "[5s 8c Tc] [2h]"
+
+        Returns:
+            A list of Card objects, empty if there are no brackets
+    """
+    start = text.rfind('[')
+    end = text.rfind(']')
+    if start == -1 or end < start:
+        return []
+    return read_cards(text[start + 1:end])
+
+
+def read_amount(text):
+    """ Read an amount of chips or euros such as "20" or "€0.02".
+
+        Args:
+            text (string): The text starting with the amount
+
+        Returns:
+            The amount as a float
+    """
+    return float(text.split(' ', 1)[0].lstrip('€'))
+
+
+class FastPokerStarsParser(PokerStarsParser):
+    """ A single pass parser of PokerStars hand file.
+
+        It fills the same attributes and loads the same Hand as
+        PokerStarsParser, but the hand is read only once. The text is split
+        at the section lines ("*** FLOP *** ..."), then the lines of each
+        section are read in one loop. The regular expressions are compiled
+        once at module level and are only used on the hand, table and seat
+        lines, the posts, the actions and the pots collected are read with
+        string methods.
+
+        An unexpected line is logged and ignored, the other lines of its
+        section are still read.
+
+        Args:
+            hand_file (string): a string with the complete hand description
+                from a Pokerstars hand history file.
+    """
+
+    def parse_hand(self, lazy=False):
+        """ Parse all the hand
+
+            Args:
+                lazy (bool): Not used, all the hand is read in the single pass.
+                    Lazy parsing is only done by PokerStarsParser.
+        """
+        text = self.hand_file
+        # nothing is read in the summary
+        end = text.find("\n*** SUMMARY ***")
+        if end != -1:
+            text = text[:end]
+        sections = text.split("\n*** ")
+        try:
+            self.read_header(sections[0])
+        except (AttributeError, IndexError, ValueError):
+            self.logger.warning("Unexpected line in the header of the hand %s", self.hand_id)
+        for section in sections[1:]:
+            name, _, text = section.partition(" ***")
+            board, _, text = text.partition("\n")
+            self.read_section(name, board, text)
+        self.conclude_hand()
+
+    def read_header(self, text):
+        """ Read the header: the hand and table lines, the seats and the posts.
+
+            Args:
+                text (string): The header, the lines before the first section.
+        """
+        seats = []
+        posts = []
+        for line in text.split('\n'):
+            start = line[0:5]
+            if start == "Seat ":
+                seats.append(line)
+            elif start == "Poker":
+                self.read_hand_line(line)
+            elif start == "Table":
+                self.read_table_line(line)
+            elif ": posts " in line:
+                posts.append(line)
+        if not seats:
+            return
+        # the positions need the number of players and the button
+        self.players_number += len(seats)
+        position_names = PokerStarsParser.position_name_list[self.players_number - 2]
+        button_seat = self.button_seat
+        for line in seats:
+            reg_player = SEAT_PATTERN.match(line)
+            if reg_player is not None:
+                player_seat, player_name, player_stack = reg_player.groups()
+                position = position_names[int(player_seat) - button_seat]
+                self.positions[position] = player_name
+                self.players[player_name] = position
+                self.stacks[position] = float(player_stack)
+        for line in posts:
+            pseudo, _, post = line.rpartition(": posts ")
+            post_type, _, amount = post.rpartition(" ")
+            if post_type in POST_TYPES:
+                self.add_post(pseudo, post_type, float(amount.lstrip('€')))
+                continue
+            # the amount is followed by another text, such as " and is all-in"
+            for post_type in POST_TYPES:
+                if post.startswith(post_type + " "):
+                    self.add_post(pseudo, post_type, read_amount(post[len(post_type) + 1:]))
+                    break
+
+    def read_section(self, name, board, text):
+        """ Read the board and the lines of a section.
+
+            The actions are read in the streets sections, the cards shown in
+            the showdown, the pots collected in all the sections. The other
+            lines, such as the uncalled bets returned or the chat, are
+            ignored. An unexpected line, such as a raise without its total, is
+            logged and skipped.
+
+            Args:
+                name (string): The name of the section, such as "FLOP".
+                board (string): The end of the section line, such as "[5s 8c Tc]".
+                text (string): The lines of the section.
+        """
+        try:
+            if name == "FLOP":
+                self.board_flop.extend(read_board(board))
+            elif name == "TURN":
+                self.board_turn.extend(read_board(board))
+            elif name == "RIVER":
+                self.board_river.extend(read_board(board))
+        except (AttributeError, IndexError, ValueError):
+            self.logger.warning("Unexpected board in the %s part of the hand %s: %s", name, self.hand_id, board)
+        attribute = ACTION_SECTIONS.get(name)
+        actions = getattr(self, attribute) if attribute is not None else None
+        players = self.players
+        for line in text.split('\n'):
+            try:
+                pseudo, separator, action = line.rpartition(': ')
+                if separator:
+                    verb, _, action = action.partition(' ')
+                    action_type = ACTION_TYPES.get(verb)
+                    if action_type is not None:
+                        position = players.get(pseudo)
+                        if actions is None or position is None:
+                            continue
+                        if action_type is FOLD or action_type is CHECK:
+                            actions.append(Action(position, action_type, 0))
+                        elif action_type is RAISE:
+                            # "raises 200 to 400", the amount is the total of the raise
+                            amount = action[action.index('to ') + 3:]
+                            actions.append(Action(position, RAISE, float(amount.partition(' ')[0].lstrip('€'))))
+                        else:
+                            actions.append(Action(position, action_type, float(action.partition(' ')[0].lstrip('€'))))
+                    elif verb == "shows" and name == "SHOW DOWN":
+                        self.read_show_line(line)
+                elif line[0:5] == "Dealt":
+                    self.read_dealt_line(line)
+                else:
+                    pseudo, separator, won = line.rpartition(" collected ")
+                    if separator:
+                        amount, _, won = won.lstrip('€').partition(' ')
+                        position = players.get(pseudo)
+                        if won[0:4] == "from" and position is not None and amount and not amount.strip("0123456789."):
+                            self.collected[position] = self.collected.get(position, 0) + float(amount)
+            except (AttributeError, IndexError, ValueError):
+                self.logger.warning("Unexpected line in the %s part of the hand %s: %s", name, self.hand_id, line)
+
+    def conclude_hand(self):
+        """ Give unknown cards to the players whose cards are not known.
+        """
+        for position in self.positions:
+            if position not in self.cards:
+                self.cards[position] = (UNDEFINED_CARD, UNDEFINED_CARD)
+
+    def read_hand_line(self, line):
+        """ Read the first line of the header : PokerStars basic info.
+        """
+        reg_line = HAND_LINE_PATTERN.match(line)
+        if reg_line is None:
+            self.search_hand_line(line)
+            return
+        hand_id, game_id, buy_in, rake, small_blind, big_blind, _, date, hour = reg_line.groups()
+        self.hand_id = int(hand_id)
+        if date is not None:
+            self.date = date
+            self.hour = hour
+        if game_id is not None:
+            self.game_id = int(game_id)
+        if buy_in is not None:
+            self.buy_in = float(buy_in) + float(rake)
+            self.rake = float(rake)
+        self.small_blind = float(small_blind)
+        self.big_blind = float(big_blind)
+
+    def search_hand_line(self, line):
+        """ Read the first line of the header piece by piece when it has an unusual format.
+        """
+        self.hand_id = int(HAND_ID_PATTERN.search(line).group(1))
+        reg_game_id = GAME_ID_PATTERN.search(line)
+        if reg_game_id is not None:
+            self.game_id = int(reg_game_id.group(1))
+        reg_blind = BLIND_PATTERN.search(line)
+        self.small_blind = float(reg_blind.group(1))
+        self.big_blind = float(reg_blind.group(2))
+        reg_date = DATE_PATTERN.search(line)
+        if reg_date is not None:
+            self.date = reg_date.group(1)
+            self.hour = reg_date.group(2)
+        reg_buy_in = BUY_IN_PATTERN.search(line)
+        if reg_buy_in is not None:
+            self.buy_in = float(reg_buy_in.group(1)) + float(reg_buy_in.group(2))
+            self.rake = float(reg_buy_in.group(2))
+
+    def read_table_line(self, line):
+        """ Read the second line of the header : Table info.
+        """
+        reg_line = TABLE_LINE_PATTERN.match(line)
+        if reg_line is None:
+            self.table_name = TABLE_NAME_PATTERN.search(line).group(1)
+            reg_table_size = TABLE_SIZE_PATTERN.search(line)
+            if reg_table_size is not None:
+                self.table_size = int(reg_table_size.group(1))
+            self.button_seat = int(BUTTON_PATTERN.search(line).group(1))
+            return
+        self.table_name = reg_line.group(1)
+        if reg_line.group(2) is not None:
+            self.table_size = int(reg_line.group(2))
+        self.button_seat = int(reg_line.group(3))
+
+    def read_dealt_line(self, line):
+        """ Read the hero cards, "Dealt to pseudo [Kc 3s]".
+        """
+        end = line.rfind(']')
+        pseudo, separator, hand = line[9:end].rpartition(' [')
+        position = self.players.get(pseudo)
+        if end != -1 and separator and position is not None:
+            hand = hand.split(' ')
+            self.cards[position] = [read_card(hand[0]), read_card(hand[1])]
+
+    def read_show_line(self, line):
+        """ Read the cards shown at the showdown.
+        """
+        pseudo, separator, text = line.partition(': shows [')
+        position = self.players.get(pseudo)
+        if not separator or position is None:
+            return
+        cards = read_cards(text[:text.index(']')])
+        if position not in self.cards or len(self.cards[position]) > len(cards):
+            self.cards[position] = cards
@@ -0,0 +1,400 @@
+import argparse
+import random
+from datetime import datetime, timedelta
+
+from poker_tracker.data.card import TEXT_CARDS
+from poker_tracker.evaluator.hand_evaluator import evaluate_codes, describe
+
+# Tournament levels : (level name, small blind, big blind, ante)
+LEVELS = [
+    ("I", 10, 20, 0), ("II", 15, 30, 0), ("III", 25, 50, 0), ("IV", 50, 100, 0), ("V", 75, 150, 0),
+    ("VI", 100, 200, 25), ("VII", 150, 300, 25), ("VIII", 200, 400, 50), ("IX", 300, 600, 75),
+    ("X", 400, 800, 100),
+]
+# Cash game stakes in euro cents : (small blind, big blind)
+STAKES = [(1, 2), (2, 5), (5, 10), (10, 25), (25, 50)]
+TABLE_NAMES = ["Aludra", "Mizar", "Alcor", "Vega", "Rigel", "Deneb", "Altair", "Sirius"]
+TABLE_SIZES = [2, 3, 6, 9, 10]
+ROMAN = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"]
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "ta", "zo", "pi", "be", "do", "fa", "gu", "xe", "vy"]
+RANKS = "23456789TJQKA"
+SUITS = "schd"
+STREETS = ["FLOP", "TURN", "RIVER"]
+POOL_SIZE = 5000  # Number of different opponents
+
+
+def make_pseudo(index):
+    """ Create a deterministic player pseudo from a number.
+
+        Args:
+            index (int): The number of the player.
+
+        Returns:
+            A pseudo such as "kaloMi42"
+    """
+    name = ""
+    value = index
+    for _ in range(3):
+        name += SYLLABLES[value % len(SYLLABLES)]
+        value //= len(SYLLABLES)
+    return name.capitalize() + str(index % 97)
+
+
+class HandGenerator:
+    """ A deterministic generator of PokerStars hand histories.
+
+        The generated hands are realistic enough to test and benchmark the
+        parsers : tournaments and cash games in euros, 2 to 10 players,
+        blinds and antes, random but legal betting on all the streets,
+        all-ins with side pots, uncalled bets and showdowns. The same seed
+        always generates the same hands.
+
+        The players always sit on the seats 1 to n because
+        PokerStarsParser.position does not support empty seats.
+
+        Args:
+            seed (int): The seed of the random generator.
+            tournament_ratio (float): The probability of a tournament hand.
+            min_players (int): The minimum number of players in a hand.
+            max_players (int): The maximum number of players in a hand (10 max).
+            hero (string): The pseudo of the player receiving the hole cards.
+
+        Attributes:
+            random (random.Random): The random generator.
+            hand_id (int): The id of the last generated hand.
+            date (datetime): The date of the last generated hand.
+            pseudos (list): The pseudos of the opponents.
+    """
+    def __init__(self, seed=0, tournament_ratio=0.5, min_players=2, max_players=10, hero="MaGiCLeTuR"):
+        self.random = random.Random(seed)
+        self.tournament_ratio = tournament_ratio
+        self.min_players = min_players
+        self.max_players = max_players
+        self.hero = hero
+        self.hand_id = 210000000000 + seed * 100000000
+        self.date = datetime(2020, 1, 1, 12, 0, 0)
+        self.pseudos = [make_pseudo(i) for i in range(POOL_SIZE)]
+
+    def hands(self, count):
+        """ Generate hands.
+
+            Args:
+                count (int): The number of hands.
+
+            Returns:
+                A generator of hands in PokerStars format.
+        """
+        for _ in range(count):
+            yield self.generate_hand()
+
+    def generate_hand(self):
+        """ Generate one hand.
+
+            Returns:
+                The hand in PokerStars format, followed by blank lines.
+        """
+        r = self.random
+        self.hand_id += r.randint(1, 5000)
+        self.date += timedelta(seconds=r.randint(5, 120))
+        players_number = r.randint(self.min_players, self.max_players)
+        table_size = r.choice([size for size in TABLE_SIZES if size >= players_number])
+        self.tournament = r.random() < self.tournament_ratio
+        names = [self.hero] + r.sample(self.pseudos, players_number - 1)
+        r.shuffle(names)
+        self.names = names
+        self.lines = []
+        n = players_number
+
+        date = self.date.strftime("%Y/%m/%d %H:%M:%S") + " CET [" + \
+            (self.date - timedelta(hours=6)).strftime("%Y/%m/%d %H:%M:%S") + " ET]"
+        if self.tournament:
+            level, small_blind, big_blind, ante = LEVELS[r.randrange(len(LEVELS))]
+            tournament_id = 2600000000 + r.randrange(1000)
+            self.lines.append("PokerStars Hand #{0}: Tournament #{1}, €0.93+€0.07 EUR Hold'em No Limit - Level {2} "
+                              "({3}/{4}) - {5}".format(self.hand_id, tournament_id, level, small_blind, big_blind, date))
+            table_name = "{0} {1}".format(tournament_id, r.randint(1, 20))
+            stacks = [r.randint(10, 150) * big_blind for _ in range(n)]
+        else:
+            small_blind, big_blind = r.choice(STAKES)
+            ante = 0
+            self.lines.append("PokerStars Hand #{0}:  Hold'em No Limit ({1}/{2} EUR) - {3}".format(
+                self.hand_id, self.money(small_blind), self.money(big_blind), date))
+            table_name = "{0} {1}".format(r.choice(TABLE_NAMES), ROMAN[r.randrange(len(ROMAN))])
+            stacks = [r.randint(40, 150) * big_blind + r.randrange(big_blind) for _ in range(n)]
+        self.big_blind = big_blind
+
+        button = r.randrange(n)
+        self.lines.append("Table '{0}' {1}-max Seat #{2} is the button".format(table_name, table_size, button + 1))
+        for i in range(n):
+            self.lines.append("Seat {0}: {1} ({2} in chips) ".format(i + 1, names[i], self.money(stacks[i])))
+
+        self.stacks = stacks
+        self.folded = [False] * n
+        self.total = [0] * n    # chips put in the pot during the hand
+        self.street = [0] * n   # chips put in the pot during the current street
+        self.dead = 0           # antes
+
+        if ante:
+            for i in range(n):
+                amount = min(ante, self.stacks[i] - 1)
+                self.stacks[i] -= amount
+                self.dead += amount
+                self.lines.append("{0}: posts the ante {1}".format(names[i], self.money(amount)))
+        if n == 2:
+            small, big, first = button, (button + 1) % n, button
+        else:
+            small, big, first = (button + 1) % n, (button + 2) % n, (button + 3) % n
+        self.post(small, small_blind, "small blind")
+        self.post(big, big_blind, "big blind")
+
+        deck = [rank + suit for rank in RANKS for suit in SUITS]
+        r.shuffle(deck)
+        self.hole_cards = [deck[2 * i:2 * i + 2] for i in range(n)]
+        board = deck[2 * n:2 * n + 5]
+
+        self.lines.append("*** HOLE CARDS ***")
+        hero = names.index(self.hero)
+        self.lines.append("Dealt to {0} [{1}]".format(self.hero, " ".join(self.hole_cards[hero])))
+        self.betting_round(first, big_blind, preflop=True)
+
+        shown = 0
+        for street_index, street in enumerate(STREETS):
+            if self.remaining() <= 1:
+                break
+            shown = street_index + 3
+            if street == "FLOP":
+                self.lines.append("*** FLOP *** [{0}]".format(" ".join(board[:3])))
+            else:
+                self.lines.append("*** {0} *** [{1}] [{2}]".format(street, " ".join(board[:shown - 1]),
+                                                                   board[shown - 1]))
+            if self.can_act_count() >= 2:
+                self.betting_round((button + 1) % n, 0)
+
+        winners = self.conclude(board[:shown])
+        self.summary(board[:shown], button, small, big, winners)
+        return "\n".join(self.lines) + "\n\n\n\n"
+
+    def money(self, amount):
+        """ Format an amount in chips (tournament) or in euro cents (cash game).
+        """
+        if self.tournament:
+            return str(amount)
+        return "€{0}.{1:02d}".format(amount // 100, amount % 100)
+
+    def post(self, i, amount, blind):
+        """ Post a blind.
+        """
+        amount = min(amount, self.stacks[i])
+        self.stacks[i] -= amount
+        self.street[i] += amount
+        self.lines.append("{0}: posts {1} {2}".format(self.names[i], blind, self.money(amount)))
+
+    def remaining(self):
+        """ Number of players who did not fold.
+        """
+        return self.folded.count(False)
+
+    def can_act(self, i):
+        return not self.folded[i] and self.stacks[i] > 0
+
+    def can_act_count(self):
+        return sum(1 for i in range(len(self.names)) if self.can_act(i))
+
+    def betting_round(self, first, current_bet, preflop=False):
+        """ Play a betting round and add the actions lines.
+
+            Args:
+                first (int): The index of the first player to act.
+                current_bet (int): The amount to call at the beginning of the round.
+                preflop (bool): True for the preflop round.
+        """
+        r = self.random
+        n = len(self.names)
+        raise_size = self.big_blind
+        raises = 0
+        pending = [(first + k) % n for k in range(n)]
+        pending = [i for i in pending if self.can_act(i)]
+        while pending and self.remaining() > 1:
+            i = pending.pop(0)
+            if not self.can_act(i):
+                continue
+            to_call = current_bet - self.street[i]
+            others = sum(1 for j in range(n) if j != i and self.can_act(j))
+            if to_call <= 0 and others == 0:
+                break
+            name = self.names[i]
+            pot = sum(self.total) + sum(self.street) + self.dead
+            if to_call <= 0:
+                if raises < 4 and r.random() < 0.3:
+                    amount = max(self.big_blind, int(pot * r.uniform(0.33, 1.0)))
+                    amount = min(amount, self.stacks[i])
+                    self.put(i, amount)
+                    raise_size = amount
+                    current_bet = self.street[i]
+                    raises += 1
+                    self.lines.append("{0}: bets {1}{2}".format(name, self.money(amount), self.all_in(i)))
+                    pending = self.next_players(i)
+                else:
+                    self.lines.append("{0}: checks ".format(name))
+                continue
+            choice = r.random()
+            fold = 0.55 if preflop else 0.4
+            if choice < fold:
+                self.folded[i] = True
+                self.lines.append("{0}: folds ".format(name))
+            elif choice < fold + 0.12 and raises < 4 and others > 0 and self.stacks[i] > to_call:
+                raise_to = current_bet + max(raise_size, int(raise_size * r.uniform(1.0, 3.0)))
+                raise_to = min(raise_to, self.street[i] + self.stacks[i])
+                self.put(i, raise_to - self.street[i])
+                raise_size = max(raise_size, raise_to - current_bet)
+                self.lines.append("{0}: raises {1} to {2}{3}".format(
+                    name, self.money(raise_to - current_bet), self.money(raise_to), self.all_in(i)))
+                current_bet = raise_to
+                raises += 1
+                pending = self.next_players(i)
+            else:
+                amount = min(to_call, self.stacks[i])
+                self.put(i, amount)
+                self.lines.append("{0}: calls {1}{2}".format(name, self.money(amount), self.all_in(i)))
+        self.end_round()
+
+    def put(self, i, amount):
+        self.stacks[i] -= amount
+        self.street[i] += amount
+
+    def all_in(self, i):
+        return " and is all-in" if self.stacks[i] == 0 else ""
+
+    def next_players(self, i):
+        """ The players who must act again after a bet or a raise of player i.
+        """
+        n = len(self.names)
+        return [(i + k) % n for k in range(1, n) if self.can_act((i + k) % n)]
+
+    def end_round(self):
+        """ Return the uncalled bet and move the street bets to the pot.
+        """
+        ordered = sorted(range(len(self.names)), key=lambda i: self.street[i], reverse=True)
+        top, second = ordered[0], ordered[1]
+        uncalled = self.street[top] - self.street[second]
+        if uncalled > 0:
+            self.street[top] -= uncalled
+            self.stacks[top] += uncalled
+            self.lines.append("Uncalled bet ({0}) returned to {1}".format(self.money(uncalled), self.names[top]))
+        for i in range(len(self.names)):
+            self.total[i] += self.street[i]
+            self.street[i] = 0
+
+    def conclude(self, board):
+        """ Show the cards and give the pots.
+
+            The shown hands are ranked with the board (see
+            evaluator.hand_evaluator), each pot goes to the best hands
+            eligible for it, a tie splits the pot and the odd chips go to
+            the first winners.
+
+            Returns:
+                A dict of the amount won referenced by the player index.
+        """
+        n = len(self.names)
+        alive = [i for i in range(n) if not self.folded[i]]
+        winners = {}
+        if len(alive) == 1:
+            pot = sum(self.total) + self.dead
+            winners[alive[0]] = pot
+            self.lines.append("{0} collected {1} from pot".format(self.names[alive[0]], self.money(pot)))
+            self.lines.append("{0}: doesn't show hand ".format(self.names[alive[0]]))
+            return winners
+
+        self.lines.append("*** SHOW DOWN ***")
+        values = {}
+        for i in alive:
+            values[i] = evaluate_codes([TEXT_CARDS[card].code for card in list(board) + self.hole_cards[i]])
+            self.lines.append("{0}: shows [{1}] ({2})".format(self.names[i], " ".join(self.hole_cards[i]),
+                                                               describe(values[i])))
+        # one pot for each all-in level, the main pot first
+        levels = sorted(set(self.total[i] for i in alive))
+        pots = []
+        previous = 0
+        for level in levels:
+            amount = sum(min(total, level) - min(total, previous) for total in self.total)
+            if not pots:
+                amount += self.dead
+            eligible = [i for i in alive if self.total[i] >= level]
+            pots.append((amount, eligible))
+            previous = level
+        # the chips of the folded players above the highest level
+        pots[-1] = (pots[-1][0] + sum(max(total - previous, 0) for total in self.total), pots[-1][1])
+        for index, (amount, eligible) in enumerate(pots):
+            if len(pots) == 1:
+                pot_name = "pot"
+            elif index == 0:
+                pot_name = "main pot"
+            else:
+                pot_name = "side pot-{0}".format(index)
+            best = max(values[i] for i in eligible)
+            pot_winners = [i for i in eligible if values[i] == best]
+            share, odd_chips = divmod(amount, len(pot_winners))
+            for rank, winner in enumerate(pot_winners):
+                won = share + (1 if rank < odd_chips else 0)
+                winners[winner] = winners.get(winner, 0) + won
+                self.lines.append("{0} collected {1} from {2}".format(self.names[winner], self.money(won), pot_name))
+        return winners
+
+    def summary(self, board, button, small, big, winners):
+        """ Add the summary lines.
+        """
+        self.lines.append("*** SUMMARY ***")
+        self.lines.append("Total pot {0} | Rake {1} ".format(self.money(sum(winners.values())), self.money(0)))
+        if board:
+            self.lines.append("Board [{0}]".format(" ".join(board)))
+        for i, name in enumerate(self.names):
+            line = "Seat {0}: {1}".format(i + 1, name)
+            if i == button:
+                line += " (button)"
+            if i == small:
+                line += " (small blind)"
+            elif i == big:
+                line += " (big blind)"
+            if self.folded[i]:
+                line += " folded"
+            elif i in winners:
+                line += " showed [{0}] and won ({1})".format(" ".join(self.hole_cards[i]), self.money(winners[i]))
+            else:
+                line += " showed [{0}] and lost".format(" ".join(self.hole_cards[i]))
+            self.lines.append(line)
+
+
+def write_history(path, count, seed=0, **options):
+    """ Write a hand history file of generated hands.
+
+        Args:
+            path (string): The path of the file.
+            count (int): The number of hands.
+            seed (int): The seed of the generator.
+            options: The other HandGenerator arguments.
+
+        Returns:
+            The number of bytes written.
+    """
+    size = 0
+    generator = HandGenerator(seed, **options)
+    with open(path, 'w', encoding='utf-8', newline='\n') as file:
+        for hand in generator.hands(count):
+            size += file.write(hand)
+    return size
+
+
+def main(argv=None):
+    """ Command line entry point of the generator.
+    """
+    parser = argparse.ArgumentParser(description="Write a file of generated PokerStars hands.")
+    parser.add_argument('path', help="the hand history file to write")
+    parser.add_argument('-n', '--hands', type=int, default=10000, help="number of hands")
+    parser.add_argument('-s', '--seed', type=int, default=0, help="seed of the generator")
+    args = parser.parse_args(argv)
+    write_history(args.path, args.hands, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+import os
+import sqlite3
+from collections import namedtuple
+
+from poker_tracker.data_base.hand_store import file_hash
+from poker_tracker.poker_parser.fast_parser import FastPokerStarsParser, SEAT_PATTERN
+from poker_tracker.poker_parser.hand_reader import iter_raw_hands, decode_hand, parse_hand_text, read_hand_id
+from poker_tracker.poker_parser.hand_watcher import is_complete_hand
+
+BATCH_SIZE = 10000  # Number of hands written to the index at once
+# Version of the tables, in PRAGMA user_version. An index of another version
+# is emptied, the hands are indexed again from the files.
+INDEX_VERSION = 1
+
+IndexEntry = namedtuple('IndexEntry', ['hand_id', 'game_id', 'date', 'hour', 'small_blind', 'big_blind',
+                                       'pseudos', 'path', 'offset', 'length'])
+
+
+def scan_header(raw_hand):
+    """ Read the main information of a hand from its header only.
+
+        The actions are not read, only the first line and the seats lines
+        are decoded and parsed.
+
+        Args:
+            raw_hand (bytes): A hand in PokerStars format.
+
+        Returns:
+            (hand_id, game_id, date, hour, small_blind, big_blind, pseudos)
+            where pseudos is the list of the seated players.
+    """
+    end = raw_hand.find(b'\n*** ')
+    lines = decode_hand(raw_hand[:end] if end != -1 else raw_hand).split('\n')
+    parser = FastPokerStarsParser(lines[0])
+    parser.read_hand_line(lines[0])
+    pseudos = []
+    for line in lines[1:]:
+        reg_player = SEAT_PATTERN.match(line)
+        if reg_player is not None:
+            pseudos.append(reg_player.group(2))
+    return parser.hand_id, parser.game_id, parser.date, parser.hour, parser.small_blind, parser.big_blind, pseudos
+
+
+class HandIndex:
+    """ An index giving the position of each hand in the hand history files.
+
+        The index is stored in a SQLite file. The files are scanned once,
+        only the header of the hands is read, and a later update only reads
+        the bytes appended to the files since the previous one. The indexed
+        part of a file is recognized by its hash (see hand_store.file_hash),
+        a file rewritten with other content is indexed again. A hand can
+        then be loaded by its id without parsing the rest of the file.
+
+        Args:
+            path (string): The path of the index file.
+
+        Attributes:
+            connection (sqlite3.Connection): The connection to the index file.
+    """
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            if self.connection.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+                # the tables have been written in another format
+                for table in ('t_indexed_file', 't_hand_index', 't_index_player'):
+                    self.connection.execute("DROP TABLE IF EXISTS {0}".format(table))
+                self.connection.execute("PRAGMA user_version = {0}".format(INDEX_VERSION))
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS t_indexed_file(
+                 d_path TEXT PRIMARY KEY,
+                 d_offset INTEGER,
+                 d_hash TEXT,
+                 d_size INTEGER,
+                 d_mtime INTEGER
+            )
+            """)
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS t_hand_index(
+                 d_hand_id INTEGER PRIMARY KEY,
+                 d_game_id INTEGER,
+                 d_date TEXT,
+                 d_hour TEXT,
+                 d_small_blind REAL,
+                 d_big_blind REAL,
+                 d_pseudos TEXT,
+                 d_path TEXT,
+                 d_offset INTEGER,
+                 d_length INTEGER
+            )
+            """)
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS t_index_player(
+                 d_pseudo TEXT,
+                 d_hand_id INTEGER,
+                 PRIMARY KEY (d_pseudo, d_hand_id)
+            ) WITHOUT ROWID
+            """)
+
+    def update(self, paths):
+        """ Index the hands added to the files since the last update.
+
+            The last hand of a file is only indexed once it is complete, so
+            that files being written can be indexed. A file whose size and
+            modification time did not change is skipped. A file smaller than
+            the indexed part, or whose indexed part has another hash, has been
+            rewritten and is indexed again from the beginning.
+
+            Args:
+                paths (list): The paths of the hand history files.
+
+            Returns:
+                The number of hands indexed.
+        """
+        count = 0
+        for path in paths:
+            path = os.path.abspath(path)
+            status = os.stat(path)
+            size, mtime = status.st_size, status.st_mtime_ns
+            row = self.connection.execute("SELECT d_offset, d_hash, d_size, d_mtime FROM t_indexed_file "
+                                          "WHERE d_path = ?", (path,)).fetchone()
+            offset = 0
+            if row is not None:
+                if row[2:] == (size, mtime):
+                    continue
+                if row[0] <= size and file_hash(path, row[0]) == row[1]:
+                    offset = row[0]
+                else:
+                    self.remove_file(path)
+            count += self.index_file(path, offset)
+            with self.connection:
+                self.connection.execute("INSERT OR IGNORE INTO t_indexed_file VALUES (?, 0, ?, NULL, NULL)",
+                                        (path, file_hash(path, 0)))
+                self.connection.execute("UPDATE t_indexed_file SET d_size = ?, d_mtime = ? WHERE d_path = ?",
+                                        (size, mtime, path))
+        return count
+
+    def index_file(self, path, offset):
+        """ Index the hands of a file starting at offset.
+
+            Args:
+                path (string): The absolute path of the hand history file.
+                offset (int): The position of the first hand to index.
+
+            Returns:
+                The number of hands indexed.
+        """
+        count = 0
+        hands = []
+        previous = None
+        for hand in iter_raw_hands(path, start=offset):
+            if previous is not None:
+                hands.append(previous)
+            previous = hand
+            if len(hands) >= BATCH_SIZE:
+                self.add_hands(path, hands)
+                count += len(hands)
+                hands = []
+        if previous is not None and is_complete_hand(previous[1]):
+            hands.append(previous)
+        if hands:
+            self.add_hands(path, hands)
+            count += len(hands)
+        return count
+
+    def add_hands(self, path, hands):
+        """ Write the index entries of hands of one file.
+
+            Args:
+                path (string): The absolute path of the hand history file.
+                hands (list): (offset, raw_hand) tuples in the file order.
+
+            Returns:
+                The position in the file after the last hand.
+        """
+        rows = []
+        players = []
+        for offset, raw_hand in hands:
+            hand_id, game_id, date, hour, small_blind, big_blind, pseudos = scan_header(raw_hand)
+            rows.append((hand_id, game_id, date, hour, small_blind, big_blind, '\n'.join(pseudos),
+                         path, offset, len(raw_hand)))
+            players.extend((pseudo, hand_id) for pseudo in pseudos)
+        end = hands[-1][0] + len(hands[-1][1])
+        digest = file_hash(path, end)
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO t_hand_index VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                        rows)
+            self.connection.executemany("INSERT OR IGNORE INTO t_index_player VALUES (?, ?)", players)
+            self.connection.execute("INSERT OR REPLACE INTO t_indexed_file VALUES (?, ?, ?, NULL, NULL)",
+                                    (path, end, digest))
+        return end
+
+    def remove_file(self, path):
+        """ Remove the hands of a file from the index.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM t_index_player WHERE d_hand_id IN "
+                                    "(SELECT d_hand_id FROM t_hand_index WHERE d_path = ?)", (path,))
+            self.connection.execute("DELETE FROM t_hand_index WHERE d_path = ?", (path,))
+            self.connection.execute("DELETE FROM t_indexed_file WHERE d_path = ?", (path,))
+
+    def lookup(self, hand_id):
+        """ Return the index entry of a hand.
+
+            Args:
+                hand_id (int): The id of the hand.
+
+            Returns:
+                An IndexEntry, or None if the hand is not indexed.
+        """
+        row = self.connection.execute("SELECT * FROM t_hand_index WHERE d_hand_id = ?", (hand_id,)).fetchone()
+        if row is None:
+            return None
+        row = list(row)
+        row[6] = row[6].split('\n') if row[6] else []
+        return IndexEntry(*row)
+
+    def find_hands(self, pseudo):
+        """ Return the ids of the hands played by a player, in increasing order.
+        """
+        rows = self.connection.execute("SELECT d_hand_id FROM t_index_player WHERE d_pseudo = ? ORDER BY d_hand_id",
+                                       (pseudo,))
+        return [row[0] for row in rows]
+
+    def read_hand(self, hand_id):
+        """ Return the raw bytes of a hand, read directly at its position.
+
+            Raises:
+                KeyError: The hand is not indexed, or its file changed since
+                    the last update and another hand is found at its position.
+        """
+        entry = self.lookup(hand_id)
+        if entry is None:
+            raise KeyError(hand_id)
+        with open(entry.path, 'rb') as file:
+            file.seek(entry.offset)
+            data = file.read(entry.length)
+        if read_hand_id(data) != hand_id:
+            raise KeyError(hand_id)
+        return data
+
+    def load_hand(self, hand_id, parser_class=FastPokerStarsParser):
+        """ Parse only one hand of the indexed files.
+
+            Args:
+                hand_id (int): The id of the hand.
+                parser_class (type): The parser used to read the hand.
+
+            Returns:
+                A Hand object
+
+            Raises:
+                KeyError: The hand is not indexed, see read_hand.
+        """
+        return parse_hand_text(decode_hand(self.read_hand(hand_id)), parser_class)
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM t_hand_index").fetchone()[0]
+
+    def close(self):
+        """ Close the index file.
+        """
+        self.connection.close()
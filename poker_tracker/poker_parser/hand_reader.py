@@ -0,0 +1,234 @@
+import os
+
+from poker_tracker.poker_parser.pokerstars_parser import PokerStarsParser
+
+HAND_START = b'\nPokerStars Hand #'  # A new hand always starts at the beginning of a line
+CHUNK_SIZE = 1 << 16                  # Default number of bytes read at once
+BOM = b'\xef\xbb\xbf'                 # UTF-8 byte order mark written by some clients
+
+
+class HandSplitter:
+    """ An incremental splitter of a PokerStars hand history byte stream.
+
+        The splitter is fed with chunks of bytes and returns the raw hands
+        as soon as their end is known, that is to say when the beginning of
+        the next hand has been read. Only the hand being read is kept in
+        memory, so the memory used depends on the hand size and not on
+        the file size. Bytes before the first hand (BOM, blank lines) are
+        dropped.
+
+        Args:
+            offset (int): The position in the stream of the first byte that
+                will be fed.
+
+        Attributes:
+            buffer (bytearray): The bytes read but not returned yet. The
+                buffer starts with a virtual new line so that the first hand
+                is found like the others.
+            base (int): The position in the stream of buffer[0].
+            start (int): The index in the buffer of the current hand start,
+                -1 if no hand has been found yet.
+    """
+    def __init__(self, offset=0):
+        self.buffer = bytearray(b'\n')
+        self.base = offset - 1
+        self.start = -1
+        self._scan = 0
+        self._head = True
+
+    def feed(self, data):
+        """ Add a chunk of bytes and return the hands completed by it.
+
+            Args:
+                data (bytes): The next bytes of the stream.
+
+            Returns:
+                A list of (offset, raw_hand) tuples where offset is the
+                position of the hand in the stream and raw_hand the bytes
+                of the hand.
+        """
+        self.buffer += data
+        if self._head:
+            head = bytes(self.buffer[1:1 + len(BOM)])
+            if len(head) < len(BOM) and BOM.startswith(head):
+                return []
+            if head == BOM:
+                # the last byte of the BOM takes the place of the virtual new line
+                del self.buffer[:len(BOM)]
+                self.buffer[0] = ord('\n')
+                self.base += len(BOM)
+            self._head = False
+        hands = []
+        while True:
+            index = self.buffer.find(HAND_START, self._scan)
+            if index == -1:
+                break
+            if self.start != -1:
+                hands.append((self.base + self.start, bytes(self.buffer[self.start:index + 1])))
+            self.start = index + 1
+            self._scan = self.start
+        self._scan = max(self._scan, len(self.buffer) - len(HAND_START) + 1)
+        self._compact()
+        return hands
+
+    def flush(self):
+        """ Return the last hand of the stream.
+
+            It must be called once the end of the stream is reached, the last
+            hand is not followed by another hand so its end is only known at
+            this moment.
+
+            Returns:
+                A list with the (offset, raw_hand) tuple of the last hand, or an
+                empty list if there is no hand left.
+        """
+        hands = []
+        if self.start != -1 and self.buffer[self.start:].strip():
+            hands.append((self.base + self.start, bytes(self.buffer[self.start:])))
+        self.base += len(self.buffer)
+        self.buffer = bytearray()
+        self.start = -1
+        self._scan = 0
+        return hands
+
+    def pending(self):
+        """ Return the hand being read, its end is not known yet.
+
+            Returns:
+                The (offset, raw_hand) tuple of the current hand, or None if
+                no hand has been found yet.
+        """
+        if self.start == -1:
+            return None
+        return self.base + self.start, bytes(self.buffer[self.start:])
+
+    def _compact(self):
+        """ Drop the bytes that have already been returned or that are not part of a hand.
+        """
+        if self.start == -1:
+            # no hand yet, only the end of the buffer can be the beginning of a hand
+            cut = max(0, len(self.buffer) - len(HAND_START) + 1)
+        else:
+            cut = self.start
+        if cut > 0:
+            del self.buffer[:cut]
+            self.base += cut
+            self._scan -= cut
+            if self.start != -1:
+                self.start -= cut
+
+
+def decode_hand(raw_hand):
+    """ Convert the raw bytes of a hand into the text expected by PokerStarsParser.
+
+        Args:
+            raw_hand (bytes): A hand from a PokerStars hand history file.
+
+        Returns:
+            The hand as a string with '\\n' line endings.
+    """
+    return raw_hand.decode('utf-8').replace('\r\n', '\n')
+
+
+def read_hand_id(raw_hand):
+    """ Read the id of a hand in its first line, "PokerStars Hand #<id>: ...".
+
+        Args:
+            raw_hand (bytes): A hand in PokerStars format.
+
+        Returns:
+            The hand id, 0 if it cannot be read.
+    """
+    start = raw_hand.find(b'#')
+    end = raw_hand.find(b':', start)
+    try:
+        return int(raw_hand[start + 1:end])
+    except ValueError:
+        return 0
+
+
+def parse_hand_text(hand_text, parser_class=PokerStarsParser, lazy=False):
+    """ Parse the text of one hand and return the Hand object.
+
+        Args:
+            hand_text (string): A complete hand in PokerStars format.
+            parser_class (type): The parser used to read the hand.
+            lazy (bool): Parse only the header and the setup, the other parts
+                are parsed when they are read (see LazyHand). Only
+                PokerStarsParser parses lazily.
+
+        Returns:
+            A Hand object.
+    """
+    parser = parser_class(hand_text)
+    parser.parse_hand(lazy)
+    return parser.load()
+
+
+def iter_raw_hands(source, chunk_size=CHUNK_SIZE, start=0, end=None):
+    """ Read the raw hands of a PokerStars hand history file one at a time.
+
+        A byte range of the file can be read with start and end, the hands
+        starting inside the range are returned entirely even if they end
+        after the range. The ranges of a file can then be read separately
+        and each hand is read exactly once.
+
+        Args:
+            source (string, os.PathLike or binary file): The path of the hand
+                history file or a stream opened in binary mode.
+            chunk_size (int): The number of bytes read at once.
+            start (int): The position where the reading starts.
+            end (int): The hands starting at this position or after are not
+                read. The file is read up to its end if None.
+
+        Returns:
+            A generator of (offset, raw_hand) tuples where offset is the
+            position of the hand in the file.
+    """
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, 'rb') as stream:
+            yield from iter_raw_hands(stream, chunk_size, start, end)
+        return
+
+    if start:
+        source.seek(start)
+    splitter = HandSplitter(source.tell() if source.seekable() else 0)
+    while True:
+        data = source.read(chunk_size)
+        if not data:
+            break
+        for offset, raw_hand in splitter.feed(data):
+            if end is not None and offset >= end:
+                return
+            yield offset, raw_hand
+    for offset, raw_hand in splitter.flush():
+        if end is None or offset < end:
+            yield offset, raw_hand
+
+
+def read_hands(source, chunk_size=CHUNK_SIZE, parser_class=PokerStarsParser, cache=None, lazy=False):
+    """ Parse the hands of a PokerStars hand history file one at a time.
+
+        The file is read by chunks and each hand is parsed as soon as it is
+        complete, the memory used does not grow with the file size.
+
+        Args:
+            source (string, os.PathLike or binary file): The path of the hand
+                history file or a stream opened in binary mode.
+            chunk_size (int): The number of bytes read at once.
+            parser_class (type): The parser used to read the hands.
+            cache (ParseCache): A cache of the parsed hands. If given the hands
+                already parsed are read from the cache, and the cache parser
+                is used for the other ones.
+            lazy (bool): Parse only the header and the setup of the hands not
+                read from the cache, see LazyHand. Only PokerStarsParser
+                parses lazily.
+
+        Returns:
+            A generator of Hand objects, in the file order.
+    """
+    for _, raw_hand in iter_raw_hands(source, chunk_size):
+        if cache is not None:
+            yield cache.parse_raw(raw_hand)
+        else:
+            yield parse_hand_text(decode_hand(raw_hand), parser_class, lazy)
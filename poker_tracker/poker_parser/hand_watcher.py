@@ -0,0 +1,175 @@
+import logging
+import os
+import time
+
+from poker_tracker.poker_parser.pokerstars_parser import PokerStarsParser
+from poker_tracker.poker_parser.hand_reader import HandSplitter, CHUNK_SIZE, decode_hand, parse_hand_text
+
+POLL_INTERVAL = 0.01  # Seconds between two checks of the watched files
+
+logger = logging.getLogger(__name__)
+
+
+def is_complete_hand(raw_hand):
+    """ Tell if the last hand of a file has been entirely written.
+
+        The client writes the summary at the end of the hand and then blank
+        lines before the next hand, so a hand is complete once its summary is
+        followed by a blank line.
+
+        Args:
+            raw_hand (bytes): The last hand of a file.
+
+        Returns:
+            True if the hand is complete.
+    """
+    summary = raw_hand.find(b'*** SUMMARY ***')
+    if summary == -1:
+        return False
+    end = raw_hand[summary:].rstrip(b' \t')
+    return end.endswith(b'\n\n') or end.endswith(b'\n\r\n')
+
+
+class WatchedFile:
+    """ The reading state of a followed hand history file.
+
+        Args:
+            path (string): The path of the hand history file.
+            offset (int): The position in the file where the reading starts.
+
+        Attributes:
+            path (string): The path of the hand history file.
+            offset (int): The number of bytes of the file already read.
+            splitter (HandSplitter): The splitter holding the hand being written.
+            last_hand (int): The offset of the last hand sent to the subscribers.
+    """
+    def __init__(self, path, offset=0):
+        self.path = path
+        self.offset = offset
+        self.splitter = HandSplitter(offset)
+        self.last_hand = -1
+
+
+class HandWatcher:
+    """ A watcher following hand history files while the client writes them.
+
+        Each poll only checks the size of the files, and reads and parses the
+        bytes appended since the previous poll. The last hand of a file is sent
+        as soon as it is complete, see is_complete_hand. A file that gets
+        smaller has been rewritten and is read again from the start.
+
+        Args:
+            paths (list): The paths of the files to follow.
+            parser_class (type): The parser used to read the hands.
+            from_start (bool): Send the hands already written in the files.
+                Otherwise only the hands written after the call to watch are sent.
+
+        Attributes:
+            files (dict): WatchedFile referenced by the file path.
+            subscribers (list): The callables receiving (path, hand) for each
+                new hand.
+            parser_class (type): The parser used to read the hands.
+    """
+    def __init__(self, paths=(), parser_class=PokerStarsParser, from_start=False):
+        self.files = {}
+        self.subscribers = []
+        self.parser_class = parser_class
+        for path in paths:
+            self.watch(path, from_start)
+
+    def watch(self, path, from_start=False):
+        """ Start following a file.
+
+            Args:
+                path (string): The path of the hand history file.
+                from_start (bool): Send the hands already written in the file.
+        """
+        offset = 0
+        if not from_start and os.path.exists(path):
+            offset = os.path.getsize(path)
+        self.files[path] = WatchedFile(path, offset)
+
+    def unwatch(self, path):
+        """ Stop following a file.
+        """
+        self.files.pop(path, None)
+
+    def subscribe(self, callback):
+        """ Register a callable called with (path, hand) for each new hand.
+        """
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """ Remove a callable registered with subscribe.
+        """
+        self.subscribers.remove(callback)
+
+    def poll(self):
+        """ Read the new hands of all the watched files and send them to the subscribers.
+
+            Returns:
+                The number of hands sent.
+        """
+        count = 0
+        for watched in list(self.files.values()):
+            for offset, raw_hand in self.read_new_hands(watched):
+                try:
+                    hand = parse_hand_text(decode_hand(raw_hand), self.parser_class)
+                except Exception:
+                    logger.warning("Unable to parse the hand at %s:%d", watched.path, offset, exc_info=True)
+                    continue
+                for callback in list(self.subscribers):
+                    callback(watched.path, hand)
+                count += 1
+        return count
+
+    def read_new_hands(self, watched):
+        """ Read the bytes appended to a file and return its new complete hands.
+
+            Args:
+                watched (WatchedFile): The file to read.
+
+            Returns:
+                A list of (offset, raw_hand) tuples.
+        """
+        try:
+            size = os.stat(watched.path).st_size
+        except OSError:
+            return []
+        if size < watched.offset:
+            # the file has been truncated or replaced
+            logger.info("%s is smaller than before, it is read again", watched.path)
+            self.files[watched.path] = watched = WatchedFile(watched.path)
+        if size == watched.offset:
+            return []
+
+        hands = []
+        with open(watched.path, 'rb') as stream:
+            stream.seek(watched.offset)
+            while watched.offset < size:
+                data = stream.read(min(CHUNK_SIZE, size - watched.offset))
+                if not data:
+                    break
+                watched.offset += len(data)
+                hands.extend(watched.splitter.feed(data))
+
+        pending = watched.splitter.pending()
+        if pending is not None and is_complete_hand(pending[1]):
+            hands.append(pending)
+        # the pending hand is returned again by the splitter once the next hand starts
+        hands = [(offset, raw_hand) for offset, raw_hand in hands if offset > watched.last_hand]
+        if hands:
+            watched.last_hand = hands[-1][0]
+        return hands
+
+    def run(self, interval=POLL_INTERVAL, stop=None):
+        """ Poll the watched files until stop is set.
+
+            Args:
+                interval (float): The time in seconds between two polls.
+                stop (threading.Event): Stop the loop when it is set, the loop
+                    never stops if None.
+        """
+        while stop is None or not stop.is_set():
+            self.poll()
+            time.sleep(interval)
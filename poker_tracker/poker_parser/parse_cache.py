@@ -0,0 +1,173 @@
+import hashlib
+import marshal
+import sqlite3
+import sys
+
+from poker_tracker.data.hand import Hand, RECORD_VERSION
+from poker_tracker.poker_parser.pokerstars_parser import PokerStarsParser
+from poker_tracker.poker_parser.hand_reader import decode_hand, parse_hand_text, read_hand_id
+
+MAX_SIZE = 256 << 20  # Default maximum size in bytes of the cached records
+BATCH_SIZE = 1000     # Number of cache operations written to the disk at once
+# Version of the stored records, in PRAGMA user_version: the record format and the
+# Python version, since the marshal format may change from one Python version to another
+CACHE_VERSION = (RECORD_VERSION << 16) | (sys.version_info[0] << 8) | sys.version_info[1]
+
+
+def hand_key(raw_hand):
+    """ Compute the cache key of a hand.
+
+        Args:
+            raw_hand (bytes): A hand in PokerStars format.
+
+        Returns:
+            (hand_id, digest) where digest is a hash of the hand text. The
+            hand_id is 0 if it cannot be read in the first line, see
+            hand_reader.read_hand_id.
+    """
+    raw_hand = raw_hand.rstrip()
+    return read_hand_id(raw_hand), hashlib.blake2b(raw_hand, digest_size=16).digest()
+
+
+class ParseCache:
+    """ A persistent cache of the parsed hands.
+
+        The hands are stored in a SQLite file, referenced by the hand id and a
+        hash of the hand text, so a hand is parsed again only if its text
+        changed. The Hand is stored as its record (see Hand.to_record)
+        serialized with marshal, the records of another RECORD_VERSION or
+        written by another Python version are removed when the cache is
+        opened (see CACHE_VERSION). A record that cannot be read is removed
+        and its hand is parsed again. When the records take more than
+        max_size bytes, the least recently used ones are removed.
+
+        The writes are grouped by BATCH_SIZE, flush or close must be called
+        to save the last ones. The cache can be used as a context manager.
+
+        Args:
+            path (string): The path of the cache file.
+            max_size (int): The maximum size in bytes of the stored records.
+            parser_class (type): The parser used for the hands missing in the cache.
+
+        Attributes:
+            connection (sqlite3.Connection): The connection to the cache file.
+            max_size (int): The maximum size in bytes of the stored records.
+            size (int): The current size in bytes of the stored records.
+            parser_class (type): The parser used for the hands missing in the cache.
+            hits (int): The number of hands found in the cache.
+            misses (int): The number of hands parsed.
+    """
+    def __init__(self, path, max_size=MAX_SIZE, parser_class=PokerStarsParser):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("""CREATE TABLE IF NOT EXISTS t_parse_cache(
+             d_hand_id INTEGER,
+             d_digest BLOB,
+             d_record BLOB,
+             d_used INTEGER,
+             PRIMARY KEY (d_hand_id, d_digest)
+        )
+        """)
+        self.connection.execute("CREATE INDEX IF NOT EXISTS i_parse_cache_used ON t_parse_cache(d_used)")
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+            # the records have been written in another format
+            self.connection.execute("DELETE FROM t_parse_cache")
+            self.connection.execute("PRAGMA user_version = {0}".format(CACHE_VERSION))
+        self.connection.commit()
+        self.max_size = max_size
+        self.parser_class = parser_class
+        self.size, self.clock = self.connection.execute(
+            "SELECT IFNULL(SUM(LENGTH(d_record)), 0), IFNULL(MAX(d_used), 0) FROM t_parse_cache").fetchone()
+        self.hits = 0
+        self.misses = 0
+        self._used = []     # keys of the hands read since the last flush
+        self._records = {}  # key: (hand_id, digest) | value: record of the hands parsed since the last flush
+
+    def parse(self, hand_text):
+        """ Return the Hand of a hand text, parsed or read from the cache.
+
+            Args:
+                hand_text (string): A complete hand in PokerStars format.
+
+            Returns:
+                A Hand object
+        """
+        return self.parse_raw(hand_text.encode('utf-8'))
+
+    def parse_raw(self, raw_hand):
+        """ Return the Hand of a raw hand, parsed or read from the cache.
+
+            Args:
+                raw_hand (bytes): A complete hand in PokerStars format.
+
+            Returns:
+                A Hand object
+        """
+        key = hand_key(raw_hand)
+        record = self._records.get(key)
+        if record is None:
+            row = self.connection.execute("SELECT d_record FROM t_parse_cache WHERE d_hand_id = ? AND d_digest = ?",
+                                          key).fetchone()
+            if row is not None:
+                self._used.append(key)
+                record = row[0]
+        hand = None
+        if record is not None:
+            try:
+                hand = Hand.from_record(marshal.loads(record))
+            except (ValueError, EOFError, TypeError, IndexError):
+                # a damaged record is a miss
+                self.connection.execute("DELETE FROM t_parse_cache WHERE d_hand_id = ? AND d_digest = ?", key)
+                self.size -= len(record)
+            else:
+                self.hits += 1
+        if hand is None:
+            self.misses += 1
+            hand = parse_hand_text(decode_hand(raw_hand), self.parser_class)
+            self._records[key] = marshal.dumps(hand.to_record())
+        if len(self._used) + len(self._records) >= BATCH_SIZE:
+            self.flush()
+        return hand
+
+    def flush(self):
+        """ Write the pending operations and remove the oldest records if the cache is too big.
+        """
+        self.clock += 1
+        with self.connection:
+            self.connection.executemany("UPDATE t_parse_cache SET d_used = ? WHERE d_hand_id = ? AND d_digest = ?",
+                                        ((self.clock,) + key for key in self._used))
+            self.connection.executemany("INSERT OR REPLACE INTO t_parse_cache VALUES (?, ?, ?, ?)",
+                                        (key + (record, self.clock) for key, record in self._records.items()))
+            self.size += sum(len(record) for record in self._records.values())
+            self._used = []
+            self._records = {}
+            if self.size > self.max_size:
+                self.evict()
+
+    def evict(self):
+        """ Remove the least recently used records until the cache fits in max_size.
+        """
+        cursor = self.connection.execute("SELECT d_hand_id, d_digest, LENGTH(d_record) FROM t_parse_cache "
+                                         "ORDER BY d_used")
+        removed = []
+        for hand_id, digest, size in cursor:
+            if self.size <= self.max_size:
+                break
+            removed.append((hand_id, digest))
+            self.size -= size
+        cursor.close()
+        self.connection.executemany("DELETE FROM t_parse_cache WHERE d_hand_id = ? AND d_digest = ?", removed)
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM t_parse_cache").fetchone()[0] + len(self._records)
+
+    def close(self):
+        """ Write the pending operations and close the cache file.
+        """
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
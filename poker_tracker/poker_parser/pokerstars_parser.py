@@ -5,6 +5,18 @@ from poker_tracker.data.action import ActionType, Action
 from poker_tracker.data.card import Card, Value, Color
 from poker_tracker.data.hand import Hand, SeatInfo
 
+# "collected" lines of the pots won, the summary lines have another format
+COLLECTED_PATTERN = re.compile(r'^(.+) collected €?([0-9.]+) from', re.MULTILINE)
+# blinds and antes posted before the hole cards
+POST_PATTERN = re.compile(r'^(.+): posts (the ante|small blind|big blind|small & big blinds) €?([0-9.]+)')
+
+
+# PokerStars characters of the cards colors and values
+CARD_COLORS = {'s': Color.SPADES, 'c': Color.CLUBS, 'd': Color.DIAMONDS, 'h': Color.HEARTS}
+CARD_VALUES = {'2': Value.TWO, '3': Value.THREE, '4': Value.FOUR, '5': Value.FIVE, '6': Value.SIX,
+               '7': Value.SEVEN, '8': Value.EIGHT, '9': Value.NINE, 'T': Value.TEN, 'J': Value.JACK,
+               'Q': Value.QUEEN, 'K': Value.KING, 'A': Value.ACE}
+
 
 def define_card_color(char):
     """  A transcoder form pokerstar cards color to the data cards color.
@@ -24,16 +36,7 @@ def define_card_color(char):
         Returns:
             A Color enum
     """
-    if char == 's':
-        return Color.SPADES
-    elif char == 'c':
-        return Color.CLUBS
-    elif char == 'd':
-        return Color.DIAMONDS
-    elif char == 'h':
-        return Color.HEARTS
-    else:
-        return Color.UNDEFINED
+    return CARD_COLORS.get(char, Color.UNDEFINED)
 
 
 def define_card_value(char):
@@ -50,42 +53,15 @@ def define_card_value(char):
         Returns:
             Return Value enum
     """
-    if char == '2':
-        return Value.TWO
-    elif char == '3':
-        return Value.THREE
-    elif char == '4':
-        return Value.FOUR
-    elif char == '5':
-        return Value.FIVE
-    elif char == '6':
-        return Value.SIX
-    elif char == '7':
-        return Value.SEVEN
-    elif char == '8':
-        return Value.EIGHT
-    elif char == '9':
-        return Value.NINE
-    elif char == 'T':
-        return Value.TEN
-    elif char == 'J':
-        return Value.JACK
-    elif char == 'Q':
-        return Value.QUEEN
-    elif char == 'K':
-        return Value.KING
-    elif char == 'A':
-        return Value.ACE
-    else:
-        return Value.UNDEFINED
+    return CARD_VALUES.get(char, Value.UNDEFINED)
 
 
 def define_card(card):
     """ A transcorder from the Pokerstars' card to the data's card 
 
         This function convert the Pokerstars representation of a card
-        to the data card representation. This function uses define_card_value
-        and define_card_color.
+        to the data card representation. The cards are shared instances,
+        so a known card is a single lookup, see Card.from_text.
 
         Args :
             card (string): The representation of a card in Pokerstars format
@@ -94,10 +70,8 @@ def define_card(card):
             Return a Card object
     """
     try:
-        value = define_card_value(card[0])
-        color = define_card_color(card[1])
-        return Card(value, color)
-    except AttributeError:
+        return Card.from_text(card)
+    except (AttributeError, TypeError):
         pass
 
 
@@ -187,7 +161,7 @@ class PokerStarsParser:
             small_blind (float): The current small blind
             big_blind (float): The current big blind
             ante (float): The ante amount
-            date (string): The day mm/dd/year
+            date (string): The day year/mm/dd
             hour (string): The hour hh:mm:ss
             table_name (string): The table name (mostly for cash game)
             table_size (int): The maximum capacity at the table
@@ -206,6 +180,9 @@ class PokerStarsParser:
             board_river (list): List of the river cards
             part_dict (dict):  Line with action sequence and extra info (board,
                 card dealt) referenced by the name of the part.
+            rest_part (string): The text from the flop to the end of the hand,
+                not yet split in parts (see parse_part).
+            lazy (bool): True if parse_hand only parsed the header and the setup.
     """
 
     position_name_list = [
@@ -246,6 +223,7 @@ class PokerStarsParser:
         self.stacks = {}     # key: position_name         | value: initial stack of the player
         self.players = {}    # key: pseudo of the players | value: position_name
         self.positions = {}  # key: position_name         | value: pseudo of the players
+        self.blinds = {}     # key: position_name         | value: blinds posted by the player
 
         # Actions :
         self.action_preflop = []  # Action pre-flop
@@ -258,32 +236,55 @@ class PokerStarsParser:
         self.board_turn = []   # Cards on the turn
         self.board_river = []  # Cards on the river
 
+        # Result :
+        self.collected = {}  # key: position_name | value: amount won in the pots
+
         # utility
         self.part_dict = {}   # key: part name | value: line with action sequence and extra info (board, card dealt)
+        self.rest_part = ""   # Text from the flop not yet split in parts
+        self.lazy = False     # Only the header and the setup are parsed by parse_hand
 
         # log manager
         self.logger = logging.getLogger()
         self.formatter = logging.Formatter('%(asctime)s :: %(levelname)s :: %(message)s')
 
-    def parse_part(self):
+    def parse_part(self, lazy=False):
         """ Parse the hand file in different parts
         
             Not all hands have the name number of parts, it return a dict with the part name
             as key and content as value
 
-            Returns:
-                Return a dict of the different division of the hand history
+            Args:
+                lazy (bool): Split only the header and the preflop parts, the
+                    text from the flop is kept in rest_part and split by
+                    parse_rest.
         """
-        parts = []
-        for part in re.split(r'\*\*\* ([A-Z- ]+) \*\*\*', self.hand_file):  # return [ 'part1', 'splitter1', 'part2',..
-            parts.append(part)
+        text = self.hand_file
+        if lazy:
+            text, splitter, rest = text.partition('*** FLOP ***')
+            self.rest_part = splitter + rest
+        self.part_dict['HEADER'] = self.split_part(text)
+
+    def parse_rest(self):
+        """ Split the parts from the flop kept aside by parse_part.
+        """
+        if self.rest_part:
+            self.split_part(self.rest_part)
+            self.rest_part = ""
+
+    def split_part(self, text):
+        """ Add the parts of a text to part_dict.
 
-        for i in range(0, len(parts)):
-            if i == 0:
-                self.part_dict['HEADER'] = parts[i]
-            if i % 2 != 0:  # number is odd
-                self.part_dict[parts[i]] = parts[i + 1]
+            Args:
+                text (string): A part of the hand file.
 
+            Returns:
+                The text before the first part name.
+        """
+        parts = re.split(r'\*\*\* ([A-Z- ]+) \*\*\*', text)  # return [ 'part1', 'splitter1', 'part2',..
+        for i in range(1, len(parts), 2):
+            self.part_dict[parts[i]] = parts[i + 1]
+        return parts[0]
 
     def parse_header(self):
         """ Parse the header.
@@ -311,6 +312,13 @@ class PokerStarsParser:
                     reg_blind = re.search(r'\(€?([0-9-.]+)/€?([0-9-.]+)( EUR)?\)', line)
                     self.small_blind = float(reg_blind.group(1))
                     self.big_blind = float(reg_blind.group(2))
+                    # find date and hour
+                    try:
+                        reg_date = re.search(r' - ([0-9]{4}/[0-9]{2}/[0-9]{2}) ([0-9]{1,2}:[0-9]{2}:[0-9]{2})', line)
+                        self.date = reg_date.group(1)
+                        self.hour = reg_date.group(2)
+                    except AttributeError:
+                        pass
                     # find buy in
                     try:
                         reg_buy_in = re.search(r'€?([0-9-.]+)\+€?([0-9-.]+)( EUR)?', line)
@@ -352,7 +360,7 @@ class PokerStarsParser:
         lines = self.part_dict['HEADER'].split('\n')
         for line in lines:
             if line[0:4] == "Seat":
-                reg_player = re.search(r'(.): (.+) \(€?([0-9-.]+)', line)
+                reg_player = re.search(r'Seat ([0-9]+): (.+) \(€?([0-9-.]+)', line)
                 player_seat = int(reg_player.group(1))
                 player_name = reg_player.group(2)
                 player_stack = float(reg_player.group(3))
@@ -361,6 +369,33 @@ class PokerStarsParser:
                 self.players[player_name] = position
                 self.stacks[position] = player_stack
 
+    def parse_posts(self):
+        """ Read the blinds and the antes posted in the header.
+
+            The ante is the amount posted by the players, a player posting
+            the ante with a shorter stack posts less.
+        """
+        for line in self.part_dict['HEADER'].split('\n'):
+            reg_post = POST_PATTERN.match(line)
+            if reg_post is not None:
+                self.add_post(reg_post.group(1), reg_post.group(2), float(reg_post.group(3)))
+
+    def add_post(self, pseudo, post, amount):
+        """ Record a blind or an ante.
+
+            Args:
+                pseudo (string): The pseudo of the player.
+                post (string): "the ante", "small blind", "big blind" or "small & big blinds".
+                amount (float): The amount posted.
+        """
+        position = self.players.get(pseudo)
+        if position is None:
+            return
+        if post == "the ante":
+            self.ante = max(self.ante, amount)
+        else:
+            self.blinds[position] = self.blinds.get(position, 0) + amount
+
     def position(self, seat):
         """ Define the position of the player
             
@@ -404,9 +439,9 @@ class PokerStarsParser:
                     try:
                         pseudo, action_type, amount = read_action(line)
                         self.action_preflop.append(Action(self.players[pseudo], action_type, amount))
-                    except TypeError:
+                    except (TypeError, KeyError):
                         pass
-        except AttributeError:
+        except (AttributeError, KeyError):
             pass
 
     def parse_flop(self):
@@ -430,9 +465,9 @@ class PokerStarsParser:
                     try:
                         pseudo, action_type, amount = read_action(lines[i])
                         self.action_flop.append(Action(self.players[pseudo], action_type, amount))
-                    except AttributeError:
+                    except (TypeError, KeyError):
                         pass
-        except AttributeError:
+        except (AttributeError, KeyError):
             pass
 
     def parse_turn(self):
@@ -456,9 +491,9 @@ class PokerStarsParser:
                     try:
                         pseudo, action_type, amount = read_action(lines[i])
                         self.action_turn.append(Action(self.players[pseudo], action_type, amount))
-                    except AttributeError:
+                    except (TypeError, KeyError):
                         pass
-        except AttributeError:
+        except (AttributeError, KeyError):
             pass
 
     def parse_river(self):
@@ -482,9 +517,9 @@ class PokerStarsParser:
                     try:
                         pseudo, action_type, amount = read_action(lines[i])
                         self.action_river.append(Action(self.players[pseudo], action_type, amount))
-                    except AttributeError:
+                    except (TypeError, KeyError):
                         pass
-        except AttributeError:
+        except (AttributeError, KeyError):
             pass
 
     def parse_showdown(self):
@@ -505,9 +540,21 @@ class PokerStarsParser:
                         self.cards[self.players[player]] = cards
                 except AttributeError:
                     pass
-        except AttributeError:
+        except (AttributeError, KeyError):
             pass
 
+    def parse_collected(self):
+        """ Read the amounts won by the players.
+
+            The pots are collected in the part where the hand ended, the
+            "collected" lines are searched in the whole hand. A player winning
+            several pots gets the sum of the pots.
+        """
+        for reg_collected in COLLECTED_PATTERN.finditer(self.hand_file):
+            position = self.players.get(reg_collected.group(1))
+            if position is not None:
+                self.collected[position] = self.collected.get(position, 0) + float(reg_collected.group(2))
+
     def conclude_hand(self):
         """ Make the final operation
 
@@ -517,21 +564,48 @@ class PokerStarsParser:
             if position not in self.cards:
                 self.cards[position] = (Card(), Card()) 
 
-    def parse_hand(self):
+    def parse_hand(self, lazy=False):
         """ Parse all the hand
+
+            Args:
+                lazy (bool): Parse only the header and the setup. The other
+                    parts are parsed when they are read in the Hand returned
+                    by load, see LazyHand, and the parts from the flop are
+                    not even split. The header, the setup and the preflop
+                    take most of the parse time, so a preflop statistic
+                    saves only about a third of the time.
         """
-        self.parse_part()
+        self.lazy = lazy
+        self.parse_part(lazy)
         self.parse_header()
         self.parse_setup()
+        self.parse_posts()
+        if lazy:
+            return
         self.parse_preflop()
         self.parse_flop()
         self.parse_turn()
         self.parse_river()
         self.parse_showdown()
+        self.parse_collected()
         self.conclude_hand()
-    
+
+    def load_seats(self):
+        """ Create the seats of the hand.
+
+            Returns:
+                A dict of SeatInfo referenced by the position.
+        """
+        seats = {}
+        for player_pseudo, position in self.players.items():
+            seats[position] = SeatInfo(player_pseudo, self.stacks[position], self.cards[position])
+        return seats
+
     def load(self):
-        hand = Hand()
+        if self.lazy:
+            hand = LazyHand(self)
+        else:
+            hand = Hand()
 
         # Game and Hand ID
         hand.id = self.hand_id
@@ -544,12 +618,15 @@ class PokerStarsParser:
         hand.small_blind = self.small_blind
         hand.big_blind = self.big_blind
         hand.ante = self.ante
+        hand.blinds = self.blinds
 
-        # Game init
         for player_pseudo, position in self.players.items():
-            seat_info = SeatInfo(player_pseudo, self.stacks[position], self.cards[position])
-            hand.seats[position] = seat_info
             hand.pseudo_seats[player_pseudo] = position
+        if self.lazy:
+            return hand
+
+        # Game init
+        hand.seats = self.load_seats()
 
         # Board association
         hand.board_flop = self.board_flop
@@ -562,4 +639,104 @@ class PokerStarsParser:
         hand.action_turn = self.action_turn
         hand.action_river = self.action_river
 
-        return hand
\ No newline at end of file
+        # Result
+        hand.collected = self.collected
+
+        return hand
+
+
+def lazy_attribute(name):
+    """ Create the property of a LazyHand attribute loaded on first access.
+
+        Args:
+            name (string): The name of the Hand attribute.
+
+        Returns:
+            A property
+    """
+    def getter(hand):
+        if name not in hand._loaded:
+            hand.load(name)
+        return hand._values[name]
+
+    def setter(hand, value):
+        hand._values[name] = value
+        hand._loaded.add(name)
+
+    return property(getter, setter)
+
+
+class LazyHand(Hand):
+    """ A Hand whose seats, boards and actions are parsed the first time they are read.
+
+        The header and the setup are parsed before the LazyHand is created,
+        the other parts of the hand are parsed only if they are used. For
+        instance the flop, turn and river are never split nor parsed by a
+        preflop statistic. The seats need the hole cards and the showdown, so
+        the preflop and showdown parts are parsed when the seats are read.
+
+        It is created by PokerStarsParser.load after parse_hand(lazy=True).
+
+        Args:
+            parser (PokerStarsParser): The parser of the hand.
+    """
+    # key: attribute | value: parser method filling the attribute
+    parse_methods = {
+        "action_preflop": "parse_preflop",
+        "board_flop": "parse_flop",
+        "action_flop": "parse_flop",
+        "board_turn": "parse_turn",
+        "action_turn": "parse_turn",
+        "board_river": "parse_river",
+        "action_river": "parse_river",
+        "collected": "parse_collected",
+    }
+    # parser methods reading the parts from the flop
+    rest_methods = {"parse_flop", "parse_turn", "parse_river", "parse_showdown"}
+    __slots__ = ('_parser', '_values', '_loaded', '_parsed')
+
+    def __init__(self, parser):
+        self._parser = parser
+        self._values = {}   # key: attribute | value: value of the loaded attributes
+        self._loaded = set()
+        self._parsed = set()  # parser methods already called
+        super().__init__()
+        # the default values set by Hand are not loaded values
+        self._loaded = set()
+
+    def parse(self, method):
+        """ Call a parse method of the parser once.
+        """
+        if method not in self._parsed:
+            self._parsed.add(method)
+            if method in LazyHand.rest_methods:
+                self.parse("parse_rest")
+            getattr(self._parser, method)()
+
+    def load(self, name):
+        """ Parse the part of the hand needed by an attribute and set it.
+
+            Args:
+                name (string): The name of the attribute.
+        """
+        if name == "seats":
+            # hole cards are dealt in the preflop part
+            self.parse("parse_preflop")
+            self.parse("parse_showdown")
+            self.parse("conclude_hand")
+            value = self._parser.load_seats()
+        else:
+            self.parse(LazyHand.parse_methods[name])
+            value = getattr(self._parser, name)
+        self._values[name] = value
+        self._loaded.add(name)
+
+    seats = lazy_attribute("seats")
+    board_flop = lazy_attribute("board_flop")
+    board_turn = lazy_attribute("board_turn")
+    board_river = lazy_attribute("board_river")
+    action_preflop = lazy_attribute("action_preflop")
+    action_flop = lazy_attribute("action_flop")
+    action_turn = lazy_attribute("action_turn")
+    action_river = lazy_attribute("action_river")
+    collected = lazy_attribute("collected")
@@ -0,0 +1,231 @@
+import re
+import zlib
+from collections import Counter
+from itertools import chain, islice
+
+from poker_tracker.data_base.connection import Database
+from poker_tracker.poker_parser.fast_parser import FastPokerStarsParser
+from poker_tracker.poker_parser.hand_reader import iter_raw_hands, decode_hand, parse_hand_text, read_hand_id
+
+BLOCK_SIZE = 64            # Default number of hands compressed together
+DICTIONARY_SIZE = 32 << 10  # Maximum size in bytes of the dictionary, the size of the deflate window
+TRAINING_HANDS = 1000      # Number of hands read to train the dictionary
+HAND_SEPARATOR = b'\n\n\n'  # Written between the hands of a block, as in the hand history files
+HEADER_END = b'\n*** HOLE CARDS ***'
+NUMBER_PATTERN = re.compile(rb'[0-9]+')
+
+
+def train_dictionary(raw_hands, size=DICTIONARY_SIZE):
+    """ Build a zlib dictionary from the headers of sample hands.
+
+        The header lines are cut at the numbers, so that the amounts, the
+        ids and the dates are left out, and the fragments seen more than once
+        are kept by number of bytes they cover. The most useful fragments are
+        written at the end of the dictionary, the nearest to the compressed
+        data, since deflate encodes the shortest distances with fewer bits.
+
+        Args:
+            raw_hands (iterable): Hands in PokerStars format, as bytes.
+            size (int): The maximum size in bytes of the dictionary.
+
+        Returns:
+            The dictionary, as bytes.
+    """
+    counts = Counter()
+    for raw_hand in raw_hands:
+        end = raw_hand.find(HEADER_END)
+        for line in (raw_hand[:end] if end != -1 else raw_hand).split(b'\n'):
+            counts.update(fragment for fragment in NUMBER_PATTERN.split(line.strip()) if len(fragment) > 2)
+    fragments = []
+    total = 0
+    for fragment, count in sorted(counts.items(), key=lambda item: item[1] * len(item[0]), reverse=True):
+        if count < 2:
+            break
+        if total + len(fragment) <= size:
+            fragments.append(fragment)
+            total += len(fragment)
+    return b''.join(reversed(fragments))
+
+
+class HandTextStore:
+    """ A compressed store of the original text of the hands.
+
+        The hands are compressed in blocks of block_size hands with zlib,
+        the hands of a block share their repeated lines and pseudos. The
+        compressor starts with a dictionary trained on the headers of the
+        first hands stored (see train_dictionary), which is saved with the
+        blocks, so a small block is compressed as well as a large one.
+
+        The index gives for each hand id its block and the position of its
+        text in the uncompressed block. A hand is read by decompressing its
+        block only up to the end of the hand, the following hands are not
+        decompressed.
+
+        The hands are written by blocks, flush or close must be called to
+        write the last one. The blocks written by one add_hands or flush are
+        written in one transaction. The store can be used as a context
+        manager.
+
+        Args:
+            database (Database): The database, or the path of the store file.
+            block_size (int): The number of hands compressed together.
+
+        Attributes:
+            database (Database): The database of the store.
+            block_size (int): The number of hands compressed together.
+            dictionary (bytes): The zlib dictionary, None until the first hands are stored.
+    """
+    def __init__(self, database, block_size=BLOCK_SIZE):
+        if isinstance(database, str):
+            database = Database(database)
+        self.database = database
+        with database.transaction():
+            database.execute("""CREATE TABLE IF NOT EXISTS t_text_dictionary(
+                 d_id INTEGER PRIMARY KEY,
+                 d_data BLOB
+            )
+            """)
+            database.execute("""CREATE TABLE IF NOT EXISTS t_text_block(
+                 d_id INTEGER PRIMARY KEY,
+                 d_data BLOB
+            )
+            """)
+            database.execute("""CREATE TABLE IF NOT EXISTS t_hand_text(
+                 d_hand_id INTEGER PRIMARY KEY,
+                 d_block_id INTEGER,
+                 d_offset INTEGER,
+                 d_length INTEGER
+            )
+            """)
+        row = database.execute("SELECT d_data FROM t_text_dictionary WHERE d_id = 1").fetchone()
+        self.dictionary = row[0] if row is not None else None
+        self.block_size = block_size
+        self._pending = {}  # key: hand id | value: raw hand waiting for its block
+
+    def add_hands(self, raw_hands):
+        """ Store hands, the hands already stored are ignored.
+
+            The hand id is read in the first line, see
+            hand_reader.read_hand_id, the hands without id are ignored.
+
+            Args:
+                raw_hands (iterable): Complete hands in PokerStars format, as bytes.
+
+            Returns:
+                The number of hands added.
+        """
+        count = 0
+        with self.database.transaction():
+            for raw_hand in raw_hands:
+                raw_hand = raw_hand.strip()
+                hand_id = read_hand_id(raw_hand)
+                if not hand_id or hand_id in self:
+                    continue
+                self._pending[hand_id] = raw_hand
+                count += 1
+                if self.dictionary is None and len(self._pending) < TRAINING_HANDS:
+                    continue  # more hands are read to train the dictionary
+                while len(self._pending) >= self.block_size:
+                    self.write_block(self._take(self.block_size))
+        return count
+
+    def add_file(self, path):
+        """ Store the hands of a hand history file.
+
+            Returns:
+                The number of hands added.
+        """
+        return self.add_hands(raw_hand for _, raw_hand in iter_raw_hands(path))
+
+    def write_block(self, hands):
+        """ Compress hands in a new block.
+
+            Args:
+                hands (list): (hand_id, raw_hand) tuples.
+        """
+        if self.dictionary is None:
+            # trained on the hands of the block and the ones waiting for the next blocks
+            self.dictionary = train_dictionary(chain((raw_hand for _, raw_hand in hands), self._pending.values()))
+            self.database.execute("INSERT INTO t_text_dictionary VALUES (1, ?)", (self.dictionary,))
+        rows = []
+        offset = 0
+        for hand_id, raw_hand in hands:
+            rows.append((hand_id, offset, len(raw_hand)))
+            offset += len(raw_hand) + len(HAND_SEPARATOR)
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=self.dictionary)
+        data = compressor.compress(HAND_SEPARATOR.join(raw_hand for _, raw_hand in hands)) + compressor.flush()
+        with self.database.transaction():
+            block_id = self.database.execute("INSERT INTO t_text_block(d_data) VALUES (?)", (data,)).lastrowid
+            self.database.executemany("INSERT INTO t_hand_text VALUES (?, ?, ?, ?)",
+                                      ((hand_id, block_id, offset, length) for hand_id, offset, length in rows))
+
+    def _take(self, count):
+        hand_ids = list(islice(self._pending, count))
+        return [(hand_id, self._pending.pop(hand_id)) for hand_id in hand_ids]
+
+    def flush(self):
+        """ Write the hands waiting for their block, in a smaller block.
+        """
+        with self.database.transaction():
+            while self._pending:
+                self.write_block(self._take(self.block_size))
+
+    def read_hand(self, hand_id):
+        """ Return the raw bytes of a hand.
+
+            Raises:
+                KeyError: The hand is not stored.
+        """
+        raw_hand = self._pending.get(hand_id)
+        if raw_hand is not None:
+            return raw_hand
+        row = self.database.execute("""
+            SELECT b.d_data, h.d_offset, h.d_length
+            FROM t_hand_text AS h JOIN t_text_block AS b ON b.d_id = h.d_block_id
+            WHERE h.d_hand_id = ?""", (hand_id,)).fetchone()
+        if row is None:
+            raise KeyError(hand_id)
+        data, offset, length = row
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS, zdict=self.dictionary)
+        return decompressor.decompress(data, offset + length)[offset:]
+
+    def load_hand(self, hand_id, parser_class=FastPokerStarsParser):
+        """ Parse one stored hand.
+
+            Args:
+                hand_id (int): The id of the hand.
+                parser_class (type): The parser used to read the hand.
+
+            Returns:
+                A Hand object
+
+            Raises:
+                KeyError: The hand is not stored.
+        """
+        return parse_hand_text(decode_hand(self.read_hand(hand_id)), parser_class)
+
+    def sizes(self):
+        """ Return (text size, compressed size) in bytes of the hands written in blocks.
+        """
+        text, = self.database.execute("SELECT IFNULL(SUM(d_length), 0) FROM t_hand_text").fetchone()
+        compressed, = self.database.execute("SELECT IFNULL(SUM(LENGTH(d_data)), 0) FROM t_text_block").fetchone()
+        return text, compressed
+
+    def __contains__(self, hand_id):
+        return (hand_id in self._pending or self.database.execute(
+            "SELECT 1 FROM t_hand_text WHERE d_hand_id = ?", (hand_id,)).fetchone() is not None)
+
+    def __len__(self):
+        return len(self._pending) + self.database.execute("SELECT COUNT(*) FROM t_hand_text").fetchone()[0]
+
+    def close(self):
+        """ Write the last block and close the store file.
+        """
+        self.flush()
+        self.database.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
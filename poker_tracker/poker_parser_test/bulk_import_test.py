@@ -0,0 +1,47 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "HandTest.txt")
+
+from poker_tracker.poker_parser.bulk_import import bulk_import, import_records, make_tasks, main
+from poker_tracker.poker_parser.hand_reader import read_hands
+
+
+def test_make_tasks():
+    size = os.path.getsize(hand_history_file)
+    tasks = make_tasks([hand_history_file], 1000)
+
+    assert tasks[0] == (hand_history_file, 0, 1000)
+    assert tasks[-1][2] == size
+    assert len(tasks) == (size + 999) // 1000
+
+
+def test_byte_ranges_read_each_hand_once():
+    expected = [hand.to_record() for hand in read_hands(hand_history_file)]
+
+    for range_size in [100, 1000, 5000]:
+        records = list(import_records([hand_history_file], workers=1, range_size=range_size))
+        assert records == expected
+
+
+def test_process_pool():
+    expected = [hand.to_record() for hand in read_hands(hand_history_file)]
+
+    records = list(import_records([script_dir], workers=2, range_size=1000))
+    assert records == expected
+
+    records = list(import_records([hand_history_file], workers=2, ordered=False, range_size=1000))
+    assert sorted(records) == sorted(expected)
+
+
+def test_bulk_import():
+    hands = list(bulk_import([hand_history_file], workers=1))
+
+    assert len(hands) == 9
+    assert hands[0].id == 202004455940
+    assert hands[0].seats['SB'].player == "onucee"
+
+
+def test_main(capsys):
+    main([hand_history_file, '--workers', '1'])
+
+    assert capsys.readouterr().out.startswith("9 hands imported")
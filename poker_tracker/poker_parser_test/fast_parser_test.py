@@ -0,0 +1,115 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_test_file = os.path.join(script_dir, "hand")
+hand_history_file = os.path.join(script_dir, "HandTest.txt")
+
+from poker_tracker.data.card import Card, Value, Color
+from poker_tracker.data.action import Action, ActionType
+from poker_tracker.poker_parser.pokerstars_parser import PokerStarsParser
+from poker_tracker.poker_parser.fast_parser import FastPokerStarsParser
+from poker_tracker.poker_parser.hand_reader import iter_raw_hands, decode_hand
+
+
+def assert_same_hand(hand, expected):
+    assert hand.id == expected.id
+    assert hand.game_id == expected.game_id
+    assert hand.dealer == expected.dealer
+    assert hand.small_blind == expected.small_blind
+    assert hand.big_blind == expected.big_blind
+    assert hand.ante == expected.ante
+    assert hand.blinds == expected.blinds
+    assert hand.pseudo_seats == expected.pseudo_seats
+    assert hand.seats.keys() == expected.seats.keys()
+    for position, seat in hand.seats.items():
+        assert seat.player == expected.seats[position].player
+        assert seat.stack == expected.seats[position].stack
+        assert list(seat.cards) == list(expected.seats[position].cards)
+    assert hand.board_flop == expected.board_flop
+    assert hand.board_turn == expected.board_turn
+    assert hand.board_river == expected.board_river
+    assert hand.action_preflop == expected.action_preflop
+    assert hand.action_flop == expected.action_flop
+    assert hand.action_turn == expected.action_turn
+    assert hand.action_river == expected.action_river
+
+
+def test_parse_hand():
+    file = open(hand_test_file, encoding='UTF-8')
+    parser = FastPokerStarsParser(file.read())
+    file.close()
+    parser.parse_hand()
+
+    assert parser.hand_id == 202004455940
+    assert parser.game_id == 2642898548
+    assert parser.buy_in == 1
+    assert parser.small_blind == 10
+    assert parser.big_blind == 20
+    assert parser.date == "2019/07/04"
+    assert parser.hour == "21:31:39"
+    assert parser.table_name == "2642898548 1"
+    assert parser.table_size == 3
+    assert parser.button_seat == 1
+    assert parser.players_number == 3
+    assert parser.positions == {"BTN": "leti5795", "SB": "onucee", "BB": "MaGiCLeTuR"}
+    assert parser.cards["BB"] == [Card(Value.TWO, Color.SPADES), Card(Value.ACE, Color.HEARTS)]
+    assert parser.cards["SB"] == [Card(Value.SEVEN, Color.SPADES), Card(Value.NINE, Color.DIAMONDS)]
+    assert parser.board_turn == [Card(Value.TWO, Color.HEARTS)]
+    assert parser.action_turn == [Action("SB", ActionType.CHECK, 0), Action("BB", ActionType.BET, 30),
+                                  Action("BTN", ActionType.FOLD, 0), Action("SB", ActionType.CALL, 30)]
+
+
+def test_same_hands_as_pokerstars_parser():
+    for _, raw_hand in iter_raw_hands(hand_history_file):
+        text = decode_hand(raw_hand)
+        parser = PokerStarsParser(text)
+        parser.parse_hand()
+        fast_parser = FastPokerStarsParser(text)
+        fast_parser.parse_hand()
+
+        assert fast_parser.buy_in == parser.buy_in
+        assert fast_parser.rake == parser.rake
+        assert fast_parser.table_name == parser.table_name
+        assert fast_parser.date == parser.date
+        assert fast_parser.hour == parser.hour
+        assert fast_parser.stacks == parser.stacks
+        assert fast_parser.blinds == parser.blinds
+        assert fast_parser.ante == parser.ante
+        assert_same_hand(fast_parser.load(), parser.load())
+
+
+
+def test_unexpected_line():
+    file = open(hand_test_file, encoding='UTF-8')
+    text = file.read()
+    file.close()
+    # a raise without its total in the middle of the flop
+    text = text.replace("MaGiCLeTuR: checks\nleti5795: checks\n*** TURN",
+                        "MaGiCLeTuR: raises 20\nleti5795: checks\n*** TURN")
+    parser = PokerStarsParser(text)
+    parser.parse_hand()
+    fast_parser = FastPokerStarsParser(text)
+    fast_parser.parse_hand()
+
+    assert fast_parser.board_flop == [Card(Value.FIVE, Color.SPADES), Card(Value.EIGHT, Color.CLUBS),
+                                      Card(Value.TEN, Color.CLUBS)]
+    assert fast_parser.action_flop == [Action("SB", ActionType.CHECK, 0), Action("BTN", ActionType.CHECK, 0)]
+    assert fast_parser.collected == parser.collected == {'BB': 120}
+    assert_same_hand(fast_parser.load(), parser.load())
+
+
+def test_cash_game_header():
+    parser = FastPokerStarsParser(
+        "PokerStars Hand #207000000001:  Hold'em No Limit (€0.01/€0.02 EUR) - 2019/12/01 20:00:00 CET [2019/12/01 14:00:00 ET]\n"
+        "Table 'Aludra IV' 6-max Seat #10 is the button\n")
+    parser.parse_hand()
+
+    assert parser.hand_id == 207000000001
+    assert parser.game_id == 0
+    assert parser.buy_in == 0
+    assert parser.small_blind == 0.01
+    assert parser.big_blind == 0.02
+    assert parser.date == "2019/12/01"
+    assert parser.hour == "20:00:00"
+    assert parser.table_name == "Aludra IV"
+    assert parser.table_size == 6
+    assert parser.button_seat == 10
@@ -0,0 +1,55 @@
+from poker_tracker.evaluator.hand_evaluator import describe, evaluate, showdown_winners
+from poker_tracker.poker_parser.pokerstars_parser import PokerStarsParser
+from poker_tracker.poker_parser.fast_parser import FastPokerStarsParser
+from poker_tracker.poker_parser.hand_generator import HandGenerator, write_history
+from poker_tracker.poker_parser.hand_reader import parse_hand_text, read_hands
+
+
+def test_generator_is_deterministic():
+    assert list(HandGenerator(7).hands(50)) == list(HandGenerator(7).hands(50))
+    assert list(HandGenerator(7).hands(50)) != list(HandGenerator(8).hands(50))
+
+
+def test_generated_hands():
+    hands = list(HandGenerator(1).hands(500))
+    players = set()
+    for text in hands:
+        hand = parse_hand_text(text, PokerStarsParser)
+        assert parse_hand_text(text, FastPokerStarsParser).to_record() == hand.to_record()
+        players.add(len(hand.seats))
+        for seat in hand.seats.values():
+            assert seat.stack > 0
+
+    assert players == set(range(2, 11))
+    assert any("Tournament #" in text for text in hands)
+    assert any("EUR) - " in text and "€" in text for text in hands)
+    assert any("*** RIVER ***" in text for text in hands)
+    assert any("*** SHOW DOWN ***" in text for text in hands)
+    assert any("side pot" in text for text in hands)
+
+
+def test_showdown_winners():
+    split = False
+    for text in HandGenerator(1).hands(500):
+        if "*** SHOW DOWN ***" not in text or "side pot" in text:
+            continue
+        hand = parse_hand_text(text, PokerStarsParser)
+        board = hand.board_flop + hand.board_turn + hand.board_river
+        shown = [position for position, seat in hand.seats.items() if "{0}: shows".format(seat.player) in text]
+        hands = [hand.seats[position].cards for position in shown]
+        assert set(hand.collected) == {shown[index] for index in showdown_winners(board, hands)}
+        split = split or len(hand.collected) > 1
+        lines = text.split("\n")
+        for position, cards in zip(shown, hands):
+            line = next(line for line in lines if line.startswith(hand.seats[position].player + ": shows ["))
+            assert line.endswith("({0})".format(describe(evaluate(board + list(cards)))))
+    assert split
+
+
+def test_write_history(tmp_path):
+    path = str(tmp_path / "generated.txt")
+    write_history(path, 100, seed=3)
+
+    hands = list(read_hands(path))
+    assert len(hands) == 100
+    assert len(set(hand.id for hand in hands)) == 100
@@ -0,0 +1,91 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "HandTest.txt")
+
+import pytest
+
+from poker_tracker.poker_parser.hand_generator import write_history
+from poker_tracker.poker_parser.hand_reader import iter_raw_hands, read_hands
+from poker_tracker.poker_parser.hand_index import HandIndex, scan_header
+
+
+def test_scan_header():
+    raw_hand = next(iter_raw_hands(hand_history_file))[1]
+
+    hand_id, game_id, date, hour, small_blind, big_blind, pseudos = scan_header(raw_hand)
+    assert hand_id == 202004455940
+    assert game_id == 2642898548
+    assert date == "2019/07/04"
+    assert hour == "21:31:39"
+    assert small_blind == 10
+    assert big_blind == 20
+    assert pseudos == ["leti5795", "onucee", "MaGiCLeTuR"]
+
+
+def test_load_hand(tmp_path):
+    index = HandIndex(str(tmp_path / "index.db"))
+    assert index.update([hand_history_file]) == 9
+    assert len(index) == 9
+
+    entry = index.lookup(202004529813)
+    assert entry.pseudos == ["leti5795", "onucee", "MaGiCLeTuR"]
+    assert entry.path == os.path.abspath(hand_history_file)
+    assert index.read_hand(202004529813).startswith(b"PokerStars Hand #202004529813:")
+
+    expected = list(read_hands(hand_history_file))[4]
+    hand = index.load_hand(202004529813)
+    assert hand.id == expected.id
+    assert hand.action_preflop == expected.action_preflop
+    assert index.lookup(1) is None
+
+    assert index.find_hands("leti5795")[0] == 202004455940
+    assert len(index.find_hands("leti5795")) == 7
+    # nothing changed, nothing to index
+    assert index.update([hand_history_file]) == 0
+    index.close()
+
+
+def test_incremental_update(tmp_path):
+    path = str(tmp_path / "history.txt")
+    hands = [raw_hand for _, raw_hand in iter_raw_hands(hand_history_file)]
+    index = HandIndex(str(tmp_path / "index.db"))
+
+    # the last hand is being written
+    with open(path, 'wb') as file:
+        file.write(hands[0] + hands[1] + hands[2][:300])
+    assert index.update([path]) == 2
+
+    with open(path, 'ab') as file:
+        file.write(hands[2][300:] + hands[3])
+    assert index.update([path]) == 2
+    assert len(index) == 4
+    assert index.load_hand(202004487429).id == 202004487429
+
+    # the file has been rewritten
+    with open(path, 'wb') as file:
+        file.write(hands[5])
+    assert index.update([path]) == 1
+    assert len(index) == 1
+    index.close()
+
+
+def test_rewritten_file(tmp_path):
+    path = str(tmp_path / "history.txt")
+    size = write_history(path, 3, seed=0)
+    index = HandIndex(str(tmp_path / "index.db"))
+    assert index.update([path]) == 3
+    old_id = index.find_hands("MaGiCLeTuR")[1]
+
+    # other hands, the file is larger than the indexed part
+    assert write_history(path, 4, seed=1) > size
+    # the offsets of the old hands point to other hands
+    with pytest.raises(KeyError):
+        index.read_hand(old_id)
+
+    assert index.update([path]) == 4
+    assert len(index) == 4
+    assert index.lookup(old_id) is None
+    expected = list(read_hands(path))
+    assert [index.load_hand(hand.id).id for hand in expected] == [hand.id for hand in expected]
+    assert index.update([path]) == 0
+    index.close()
@@ -0,0 +1,64 @@
+import io
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "HandTest.txt")
+
+from poker_tracker.poker_parser.hand_reader import HandSplitter, iter_raw_hands, read_hands
+
+
+def test_splitter_offsets():
+    with open(hand_history_file, 'rb') as file:
+        data = file.read()
+
+    hands = iter_raw_hands(io.BytesIO(data))
+    hands = list(hands)
+
+    assert len(hands) == data.count(b'PokerStars Hand #')
+    for offset, raw_hand in hands:
+        assert raw_hand.startswith(b'PokerStars Hand #')
+        assert data[offset:offset + len(raw_hand)] == raw_hand
+
+
+def test_splitter_chunk_size():
+    with open(hand_history_file, 'rb') as file:
+        data = file.read()
+    expected = list(iter_raw_hands(io.BytesIO(data)))
+
+    for chunk_size in [1, 7, 100, 4096]:
+        assert list(iter_raw_hands(io.BytesIO(data), chunk_size)) == expected
+
+
+def test_splitter_bounded_buffer():
+    with open(hand_history_file, 'rb') as file:
+        data = file.read()
+    splitter = HandSplitter()
+    longest = 0
+    for i in range(0, len(data), 10):
+        splitter.feed(data[i:i + 10])
+        longest = max(longest, len(splitter.buffer))
+    hands = [raw_hand for _, raw_hand in iter_raw_hands(io.BytesIO(data))]
+
+    assert longest <= max(len(hand) for hand in hands) + 10 + len(b'\nPokerStars Hand #')
+
+
+def test_read_hands():
+    hands = list(read_hands(hand_history_file))
+
+    assert len(hands) == 9
+    assert hands[0].id == 202004455940
+    assert hands[0].game_id == 2642898548
+    assert hands[0].seats['BB'].player == "MaGiCLeTuR"
+    assert len(hands[0].action_turn) == 4
+    assert hands[-1].id == 202004570116
+    assert len(hands[-1].seats) == 2
+
+
+def test_read_hands_crlf():
+    with open(hand_history_file, 'rb') as file:
+        data = file.read().replace(b'\n', b'\r\n')
+
+    hands = list(read_hands(io.BytesIO(data)))
+
+    assert len(hands) == 9
+    assert hands[0].seats['BTN'].player == "leti5795"
+    assert hands[0].seats['BTN'].stack == 500
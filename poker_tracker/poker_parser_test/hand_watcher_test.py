@@ -0,0 +1,65 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "HandTest.txt")
+
+from poker_tracker.poker_parser.hand_reader import iter_raw_hands
+from poker_tracker.poker_parser.hand_watcher import HandWatcher, is_complete_hand
+
+
+def raw_hands():
+    return [raw_hand for _, raw_hand in iter_raw_hands(hand_history_file)]
+
+
+def test_is_complete_hand():
+    raw_hand = raw_hands()[0]
+
+    assert is_complete_hand(raw_hand)
+    assert not is_complete_hand(raw_hand[:raw_hand.index(b'*** SUMMARY ***')])
+    assert not is_complete_hand(raw_hand.rstrip())
+
+
+def test_watch_appended_hands(tmp_path):
+    path = str(tmp_path / "history.txt")
+    hands = raw_hands()
+    with open(path, 'wb') as file:
+        file.write(hands[0])
+
+    received = []
+    watcher = HandWatcher([path])
+    watcher.subscribe(lambda hand_path, hand: received.append((hand_path, hand.id)))
+    assert watcher.poll() == 0
+
+    # a hand partially written is not sent
+    with open(path, 'ab') as file:
+        file.write(hands[1][:200])
+    assert watcher.poll() == 0
+
+    with open(path, 'ab') as file:
+        file.write(hands[1][200:])
+    assert watcher.poll() == 1
+    assert received == [(path, 202004478305)]
+
+    # the hand already sent is not sent again when the next one starts
+    with open(path, 'ab') as file:
+        file.write(hands[2] + hands[3])
+    assert watcher.poll() == 2
+    assert [hand_id for _, hand_id in received] == [202004478305, 202004487429, 202004504288]
+    assert watcher.poll() == 0
+
+
+def test_watch_from_start_and_truncation(tmp_path):
+    path = str(tmp_path / "history.txt")
+    hands = raw_hands()
+    with open(path, 'wb') as file:
+        file.write(b''.join(hands[:3]))
+
+    received = []
+    watcher = HandWatcher(from_start=True)
+    watcher.watch(path, from_start=True)
+    watcher.subscribe(lambda hand_path, hand: received.append(hand.id))
+    assert watcher.poll() == 3
+
+    with open(path, 'wb') as file:
+        file.write(hands[4])
+    assert watcher.poll() == 1
+    assert received[-1] == 202004529813
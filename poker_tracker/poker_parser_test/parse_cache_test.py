@@ -0,0 +1,86 @@
+import marshal
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "HandTest.txt")
+
+from poker_tracker.poker_parser.pokerstars_parser import PokerStarsParser
+from poker_tracker.poker_parser.hand_reader import read_hands, iter_raw_hands
+from poker_tracker.poker_parser.parse_cache import CACHE_VERSION, ParseCache, hand_key
+
+
+class CountingParser(PokerStarsParser):
+    parsed = 0
+
+    def parse_hand(self, lazy=False):
+        CountingParser.parsed += 1
+        super().parse_hand(lazy)
+
+
+def test_hand_key():
+    raw_hand = next(iter_raw_hands(hand_history_file))[1]
+
+    hand_id, digest = hand_key(raw_hand)
+    assert hand_id == 202004455940
+    assert hand_key(raw_hand + b'\n\n') == (hand_id, digest)
+    assert hand_key(raw_hand.replace(b'calls 20', b'calls 30'))[1] != digest
+
+
+def test_cache_hits(tmp_path):
+    path = str(tmp_path / "cache.db")
+    expected = [hand.to_record() for hand in read_hands(hand_history_file)]
+    CountingParser.parsed = 0
+
+    with ParseCache(path, parser_class=CountingParser) as cache:
+        hands = [hand.to_record() for hand in read_hands(hand_history_file, cache=cache)]
+        assert hands == expected
+        assert cache.misses == 9
+        assert CountingParser.parsed == 9
+
+    with ParseCache(path, parser_class=CountingParser) as cache:
+        hands = [hand.to_record() for hand in read_hands(hand_history_file, cache=cache)]
+        assert hands == expected
+        assert cache.hits == 9
+        assert cache.misses == 0
+        assert CountingParser.parsed == 9
+        assert len(cache) == 9
+
+
+def test_cache_eviction(tmp_path):
+    path = str(tmp_path / "cache.db")
+    with ParseCache(path, max_size=1000) as cache:
+        for _ in read_hands(hand_history_file, cache=cache):
+            cache.flush()
+        assert cache.size <= 1000
+        assert 0 < len(cache) < 9
+        # the last hands are the most recently used
+        hand_id = cache.connection.execute("SELECT MAX(d_hand_id) FROM t_parse_cache").fetchone()[0]
+        assert hand_id == 202004570116
+
+
+def test_damaged_record(tmp_path):
+    expected = [hand.to_record() for hand in read_hands(hand_history_file)]
+    # a record that cannot be unmarshalled, and a record of the wrong shape
+    for i, record in enumerate([b'\xff\x00', marshal.dumps((1, 2))]):
+        path = str(tmp_path / "cache{0}.db".format(i))
+        with ParseCache(path) as cache:
+            list(read_hands(hand_history_file, cache=cache))
+        with ParseCache(path) as cache:
+            with cache.connection:
+                cache.connection.execute("UPDATE t_parse_cache SET d_record = ? WHERE d_hand_id = ?",
+                                         (record, expected[0][0]))
+            hands = [hand.to_record() for hand in read_hands(hand_history_file, cache=cache)]
+            assert hands == expected
+            assert (cache.hits, cache.misses) == (8, 1)
+        with ParseCache(path) as cache:
+            list(read_hands(hand_history_file, cache=cache))
+            assert (cache.hits, cache.misses) == (9, 0)
+
+
+def test_other_version(tmp_path):
+    path = str(tmp_path / "cache.db")
+    with ParseCache(path) as cache:
+        list(read_hands(hand_history_file, cache=cache))
+        assert cache.connection.execute("PRAGMA user_version").fetchone()[0] == CACHE_VERSION
+        cache.connection.execute("PRAGMA user_version = {0}".format(CACHE_VERSION + 1))
+    with ParseCache(path) as cache:
+        assert len(cache) == 0
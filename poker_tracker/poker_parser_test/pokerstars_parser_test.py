@@ -28,6 +28,8 @@ def test_parse_header_and_setup():
     assert parser.buy_in == 1
     assert parser.small_blind == 10
     assert parser.big_blind == 20
+    assert parser.date == "2019/07/04"
+    assert parser.hour == "21:31:39"
     # Table Info
     assert parser.table_name == "2642898548 1"
     assert parser.table_size == 3
@@ -43,6 +45,10 @@ def test_parse_header_and_setup():
     assert parser.players["leti5795"] == "BTN"
     assert parser.players["onucee"] == "SB"
 
+    parser.parse_posts()
+    assert parser.blinds == {"SB": 10, "BB": 20}
+    assert parser.ante == 0
+
 
 def test_read_action():
     line = "leti5795: calls 20"
@@ -253,6 +259,34 @@ def test_parse_showdown():
     assert parser.cards["BB"][1] == Card(Value.ACE, Color.HEARTS)
 
 
+def test_parse_collected():
+    parser = PokerStarsParser("onucee: shows [7h Qh] (a straight, Three to Seven)\n"
+                              "onucee collected 320 from side pot\n"
+                              "onucee collected 80 from main pot\n"
+                              "MaGiCLeTuR collected 40 from pot\n"
+                              "*** SUMMARY ***\n"
+                              "Seat 3: MaGiCLeTuR (big blind) collected (40)")
+    parser.players["onucee"] = "SB"
+    parser.players["MaGiCLeTuR"] = "BB"
+
+    parser.parse_collected()
+    assert parser.collected == {"SB": 400, "BB": 40}
+
+
+def test_parse_posts():
+    parser = PokerStarsParser("Seat 1: leti5795 (500 in chips)\n"
+                              "leti5795: posts the ante 25\n"
+                              "onucee: posts the ante 10 and is all-in\n"
+                              "onucee: posts small blind 50\n"
+                              "MaGiCLeTuR: posts small & big blinds €0.03\n")
+    parser.part_dict['HEADER'] = parser.hand_file
+    parser.players = {"leti5795": "BTN", "onucee": "SB", "MaGiCLeTuR": "CO"}
+
+    parser.parse_posts()
+    assert parser.ante == 25
+    assert parser.blinds == {"SB": 50, "CO": 0.03}
+
+
 def test_parse_hand():
     file = open(hand_test_file, encoding='UTF-8')
     line = file.read()
@@ -396,3 +430,50 @@ def test_load_hand():
         assert hand.action_river[i] == parser.action_river[i]
     
     file.close()
+
+
+def test_lazy_hand():
+    file = open(hand_test_file, encoding='UTF-8')
+    line = file.read()
+    file.close()
+    parser = PokerStarsParser(line)
+    parser.parse_hand()
+    expected = parser.load()
+
+    parser = PokerStarsParser(line)
+    parser.parse_hand(lazy=True)
+    hand = parser.load()
+
+    # Header and setup are parsed
+    assert hand.id == expected.id
+    assert hand.dealer == "leti5795"
+    assert hand.pseudo_seats == expected.pseudo_seats
+    assert parser.action_preflop == []
+    assert parser.action_flop == []
+    # The parts from the flop are not split
+    assert 'HOLE CARDS' in parser.part_dict
+    assert 'FLOP' not in parser.part_dict
+    assert parser.rest_part.startswith('*** FLOP ***')
+
+    # Preflop is parsed on first access only
+    assert hand.action_preflop == expected.action_preflop
+    assert parser.action_flop == []
+    assert parser.board_flop == []
+
+    assert hand.seats['SB'].cards == [Card(Value.SEVEN, Color.SPADES), Card(Value.NINE, Color.DIAMONDS)]
+    assert hand.seats['BTN'].stack == 500
+    assert parser.action_turn == []
+    assert parser.rest_part == ''
+
+    assert hand.board_flop == expected.board_flop
+    assert hand.action_flop == expected.action_flop
+    assert hand.board_turn == expected.board_turn
+    assert hand.action_turn == expected.action_turn
+    assert hand.board_river == expected.board_river
+    assert hand.action_river == expected.action_river
+    assert len(hand.action_flop) == 3
+    assert hand.collected == expected.collected == {'BB': 120}
+
+    # Attributes can still be set
+    hand.action_river = []
+    assert hand.action_river == []
@@ -0,0 +1,48 @@
+import os
+script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
+hand_history_file = os.path.join(script_dir, "HandTest.txt")
+
+import pytest
+
+from poker_tracker.poker_parser.hand_generator import write_history
+from poker_tracker.poker_parser.hand_reader import iter_raw_hands, read_hands
+from poker_tracker.poker_parser.parse_cache import hand_key
+from poker_tracker.poker_parser.text_store import HandTextStore, train_dictionary
+
+
+def test_train_dictionary():
+    dictionary = train_dictionary(raw_hand for _, raw_hand in iter_raw_hands(hand_history_file))
+    assert b"PokerStars Hand #" in dictionary
+    assert b"2019" not in dictionary
+    assert len(train_dictionary([b"PokerStars Hand #1: Hold'em"] * 10, size=8)) <= 8
+
+
+def test_read_hand(tmp_path):
+    path = str(tmp_path / "text.db")
+    with HandTextStore(path, block_size=4) as store:
+        assert store.add_file(hand_history_file) == 9
+        hands = list(read_hands(hand_history_file))
+        assert store.load_hand(hands[0].id).to_record() == hands[0].to_record()  # read before the first block
+        assert store.add_file(hand_history_file) == 0
+
+    with HandTextStore(path) as store:
+        assert len(store) == 9
+        assert store.dictionary
+        for raw_hand in (raw_hand for _, raw_hand in iter_raw_hands(hand_history_file)):
+            assert store.read_hand(hand_key(raw_hand)[0]) == raw_hand.strip()
+        for hand in hands:
+            assert store.load_hand(hand.id).to_record() == hand.to_record()
+        with pytest.raises(KeyError):
+            store.read_hand(1)
+
+
+def test_compression(tmp_path):
+    history = str(tmp_path / "history.txt")
+    write_history(history, 300)
+    with HandTextStore(str(tmp_path / "text.db"), block_size=16) as store:
+        assert store.add_file(history) == 300
+        store.flush()
+        text, compressed = store.sizes()
+        assert compressed < text / 3
+        for _, raw_hand in list(iter_raw_hands(history))[::37]:
+            assert store.read_hand(hand_key(raw_hand)[0]) == raw_hand.strip()